@@ -25,11 +25,6 @@ from typing import List
 import jsonpickle
 import math
 
-try:
-    import matplotlib.pyplot as plt
-except ImportError:
-    plt = None
-
 class Trader:
     def __init__(self,
                  execution_slippage: float = 0.2,    # Lower slippage to encourage trading
@@ -333,7 +328,4 @@ class Trader:
         })
         conversions = 1
 
-        if plt is not None:
-            self.plot_history(self.kelp_prices, self.kelp_vwap)
-
         return result, conversions, traderData
\ No newline at end of file
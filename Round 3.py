@@ -12,12 +12,6 @@ from typing import List, Tuple, Dict
 import jsonpickle
 import math
 
-# Optional: try to import matplotlib for plotting
-try:
-    import matplotlib.pyplot as plt
-except ImportError:
-    plt = None
-
 # Optional: try to import numpy for vectorized operations
 try:
     import numpy as np
@@ -733,9 +727,6 @@ class Trader:
 
             conversions = 1  # or any relevant conversion count
 
-            if plt is not None:
-                self.plot_history(self.kelp_prices, self.kelp_vwap)
-
             return result, conversions, traderData
 
         except Exception as e:
@@ -12,12 +12,6 @@ from typing import List, Tuple, Dict
 import jsonpickle
 import math
 
-# Optional: try to import matplotlib for plotting
-try:
-    import matplotlib.pyplot as plt
-except ImportError:
-    plt = None
-
 MACARONS = "MAGNIFICENT_MACARONS"
 MACARONS_LIMIT = 75
 MACARONS_CONV_LIMIT = 10
@@ -830,10 +824,6 @@ class Trader:
             # Number of conversions (if used in further processing)
             conversions = 1
 
-            # Optional: plot history if matplotlib is available
-            if plt is not None:
-                self.plot_history(self.kelp_prices, self.kelp_vwap)
-
             # Always return a triple
             return result, conversions, traderData
 
@@ -9,14 +9,132 @@ Original file is located at
 
 from datamodel import OrderDepth, TradingState, Order, ConversionObservation
 from typing import List, Tuple, Dict
-import jsonpickle
+from array import array
+from collections import deque
+import base64
+import bisect
+import importlib
+import importlib.util
+import itertools
 import math
+import struct
+import time
+import zlib
+
+
+class LazyModule:
+    """
+    Placeholder for an optional heavy dependency. The real module is imported on the
+    first attribute access and then replaces the placeholder in this file's globals,
+    so loading the file and building a Trader stay cheap.
+    """
+
+    def __init__(self, name: str, alias: str):
+        self.name = name
+        self.alias = alias
+
+    def __getattr__(self, attr):
+        module = importlib.import_module(self.name)
+        globals()[self.alias] = module
+        return getattr(module, attr)
+
+
+# Optional: NumPy for vectorized option pricing, the conversion LP and the take kernel.
+# None when it is not installed; otherwise imported by the first strategy that uses it.
+np = LazyModule("numpy", "np") if importlib.util.find_spec("numpy") is not None else None
 
 MACARONS = "MAGNIFICENT_MACARONS"
 MACARONS_LIMIT = 75
 MACARONS_CONV_LIMIT = 10
 MACARONS_EDGE = 2
 MACARONS_PROB = 0.8
+MACARONS_STORAGE = 0.1   # paid per unit still held long at the end of a tick
+MACARONS_HORIZON = 10    # ticks the conversion planner looks ahead
+MACARONS_TREND_WINDOW = 50      # exit-price samples the planner's drift forecast is fitted on
+MACARONS_TREND_DAMPING = 0.8    # per-tick decay of the forecast drift
+MACARONS_TREND_Z = 3.0          # standard errors of drift ignored as noise before any is extrapolated
+
+HISTORY_CAPACITY = 200   # samples kept per recorded time series
+
+TRADER_DATA_VERSION = 1
+TRADER_DATA_BUDGET = 40000   # max characters of the encoded traderData string
+TRADER_DATA_ZLIB = 0x01      # flag bit: payload is zlib-compressed
+
+VOLCANIC_ROCK = "VOLCANIC_ROCK"
+VOLCANIC_ROCK_FALLBACK = 10000.0   # spot guess until the underlying has a two-sided book
+IV_MIN = 1e-4
+IV_MAX = 5.0
+DELTA_HEDGE_BAND = 25   # voucher-book delta (in VOLCANIC_ROCK units) tolerated before hedging
+
+# Units of each component per basket.
+BASKET_RECIPES = {
+    "PICNIC_BASKET1": {"CROISSANT": 6, "JAM": 3, "DJEMBE": 1},
+    "PICNIC_BASKET2": {"CROISSANT": 4, "JAM": 2},
+}
+BASKET_MIN_EDGE = 0.0   # per-basket profit a hedged unit must beat after crossing every spread
+CONVERSION_PRODUCTS = ("CROISSANT", "JAM", "DJEMBE", "PICNIC_BASKET1", "PICNIC_BASKET2")
+# Registry strategies that only take a mispriced top of book; with NumPy they run as one batch.
+TAKE_STRATEGIES = ("take_orders", "volcanic_voucher_orders")
+# The batch beats the per-symbol loop from 10-14 quoted take symbols (benchmarks/take_batch.py);
+# Round 5 quotes 8, so it stays off until the registry grows.
+TAKE_BATCH_MIN_SYMBOLS = 12
+
+# run() time budget. Blocks run in priority order; a non-core block is shed when its
+# expected cost would carry the tick past its priority's share of the budget.
+TICK_BUDGET_MS = 900.0          # exchange time limit for one run() call
+PRIORITY_CORE, PRIORITY_NORMAL, PRIORITY_LOW = 0, 1, 2
+BUDGET_SHARE = (1.0, 0.8, 0.6)  # fraction of the budget a block of each priority must finish within
+BUDGET_COST_ALPHA = 0.2         # weight of the latest duration in a block's expected cost
+SHED_LOG = 1000                 # most recent shed events kept for tuning
+
+# Product registry. Trader.run dispatches every symbol present in the order depths to its
+# "strategy", a Trader method called as strategy(symbol, book, position, limit, fallback, **params),
+# where "fallback" is the fair value used while the book cannot provide one. Symbols without a
+# strategy are only traded by the cross-product stages (baskets, conversions) or used as inputs.
+# "reuse" marks strategies whose orders depend only on the book, the position and what the
+# optional "state" hook returns; while those repeat, the previous tick's orders are reused and
+# the "track" hook makes the history updates the strategy would have made. Hooks take the
+# strategy's arguments. "priority" (default PRIORITY_CORE) orders dispatch and decides which
+# strategies are shed first when run() is short of time. "requires" names a Trader method that
+# prepares inputs the symbol shares with others (the voucher chain) as its own budgeted block;
+# run() calls it first, and when it returns False the symbol is shed with it.
+PRODUCTS = {
+    "RAINFOREST_RESIN": {"limit": 50, "fallback": 10000, "strategy": "resin_orders", "params": {"width": 2},
+                         "reuse": {}},
+    "KELP": {"limit": 50, "fallback": 2000, "strategy": "kelp_orders",
+             "params": {"timespan": 10, "width": 3.5, "take_width": 1}, "reuse": {"track": "kelp_track"}},
+    "SQUID_INK": {"limit": 50, "fallback": 2000, "strategy": "squidink_utility_orders",
+                  "params": {"candidate_range": 2},
+                  "reuse": {"state": "squidink_window_state", "track": "squidink_track"}},
+    "CROISSANT": {"limit": 250, "fallback": 4300, "strategy": "take_orders", "params": {}, "reuse": {}},
+    "JAM": {"limit": 350, "fallback": 6600, "strategy": "take_orders", "params": {}, "reuse": {}},
+    "DJEMBE": {"limit": 60, "fallback": 13400, "strategy": "take_orders", "params": {}, "reuse": {}},
+    "PICNIC_BASKET1": {"limit": 60, "fallback": None, "strategy": None, "params": {}},
+    "PICNIC_BASKET2": {"limit": 100, "fallback": None, "strategy": None, "params": {}},
+    "VOLCANIC_ROCK": {"limit": 400, "fallback": VOLCANIC_ROCK_FALLBACK, "strategy": "delta_hedge_orders",
+                      "params": {"band": DELTA_HEDGE_BAND}, "priority": PRIORITY_NORMAL},
+    "VOLCANIC_ROCK_VOUCHER_9500": {"limit": 200, "fallback": None, "strategy": "volcanic_voucher_orders", "params": {},
+                                   "reuse": {"state": "voucher_price"}, "priority": PRIORITY_LOW,
+                                   "requires": "price_voucher_chain"},
+    "VOLCANIC_ROCK_VOUCHER_9750": {"limit": 200, "fallback": None, "strategy": "volcanic_voucher_orders", "params": {},
+                                   "reuse": {"state": "voucher_price"}, "priority": PRIORITY_LOW,
+                                   "requires": "price_voucher_chain"},
+    "VOLCANIC_ROCK_VOUCHER_10000": {"limit": 200, "fallback": None, "strategy": "volcanic_voucher_orders", "params": {},
+                                    "reuse": {"state": "voucher_price"}, "priority": PRIORITY_LOW,
+                                    "requires": "price_voucher_chain"},
+    "VOLCANIC_ROCK_VOUCHER_10250": {"limit": 200, "fallback": None, "strategy": "volcanic_voucher_orders", "params": {},
+                                    "reuse": {"state": "voucher_price"}, "priority": PRIORITY_LOW,
+                                    "requires": "price_voucher_chain"},
+    "VOLCANIC_ROCK_VOUCHER_10500": {"limit": 200, "fallback": None, "strategy": "volcanic_voucher_orders", "params": {},
+                                    "reuse": {"state": "voucher_price"}, "priority": PRIORITY_LOW,
+                                    "requires": "price_voucher_chain"},
+    MACARONS: {"limit": MACARONS_LIMIT, "fallback": None, "strategy": "macarons_orders", "params": {},
+               "reuse": {"state": "macarons_observation_state", "track": "macarons_track"}},
+}
+CONVERSION_LP_LEVELS = 3       # book levels per side modelled by the conversion LP
+CONVERSION_LP_MAX_PIVOTS = 200
+CONVERSION_LP_RADIUS = 2        # whole baskets searched either side of the LP optimum, per recipe
+LP_EPS = 1e-9
 
 #                  UTILITY FUNCTIONS
 
@@ -32,31 +150,1164 @@ def black_scholes_call_price(S: float, K: float, T: float, r: float, sigma: floa
     # To keep it simple in the game environment, you might treat T as # of days / 365
     # or just treat T=7 “units,” r=0, etc. for a rough approach.
 
-    from math import log, sqrt, exp, erf
-
     # If T=0 or sigma=0, the formula breaks down, so add small floors
     T = max(T, 1e-9)
     sigma = max(sigma, 1e-9)
 
     # Standard Black-Scholes d1, d2
-    d1 = (math.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * math.sqrt(T))
-    d2 = d1 - sigma * math.sqrt(T)
+    sigma_sqrt_t = sigma * math.sqrt(T)
+    d1 = (math.log(S / K) + (r + 0.5 * sigma ** 2) * T) / sigma_sqrt_t
+    d2 = d1 - sigma_sqrt_t
 
-    # Cumulative distribution for standard normal
-    def cdf(x):
-        return 0.5 * (1 + math.erf(x / math.sqrt(2)))
-
-    call_val = S * cdf(d1) - K * math.exp(-r * T) * cdf(d2)
+    call_val = S * norm_cdf(d1) - K * math.exp(-r * T) * norm_cdf(d2)
     return call_val
 
 
+SQRT_2 = math.sqrt(2)
+SQRT_2PI = math.sqrt(2 * math.pi)
+
+
+def norm_cdf(x: float) -> float:
+    """Cumulative distribution for standard normal."""
+    return 0.5 * (1 + math.erf(x / SQRT_2))
+
+
+def erf_np(x):
+    """
+    Vectorized erf, Abramowitz & Stegun 7.1.26: absolute error below 1.5e-7, which
+    moves a 10000-spot option price by under 1e-3.
+    """
+    a = np.abs(x)
+    t = a * 0.3275911
+    t += 1.0
+    np.reciprocal(t, out=t)
+    # In place throughout: at chain sizes the cost is the number of NumPy calls.
+    poly = t * 1.061405429
+    for coefficient in (-1.453152027, 1.421413741, -0.284496736, 0.254829592):
+        poly += coefficient
+        poly *= t
+    a *= -a
+    poly *= np.exp(a, out=a)
+    np.subtract(1.0, poly, out=poly)
+    return np.copysign(poly, x, out=poly)
+
+
+# NumPy has no erf of its own: SciPy's is used when installed, else erf_np.
+# Resolved on first use so that importing this file imports neither.
+erf_vectorized = None
+
+
+def norm_cdf_np(x):
+    """Vectorized standard normal CDF."""
+    global erf_vectorized
+    if erf_vectorized is None:
+        if importlib.util.find_spec("scipy") is not None:
+            erf_vectorized = importlib.import_module("scipy.special").erf
+        else:
+            erf_vectorized = erf_np
+    return 0.5 * (1 + erf_vectorized(x / SQRT_2))
+
+
+def black_scholes_call_prices(S: float, strikes, T, r, sigma, greeks: bool = False):
+    """
+    Price a whole chain of European calls in one pass.
+    `strikes`, `T` (years), `r` and `sigma` are equal-length sequences, one entry per strike.
+    Returns the prices, or (prices, {"delta", "gamma", "vega"}) when `greeks` is set.
+    Uses NumPy when available and falls back to a plain loop otherwise.
+    """
+    if np is not None:
+        K = np.asarray(strikes, dtype=float)
+        T = np.maximum(np.asarray(T, dtype=float), 1e-9)
+        r = np.asarray(r, dtype=float)
+        sigma = np.maximum(np.asarray(sigma, dtype=float), 1e-9)
+        sqrt_t = np.sqrt(T)
+        sigma_sqrt_t = sigma * sqrt_t
+        d1 = (np.log(S / K) + (r + 0.5 * sigma * sigma) * T) / sigma_sqrt_t
+        # One CDF call for d1 and d2 together halves the fixed cost per chain.
+        cdf_d1, cdf_d2 = norm_cdf_np(np.stack((d1, d1 - sigma_sqrt_t)))
+        prices = S * cdf_d1 - K * np.exp(-r * T) * cdf_d2
+        if not greeks:
+            return prices
+        pdf_d1 = np.exp(-0.5 * d1 * d1) / SQRT_2PI
+        return prices, {"delta": cdf_d1, "gamma": pdf_d1 / (S * sigma_sqrt_t), "vega": S * pdf_d1 * sqrt_t}
+
+    prices, delta, gamma, vega = [], [], [], []
+    for K, t, rate, vol in zip(strikes, T, r, sigma):
+        t = max(t, 1e-9)
+        vol = max(vol, 1e-9)
+        sqrt_t = math.sqrt(t)
+        sigma_sqrt_t = vol * sqrt_t
+        d1 = (math.log(S / K) + (rate + 0.5 * vol * vol) * t) / sigma_sqrt_t
+        cdf_d1 = norm_cdf(d1)
+        prices.append(S * cdf_d1 - K * math.exp(-rate * t) * norm_cdf(d1 - sigma_sqrt_t))
+        if greeks:
+            pdf_d1 = math.exp(-0.5 * d1 * d1) / SQRT_2PI
+            delta.append(cdf_d1)
+            gamma.append(pdf_d1 / (S * sigma_sqrt_t))
+            vega.append(S * pdf_d1 * sqrt_t)
+    if not greeks:
+        return prices
+    return prices, {"delta": delta, "gamma": gamma, "vega": vega}
+
+
+def implied_vol(price: float, S: float, K: float, T: float, r: float,
+                guess: float = 0.2, tol: float = 1e-6, max_iter: int = 20):
+    """
+    Volatility at which the Black–Scholes call price equals `price`: Newton's method
+    from `guess`, falling back to bisection on [IV_MIN, IV_MAX] if Newton leaves the
+    bracket or stalls. Returns None for prices outside the no-arbitrage bounds.
+    """
+    T = max(T, 1e-9)
+    if price != price or not max(S - K * math.exp(-r * T), 0.0) < price < S:
+        return None
+    sqrt_t = math.sqrt(T)
+    sigma = min(max(guess, IV_MIN), IV_MAX)
+    for _ in range(max_iter):
+        d1 = (math.log(S / K) + (r + 0.5 * sigma * sigma) * T) / (sigma * sqrt_t)
+        diff = S * norm_cdf(d1) - K * math.exp(-r * T) * norm_cdf(d1 - sigma * sqrt_t) - price
+        if abs(diff) < tol:
+            return sigma
+        vega = S * math.exp(-0.5 * d1 * d1) / SQRT_2PI * sqrt_t
+        if vega < 1e-8:
+            break
+        sigma -= diff / vega
+        if not IV_MIN < sigma < IV_MAX:
+            break
+    low, high = IV_MIN, IV_MAX
+    for _ in range(100):
+        sigma = 0.5 * (low + high)
+        if black_scholes_call_price(S, K, T, r, sigma) > price:
+            high = sigma
+        else:
+            low = sigma
+        if high - low < 1e-10:
+            break
+    return sigma
+
+
+def implied_vols(prices, S: float, strikes, T, r, guess, tol: float = 1e-4, max_newton: int = 8):
+    """
+    Implied vols for a whole chain: vectorized Newton from `guess` (one entry per strike),
+    with the scalar bisection fallback for any strike Newton fails on.
+    Returns (vols, newton iterations); strikes without a usable price get NaN.
+    """
+    if np is None:
+        vols = [implied_vol(p, S, K, t, rate, g) for p, K, t, rate, g in zip(prices, strikes, T, r, guess)]
+        return [float("nan") if v is None else v for v in vols], 0
+
+    prices = np.asarray(prices, dtype=float)
+    K = np.asarray(strikes, dtype=float)
+    T = np.maximum(np.asarray(T, dtype=float), 1e-9)
+    intrinsic = np.maximum(S - K * np.exp(-r * T), 0.0)
+    valid = (prices > intrinsic) & (prices < S)     # NaN prices compare False
+    guess = np.asarray(guess, dtype=float)
+    sigma = np.where(np.isnan(guess), 0.2, np.clip(guess, IV_MIN, IV_MAX))
+    active = valid.copy()
+    failed = np.zeros_like(valid)
+    iterations = 0
+    while active.any() and iterations < max_newton:
+        model, greeks = black_scholes_call_prices(S, K, T, r, sigma, greeks=True)
+        diff = model - np.where(valid, prices, model)
+        active &= np.abs(diff) >= tol
+        if not active.any():
+            break
+        iterations += 1
+        vega = greeks["vega"]
+        stalled = active & (vega < 1e-8)
+        moving = active & ~stalled
+        # Only strikes still being solved divide; the others may have zero vega.
+        step = diff / np.where(moving, vega, 1.0)
+        sigma = np.where(moving, sigma - step, sigma)
+        escaped = active & ((sigma <= IV_MIN) | (sigma >= IV_MAX))
+        failed |= stalled | escaped
+        active &= ~(stalled | escaped)
+    failed |= active    # still unconverged after max_newton
+    for i in np.flatnonzero(failed):
+        sigma[i] = implied_vol(prices[i], S, K[i], T[i], float(np.broadcast_to(r, K.shape)[i]), 0.2)
+    return np.where(valid, sigma, np.nan), iterations
+
+
+class VoucherSmile:
+    """
+    Implied vols per voucher strike and a smile fitted across them, cached between
+    ticks. Each tick's solve is warm-started from the previous tick's vols, so Newton
+    typically converges in one or two iterations. The smile is a quadratic in
+    moneyness log(K/S)/sqrt(T) (lower degree with fewer quotes); without NumPy it
+    degrades to a flat smile at the average implied vol.
+    """
+
+    def __init__(self, initial_sigma):
+        self.ivs = initial_sigma if np is None else np.array(initial_sigma, dtype=float)
+        self.coeffs = None
+        self.iterations = 0
+
+    def update(self, S: float, strikes, T, r, mids) -> None:
+        ivs, self.iterations = implied_vols(mids, S, strikes, T, r, self.ivs)
+        if np is None:
+            solved = [v for v in ivs if v == v]
+            self.ivs = [v if v == v else old for v, old in zip(ivs, self.ivs)]
+            if solved:
+                self.coeffs = [sum(solved) / len(solved)]
+            return
+        solved = ~np.isnan(ivs)
+        self.ivs = np.where(solved, ivs, self.ivs)
+        n = int(solved.sum())
+        if n:
+            moneyness = np.log(np.asarray(strikes)[solved] / S) / np.sqrt(np.asarray(T)[solved])
+            self.coeffs = np.polyfit(moneyness, ivs[solved], min(2, n - 1))
+
+    def sigma(self, S: float, strikes, T):
+        """Smile vol for each strike, or None before the first successful fit."""
+        if self.coeffs is None:
+            return None
+        if np is None:
+            return [self.coeffs[0]] * len(strikes)
+        moneyness = np.log(np.asarray(strikes) / S) / np.sqrt(np.asarray(T))
+        return np.clip(np.polyval(self.coeffs, moneyness), IV_MIN, IV_MAX)
+
+
+class VoucherGreeks:
+    """
+    Net delta, gamma and vega of the voucher positions. Per-unit greeks come from the
+    batch Black–Scholes call that already prices the chain each tick (`reprice`); in
+    between, the totals are updated incrementally: a fill adds the position change
+    times that strike's unit greeks, and a spot move shifts delta by gamma * dS.
+    """
+
+    def __init__(self, products: List[str]):
+        self.index = {product: i for i, product in enumerate(products)}
+        self.positions = [0] * len(products)
+        self.unit = None     # {"delta", "gamma", "vega"}: one entry per strike
+        self.spot = None
+        self.delta = self.gamma = self.vega = 0.0
+
+    def reprice(self, S: float, greeks) -> None:
+        """Adopt freshly priced unit greeks at spot S and rebuild the totals in one pass."""
+        self.unit = greeks
+        self.spot = S
+        if np is not None:
+            self.delta, self.gamma, self.vega = (float(v) for v in np.dot(
+                [greeks["delta"], greeks["gamma"], greeks["vega"]], self.positions))
+        else:
+            self.delta, self.gamma, self.vega = (sum(q * g for q, g in zip(self.positions, greeks[name]))
+                                                 for name in ("delta", "gamma", "vega"))
+
+    def fill(self, positions: Dict[str, int]) -> None:
+        """Sync to the exchange positions, updating the totals only for strikes that traded."""
+        unit = self.unit
+        for product, i in self.index.items():
+            change = positions.get(product, 0) - self.positions[i]
+            if change:
+                self.positions[i] += change
+                if unit is not None:
+                    self.delta += change * unit["delta"][i]
+                    self.gamma += change * unit["gamma"][i]
+                    self.vega += change * unit["vega"][i]
+
+    def move_spot(self, S: float) -> None:
+        """First-order update for a spot move on a tick where the chain was not repriced."""
+        if self.unit is None or S == self.spot:
+            return
+        move = S - self.spot
+        self.delta += self.gamma * move
+        if np is not None:
+            self.unit = dict(self.unit, delta=self.unit["delta"] + self.unit["gamma"] * move)
+        else:
+            self.unit = dict(self.unit, delta=[d + g * move for d, g in zip(self.unit["delta"], self.unit["gamma"])])
+        self.spot = S
+
+
+class History:
+    """
+    Fixed-capacity time series backed by a preallocated array('d').
+    Appending to a full history overwrites the oldest sample, so append and
+    evict are both O(1) and memory stays bounded however long the session runs.
+    """
+
+    def __init__(self, capacity: int, values=()):
+        self.capacity = capacity
+        self.data = array("d", bytes(8 * capacity))
+        self.head = 0       # index the next sample is written to
+        self.count = 0
+        for x in values:
+            self.append(x)
+
+    def append(self, x: float):
+        """Record a sample; returns the evicted oldest sample, or None while filling up."""
+        evicted = self.data[self.head] if self.count == self.capacity else None
+        self.data[self.head] = x
+        self.head += 1
+        if self.head == self.capacity:
+            self.head = 0
+        if evicted is None:
+            self.count += 1
+        return evicted
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, i: int) -> float:
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError("History index out of range")
+        return self.data[(self.head - self.count + i) % self.capacity]
+
+    def __iter__(self):
+        return iter(self.tolist())
+
+    def tolist(self) -> List[float]:
+        """Samples from oldest to newest."""
+        return self.toarray().tolist()
+
+    def toarray(self) -> array:
+        """Samples from oldest to newest as a new array('d')."""
+        if self.count < self.capacity:
+            return self.data[:self.count]
+        return self.data[self.head:] + self.data[:self.head]
+
+
+class RollingStats:
+    """
+    Fixed-capacity rolling window of floats with O(1) mean / std / z-score.
+    Keeps its samples in a History and a Welford-style running mean and sum of
+    squared deviations, updated in place as samples enter and leave the window.
+    """
+
+    def __init__(self, capacity: int):
+        self.window = History(capacity)
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def push(self, x: float) -> None:
+        old = self.window.append(x)
+        n = self.window.count
+        if old is None:
+            delta = x - self._mean
+            self._mean += delta / n
+            self._m2 += delta * (x - self._mean)
+        else:
+            # Replace the oldest sample: shift the mean, then correct M2 for both samples.
+            old_mean = self._mean
+            self._mean += (x - old) / n
+            self._m2 += (x - old) * (x - self._mean + old - old_mean)
+            if self._m2 < 0:
+                self._m2 = 0.0
+
+    def mean(self) -> float:
+        return self._mean if self.window.count else 0.0
+
+    def std(self) -> float:
+        """Population standard deviation of the current window."""
+        n = self.window.count
+        return math.sqrt(self._m2 / n) if n else 0.0
+
+    def zscore(self, x: float) -> float:
+        std = self.std()
+        return (x - self._mean) / std if std > 0 else 0
+
+    def state(self) -> Tuple:
+        """Everything the next push's result depends on: running mean, M2, count and the sample it would evict."""
+        window = self.window
+        evicted = window.data[window.head] if window.count == window.capacity else None
+        return self._mean, self._m2, window.count, evicted
+
+
+class memoized:
+    """Non-data descriptor: computes on first access, then lives in the instance dict."""
+
+    def __init__(self, fn):
+        self.fn = fn
+        self.name = fn.__name__
+        self.__doc__ = fn.__doc__
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        value = obj.__dict__[self.name] = self.fn(obj)
+        return value
+
+
+class BookView:
+    """
+    One product's order book for a single tick, built once in run() and shared
+    by every strategy. Derived quantities are computed lazily and memoized, so a
+    book read by several strategies is only scanned once. Volumes are positive
+    on both sides; `buy_orders` / `sell_orders` expose the raw exchange dicts.
+    """
+
+    def __init__(self, order_depth: OrderDepth):
+        self.buy_orders = order_depth.buy_orders
+        self.sell_orders = order_depth.sell_orders
+
+    @memoized
+    def has_both(self) -> bool:
+        return bool(self.buy_orders) and bool(self.sell_orders)
+
+    @memoized
+    def key(self) -> Tuple:
+        """Hashable snapshot of every level, for comparing books across ticks."""
+        return tuple(self.buy_orders.items()), tuple(self.sell_orders.items())
+
+    @memoized
+    def best_bid(self):
+        return max(self.buy_orders) if self.buy_orders else None
+
+    @memoized
+    def best_ask(self):
+        return min(self.sell_orders) if self.sell_orders else None
+
+    @memoized
+    def best_bid_volume(self) -> int:
+        return self.buy_orders[self.best_bid] if self.buy_orders else 0
+
+    @memoized
+    def best_ask_volume(self) -> int:
+        return -self.sell_orders[self.best_ask] if self.sell_orders else 0
+
+    @memoized
+    def bids(self) -> List[Tuple[int, int]]:
+        """(price, volume) levels, best (highest) first."""
+        return sorted(self.buy_orders.items(), reverse=True)
+
+    @memoized
+    def asks(self) -> List[Tuple[int, int]]:
+        """(price, volume) levels, best (lowest) first."""
+        return [(price, -volume) for price, volume in sorted(self.sell_orders.items())]
+
+    @memoized
+    def mid(self):
+        return (self.best_ask + self.best_bid) / 2 if self.has_both else None
+
+    @memoized
+    def total_bid_volume(self) -> int:
+        return sum(abs(volume) for volume in self.buy_orders.values())
+
+    @memoized
+    def total_ask_volume(self) -> int:
+        return sum(abs(volume) for volume in self.sell_orders.values())
+
+    @memoized
+    def vwap(self):
+        """Average of the volume-weighted bid and ask prices; None if either side is empty."""
+        if not self.total_bid_volume or not self.total_ask_volume:
+            return None
+        weighted_sell = sum(price * abs(volume) for price, volume in self.sell_orders.items()) / self.total_ask_volume
+        weighted_buy = sum(price * abs(volume) for price, volume in self.buy_orders.items()) / self.total_bid_volume
+        return (weighted_sell + weighted_buy) / 2
+
+    def mid_or(self, fallback: float) -> float:
+        mid = self.mid
+        return fallback if mid is None else mid
+
+
+class LevelWalker:
+    """
+    Cursor over presorted (price, volume) levels, best first, with positive volumes.
+    `take` consumes units in book order, so walking a whole book is linear in its depth.
+    """
+
+    def __init__(self, levels: List[Tuple[int, int]]):
+        self.levels = levels
+        self.index = 0
+        self.remaining = levels[0][1] if levels else 0
+        self.worst_price = None
+
+    @property
+    def exhausted(self) -> bool:
+        return self.index >= len(self.levels)
+
+    def cost(self, units: int):
+        """Total price of the next `units` units without consuming them; None if the book is too thin."""
+        total = 0
+        index, remaining = self.index, self.remaining
+        while units > 0:
+            if index >= len(self.levels):
+                return None
+            take = min(units, remaining)
+            total += take * self.levels[index][0]
+            units -= take
+            remaining -= take
+            if remaining == 0:
+                index += 1
+                remaining = self.levels[index][1] if index < len(self.levels) else 0
+        return total
+
+    def take(self, units: int) -> None:
+        while units > 0:
+            take = min(units, self.remaining)
+            self.worst_price = self.levels[self.index][0]
+            units -= take
+            self.remaining -= take
+            if self.remaining == 0:
+                self.index += 1
+                self.remaining = self.levels[self.index][1] if self.index < len(self.levels) else 0
+
+
+def walk_basket_arbitrage(basket_levels: List[Tuple[int, int]], legs: List[Tuple[int, List[Tuple[int, int]]]],
+                          max_qty: int, sell_basket: bool, min_edge: float = BASKET_MIN_EDGE):
+    """
+    Merge-walk a basket book against its component books to find the largest
+    profitable hedged quantity.
+
+    `sell_basket=True` hits basket bids and lifts component asks (pass bids for the
+    basket and asks for each leg); False does the reverse. `legs` holds
+    (units per basket, levels). Steps advance by whole book levels, with a single
+    unit when a basket's leg straddles two levels, so the cost is linear in depth.
+    The marginal edge only shrinks as levels are consumed, so the walk stops at the
+    first unprofitable step.
+
+    Returns (quantity, worst basket price, worst price per leg, total edge, curve), where
+    curve lists (cumulative quantity, basket unit price, synthetic unit price) per step.
+    """
+    basket = LevelWalker(basket_levels)
+    walkers = [LevelWalker(levels) for _, levels in legs]
+    qty, edge, curve = 0, 0.0, []
+    while qty < max_qty and not basket.exhausted:
+        chunk = min(max_qty - qty, basket.remaining)
+        for (weight, _), walker in zip(legs, walkers):
+            whole = walker.remaining // weight
+            chunk = min(chunk, whole if whole > 0 else 1)
+        synthetic = 0
+        for (weight, _), walker in zip(legs, walkers):
+            leg_cost = walker.cost(chunk * weight)
+            if leg_cost is None:
+                synthetic = None
+                break
+            synthetic += leg_cost
+        if synthetic is None:
+            break
+        basket_price = basket.levels[basket.index][0]
+        unit_edge = (basket_price - synthetic / chunk) if sell_basket else (synthetic / chunk - basket_price)
+        if unit_edge <= min_edge:
+            break
+        basket.take(chunk)
+        for (weight, _), walker in zip(legs, walkers):
+            walker.take(chunk * weight)
+        qty += chunk
+        edge += unit_edge * chunk
+        curve.append((qty, basket_price, synthetic / chunk))
+    return qty, basket.worst_price, [walker.worst_price for walker in walkers], edge, curve
+
+
+def remaining_capacity(position: int, limit: int, pending: List[Order], buying: bool) -> int:
+    """Units still tradeable on one side once the orders already `pending` for the symbol are counted."""
+    if buying:
+        return limit - position - sum(o.quantity for o in pending if o.quantity > 0)
+    return limit + position + sum(o.quantity for o in pending if o.quantity < 0)
+
+
+def residual_levels(levels: List[Tuple[int, int]], pending: List[Order], buying: bool) -> List[Tuple[int, int]]:
+    """Book levels (best first, positive volume) left after the `pending` orders on the same side sweep them."""
+    remaining = [list(level) for level in levels]
+    for order in pending:
+        qty = order.quantity if buying else -order.quantity
+        if qty <= 0:
+            continue
+        for level in remaining:
+            if qty == 0 or (level[0] > order.price if buying else level[0] < order.price):
+                break
+            take = min(qty, level[1])
+            level[1] -= take
+            qty -= take
+    return [(price, volume) for price, volume in remaining if volume > 0]
+
+
+def take_mispriced(best_bid, bid_volume, best_ask, ask_volume, fair_value, position, limit, max_volume):
+    """
+    Top-of-book take for many symbols in one NumPy pass. All arguments are equal-length
+    arrays, with NaN quotes marking a missing side. Buys where the ask is below fair value
+    and sells where the bid is above it, clipped to the quoted size, the position limit
+    and `max_volume`. Returns (buy quantity, sell quantity) as int arrays, zero where
+    nothing is taken.
+    """
+    buy = np.where(best_ask < fair_value, np.minimum(np.minimum(ask_volume, limit - position), max_volume), 0.0)
+    sell = np.where(best_bid > fair_value, np.minimum(np.minimum(bid_volume, limit + position), max_volume), 0.0)
+    return np.maximum(buy, 0.0).astype(int), np.maximum(sell, 0.0).astype(int)
+
+
+class ConversionLP:
+    """
+    Basket/component conversion arbitrage as a linear program, solved by a
+    bounded-variable primal simplex in NumPy.
+
+    Variables are the fills at the first CONVERSION_LP_LEVELS levels on both sides of
+    every product in CONVERSION_PRODUCTS, each bounded by its level's volume, plus one
+    hedged basket count per recipe split into positive and negative parts (positive
+    sells baskets and buys their components). The objective is the cash received.
+    Equality rows tie each product's net fill to the recipes, and two rows per
+    product cap total buys and sells by the position limits. Both baskets share the
+    component rows, so their legs can offset each other.
+
+    Only prices, volumes and capacities change from tick to tick, so the previous
+    optimal `basis` (with the nonbasic columns sitting at their upper bound) is
+    refactorised first and the solve starts from it whenever it is still feasible.
+    Whole-basket counts are then searched in a box of CONVERSION_LP_RADIUS around
+    the LP optimum, each candidate priced exactly against the books in one NumPy pass.
+    """
+
+    def __init__(self, products=CONVERSION_PRODUCTS, recipes=BASKET_RECIPES, levels: int = CONVERSION_LP_LEVELS):
+        self.products = list(products)
+        self.recipes = recipes
+        self.levels = levels
+        n_products = len(self.products)
+        self.n_fills = 2 * levels * n_products
+        self.n_vars = self.n_fills + 2 * len(recipes)
+
+        net = np.zeros((n_products, self.n_vars))
+        caps = np.zeros((2 * n_products, self.n_vars))
+        for i in range(n_products):
+            buys = slice(2 * levels * i, 2 * levels * i + levels)
+            sells = slice(2 * levels * i + levels, 2 * levels * (i + 1))
+            net[i, buys] = 1.0
+            net[i, sells] = -1.0
+            caps[i, buys] = 1.0
+            caps[n_products + i, sells] = 1.0
+        for b, (basket, recipe) in enumerate(recipes.items()):
+            k = self.n_fills + 2 * b
+            net[self.products.index(basket), k:k + 2] = (1.0, -1.0)
+            for component, weight in recipe.items():
+                net[self.products.index(component), k:k + 2] = (-weight, weight)
+        constraints = np.vstack((net, caps))
+        self.m = constraints.shape[0]
+        self.lhs = np.hstack((constraints, np.eye(self.m)))
+        # Upper bounds: fills get their level volume per solve, net-row slacks are fixed at zero.
+        self.upper = np.full(self.lhs.shape[1], np.inf)
+        self.upper[self.n_vars:self.n_vars + n_products] = 0.0
+        # Net fill of every product per basket of each recipe, and the integer offsets searched.
+        self.unit_net = -net[:, self.n_fills::2].T.astype(int)
+        offsets = range(-CONVERSION_LP_RADIUS, CONVERSION_LP_RADIUS + 1)
+        self.neighbourhood = np.array(list(itertools.product(offsets, repeat=len(recipes))))
+        self.basis = None
+        self.at_upper = ()
+        self.iterations = 0
+
+    def _start(self, b):
+        """Tableau and basic values for the stored basis, or None if it is singular or infeasible."""
+        at_upper = np.zeros(self.lhs.shape[1], dtype=bool)
+        at_upper[list(self.at_upper)] = True
+        at_upper[self.basis] = False
+        at_upper &= np.isfinite(self.upper)
+        try:
+            inverse = np.linalg.inv(self.lhs[:, self.basis])
+        except np.linalg.LinAlgError:
+            return None
+        values = inverse @ (b - self.lhs[:, at_upper] @ self.upper[at_upper])
+        if values.min() < -1e-7 or (values - self.upper[self.basis]).max() > 1e-7:
+            return None
+        return inverse @ self.lhs, values, at_upper
+
+    def _simplex(self, c, b):
+        m, n_cols = self.lhs.shape
+        upper = self.upper
+        start = self._start(b) if self.basis is not None else None
+        if start is None:
+            self.basis = list(range(n_cols - m, n_cols))
+            start = self.lhs.copy(), b.astype(float), np.zeros(n_cols, dtype=bool)
+        rows, values, at_upper = start
+        basis = np.array(self.basis)
+        room = upper[basis]   # upper bound of each basic variable, kept in step with the basis
+        # The last tableau row carries the reduced costs and is pivoted with the rest.
+        tableau = np.vstack((rows, c - c[basis] @ rows))
+        reduced = tableau[m]
+        # +1 for columns that improve by increasing, -1 for those sitting at their upper bound, 0 if fixed.
+        direction = np.where(at_upper, -1.0, 1.0)
+        direction[upper <= 0] = 0.0
+
+        degenerate = 0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for self.iterations in range(CONVERSION_LP_MAX_PIVOTS):
+                score = reduced * direction
+                # Dantzig's rule, switching to Bland's after a run of degenerate steps to avoid cycling.
+                if degenerate > m:
+                    candidates = np.flatnonzero(score > 1e-6)
+                    if not len(candidates):
+                        break
+                    entering = int(candidates[0])
+                else:
+                    entering = int(score.argmax())
+                    if score[entering] <= 1e-6:
+                        break
+                alpha = -tableau[:m, entering] if at_upper[entering] else tableau[:m, entering]
+                size = np.abs(alpha)
+                ratios = np.where(alpha > 0, values, room - values) / size
+                ratios[size <= LP_EPS] = np.inf
+                leaving = int(ratios.argmin())
+                t = ratios[leaving]
+                if t >= upper[entering]:
+                    if not np.isfinite(upper[entering]):
+                        return None
+                    # The entering column reaches its other bound before any basic one does.
+                    values -= upper[entering] * alpha
+                    at_upper[entering] = not at_upper[entering]
+                    direction[entering] = -direction[entering]
+                    degenerate = 0
+                    continue
+                if degenerate > m:
+                    ties = np.flatnonzero(ratios <= t + LP_EPS)
+                    leaving = int(ties[basis[ties].argmin()])
+                degenerate = degenerate + 1 if t <= LP_EPS else 0
+
+                values -= t * alpha
+                values[leaving] = upper[entering] - t if at_upper[entering] else t
+                left = basis[leaving]
+                at_upper[left] = alpha[leaving] < 0
+                if upper[left] > 0:
+                    direction[left] = -1.0 if at_upper[left] else 1.0
+                at_upper[entering] = False
+                pivot = tableau[leaving] / tableau[leaving, entering]
+                tableau -= tableau[:, entering, None] * pivot
+                tableau[leaving] = pivot
+                basis[leaving] = entering
+                room[leaving] = upper[entering]
+        self.basis = basis.tolist()
+        self.at_upper = np.flatnonzero(at_upper).tolist()
+        x = np.where(at_upper, upper, 0.0)
+        x[basis] = values
+        return x[:self.n_vars]
+
+    def solve(self, asks: List[List[Tuple[int, int]]], bids: List[List[Tuple[int, int]]],
+              buy_caps: List[int], sell_caps: List[int]) -> Tuple[Dict[str, int], float]:
+        """
+        Best whole-basket conversion for the given residual books and capacities, all
+        indexed like `products`. Returns (net fill per product, cash received); the
+        fill is empty when no positive-edge trade exists.
+        """
+        levels = self.levels
+        c = np.zeros(self.lhs.shape[1])
+        self.upper[:self.n_fills] = 0.0
+        for i in range(len(self.products)):
+            for j, (price, volume) in enumerate(asks[i][:levels]):
+                c[2 * levels * i + j] = -price
+                self.upper[2 * levels * i + j] = volume
+            for j, (price, volume) in enumerate(bids[i][:levels]):
+                c[2 * levels * i + levels + j] = price
+                self.upper[2 * levels * i + levels + j] = volume
+        b = np.concatenate((np.zeros(len(self.products)), np.maximum(buy_caps, 0), np.maximum(sell_caps, 0)))
+        x = self._simplex(c, b)
+        if x is None:
+            self.basis = None
+            return {}, 0.0
+        if c[:self.n_vars] @ x <= LP_EPS:
+            return {}, 0.0   # whole baskets cannot beat the relaxation
+
+        # Rounding each count on its own can leave offsetting legs over a capacity, so
+        # every whole-basket count in a box around the LP optimum is priced instead.
+        k = x[self.n_fills::2] - x[self.n_fills + 1::2]
+        counts = np.floor(k + 1e-6).astype(int) + self.neighbourhood
+        counts = counts[counts.any(axis=1)]
+        cash = self._cash(counts @ self.unit_net, asks, bids, buy_caps, sell_caps)
+        cash[cash <= BASKET_MIN_EDGE * np.abs(counts).sum(axis=1)] = -np.inf
+        best = int(cash.argmax())
+        if not cash[best] > 0:
+            return {}, 0.0
+        return {p: int(q) for p, q in zip(self.products, counts[best] @ self.unit_net) if q}, float(cash[best])
+
+    def _cash(self, net, asks, bids, buy_caps, sell_caps):
+        """
+        Cash received for executing each row of `net` (net fill per product) against
+        the books; -inf where a fill exceeds its capacity or the modelled depth.
+        """
+        cash = np.zeros(len(net))
+        for i in range(len(self.products)):
+            # Cash for a net fill of q, from -(sellable) to +(buyable), between -inf sentinels.
+            bought = self._cumulative(asks[i][:self.levels], buy_caps[i])
+            sold = self._cumulative(bids[i][:self.levels], sell_caps[i])
+            table = np.concatenate(([-np.inf], sold[:0:-1], -bought, [-np.inf]))
+            index = net[:, i] + len(sold)
+            cash += table[np.minimum(np.maximum(index, 0), len(table) - 1)]
+        return cash
+
+    @staticmethod
+    def _cumulative(levels: List[Tuple[int, int]], capacity: int):
+        """Cost of the first q units walked from `levels`, for q = 0 up to the depth or `capacity`."""
+        units = itertools.chain.from_iterable(itertools.repeat(price, volume) for price, volume in levels)
+        return np.fromiter(itertools.accumulate(itertools.islice(units, max(capacity, 0)), initial=0.0), float)
+
+
+class ConversionPlanner:
+    """
+    Hold / convert schedule for MAGNIFICENT_MACARONS as a DP over (position, tick) on a
+    rolling horizon, and the take / make sizing that follows from its value table.
+
+    A conversion moves the position towards flat by at most `cap` units a tick at the
+    implied exit prices (exit_long to sell a long, exit_short to buy back a short), and
+    every unit still held long at the end of a tick pays `storage`. Both exit prices are
+    forecast `horizon` ticks ahead by extrapolating their mean change over the recorded
+    window, less `significance` standard errors of it (a random walk is forecast flat),
+    damped by `damping` a tick; past the horizon the rest is converted as fast as the cap
+    allows at the last forecast. With W[k](x) the worth of holding x at the start of tick k,
+
+        W[k](x) = max over y from x towards flat by at most cap of
+                  (x - y) * exit[k] - storage * max(y, 0) + W[k + 1](y)
+
+    W is concave on each side of flat, so it is kept as its marginal values, sorted: a
+    unit is converted at tick k while its marginal worth is below exit[k], which inserts
+    `cap` marginals of exit[k] where the sorted list crosses it. A tick is one bisect and
+    one list splice instead of O(limit * cap) work, and `update` re-solves the horizon
+    only when the forecast has moved. Tick 0 is the current one: `conversion` heads for
+    its crossing, and `margins` (what each unit above a position is worth less than the
+    one below it) sizes take and make.
+    """
+
+    def __init__(self, limit: int, cap: int = MACARONS_CONV_LIMIT, storage: float = MACARONS_STORAGE,
+                 horizon: int = MACARONS_HORIZON, damping: float = MACARONS_TREND_DAMPING,
+                 significance: float = MACARONS_TREND_Z):
+        self.limit = limit
+        self.cap = cap
+        self.storage = storage
+        self.horizon = horizon
+        self.damping = damping
+        self.significance = significance
+        self.forecast = None
+        # Worth lost by ending this tick one unit higher, from position -limit up: non-decreasing.
+        self.margins: List[float] = []
+        self.targets = (0, 0)   # positions this tick's conversion heads for from a long and from a short
+
+    def trend(self, history: History) -> List[float]:
+        """The latest exit price and its forecast for each tick of the horizon."""
+        samples = history.tolist()
+        price = samples[-1]
+        drift = 0.0
+        if len(samples) > 2:
+            changes = [b - a for a, b in zip(samples, samples[1:])]
+            n = len(changes)
+            mean = sum(changes) / n
+            error = math.sqrt(sum((c - mean) ** 2 for c in changes) / (n - 1) / n)
+            drift = math.copysign(max(0.0, abs(mean) - self.significance * error), mean)
+        prices = [price]
+        for _ in range(self.horizon):
+            price += drift
+            drift *= self.damping
+            prices.append(price)
+        return prices
+
+    def update(self, exit_long: History, exit_short: History) -> None:
+        """Re-plan from the recorded exit prices, newest last."""
+        forecast = (self.trend(exit_long), self.trend(exit_short))
+        if forecast == self.forecast:
+            return
+        self.forecast = forecast
+        longs, shorts = forecast
+        limit, cap, storage = self.limit, self.cap, self.storage
+        # Negated marginal worth of each unit past the horizon: shorts are bought back at the
+        # last forecast; the (y + 1)-th long unit is sold at it after y // cap ticks of storage.
+        # Long entries are stored less the storage `paid` since, so each tick shifts them all at once.
+        short_side = [-shorts[-1]] * limit
+        long_side = [storage * (1 + y // cap) - longs[-1] for y in range(limit)]
+        paid = 0.0
+        for k in range(self.horizon, 0, -1):
+            crossing = bisect.bisect_left(long_side, -longs[k] - paid)
+            long_side[crossing:crossing] = [-longs[k] - paid] * cap
+            del long_side[limit:]
+            paid += storage
+            crossing = bisect.bisect_right(short_side, -shorts[k])
+            short_side[:crossing] = short_side[cap:crossing] + [-shorts[k]] * min(cap, crossing)
+        self.margins = short_side + [m + paid for m in long_side]
+        self.targets = (bisect.bisect_left(long_side, -longs[0] - paid),
+                        bisect.bisect_right(short_side, -shorts[0]) - limit)
+
+    def conversion(self, position: int) -> int:
+        """Conversion request for this tick (positive buys back a short), at most `cap` towards the target."""
+        long_target, short_target = self.targets
+        if position > long_target:
+            return max(long_target, position - self.cap) - position
+        if position < short_target:
+            return min(short_target, position + self.cap) - position
+        return 0
+
+    def buy_units(self, position: int, price: float, most: int) -> int:
+        """How many units (up to `most`) bought at `price` on top of `position` each add value."""
+        start = position + self.limit
+        return max(0, min(most, bisect.bisect_left(self.margins, -price, start) - start))
+
+    def sell_units(self, position: int, price: float, most: int) -> int:
+        """How many units (up to `most`) sold at `price` out of `position` each add value."""
+        start = position + self.limit
+        return max(0, min(most, start - bisect.bisect_right(self.margins, -price, 0, start)))
+
+
+class LatencyRecorder:
+    """
+    Per-strategy wall-clock timings for run(), measured with perf_counter_ns.
+    Each strategy gets a sparse log-linear histogram (8 sub-buckets per power of
+    two, ~12% resolution), so memory stays fixed however many ticks are recorded.
+    run() calls start() once per tick and lap(name) after each strategy block.
+    """
+
+    def __init__(self):
+        self.histograms: Dict[str, Dict[int, int]] = {}
+        self.max_ns: Dict[str, int] = {}
+        self.total_ns: Dict[str, int] = {}
+        self.counts: Dict[str, int] = {}
+        self.started = 0
+        self.last = 0
+
+    def start(self) -> "LatencyRecorder":
+        self.started = self.last = time.perf_counter_ns()
+        return self
+
+    def lap(self, name: str) -> None:
+        """Record the time since the previous lap (or start) under `name`."""
+        now = time.perf_counter_ns()
+        self.record(name, now - self.last)
+        self.last = now
+
+    def stop(self) -> None:
+        self.record("total", time.perf_counter_ns() - self.started)
+
+    def record(self, name: str, ns: int) -> None:
+        if ns < 8:
+            bucket = ns
+        else:
+            bits = ns.bit_length()
+            bucket = bits * 8 + ((ns >> (bits - 4)) & 7)
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = {}
+            self.max_ns[name] = self.total_ns[name] = self.counts[name] = 0
+        histogram[bucket] = histogram.get(bucket, 0) + 1
+        self.counts[name] += 1
+        self.total_ns[name] += ns
+        if ns > self.max_ns[name]:
+            self.max_ns[name] = ns
+
+    @staticmethod
+    def _bucket_ns(bucket: int) -> float:
+        """Midpoint of a histogram bucket in nanoseconds."""
+        if bucket < 8:
+            return float(bucket)
+        bits, sub = divmod(bucket, 8)
+        low = (8 + sub) << (bits - 4)
+        return low + (1 << (bits - 4)) / 2
+
+    def percentile(self, name: str, q: float) -> float:
+        histogram = self.histograms[name]
+        target = q * self.counts[name]
+        seen = 0
+        for bucket in sorted(histogram):
+            seen += histogram[bucket]
+            if seen >= target:
+                return min(self._bucket_ns(bucket), float(self.max_ns[name]))
+        return float(self.max_ns[name])
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """{strategy: {count, mean_us, p50_us, p99_us, max_us}}"""
+        return {name: {
+            "count": self.counts[name],
+            "mean_us": self.total_ns[name] / self.counts[name] / 1e3,
+            "p50_us": self.percentile(name, 0.50) / 1e3,
+            "p99_us": self.percentile(name, 0.99) / 1e3,
+            "max_us": self.max_ns[name] / 1e3,
+        } for name in self.histograms}
+
+    def dump(self) -> str:
+        rows = sorted(self.summary().items(), key=lambda item: -item[1]["mean_us"])
+        width = max([14] + [len(name) for name, _ in rows])
+        lines = ["%-*s %8s %10s %10s %10s %10s" % (width, "strategy", "count", "mean us", "p50 us", "p99 us", "max us")]
+        for name, row in rows:
+            lines.append("%-*s %8d %10.1f %10.1f %10.1f %10.1f" % (
+                width, name, row["count"], row["mean_us"], row["p50_us"], row["p99_us"], row["max_us"]))
+        return "\n".join(lines)
+
+
+class ReuseCache:
+    """
+    The last inputs and outputs of each strategy block in run(), so a block whose
+    inputs repeat can return its previous output instead of recomputing it. Keys
+    are tuples of everything the block reads; hits and misses are counted per block.
+    """
+
+    def __init__(self):
+        self.entries: Dict[str, Tuple] = {}
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+
+    def get(self, name: str, key):
+        """The output stored under an equal key last time, or None."""
+        entry = self.entries.get(name)
+        if entry is not None and entry[0] == key:
+            self.hits[name] = self.hits.get(name, 0) + 1
+            return entry[1]
+        self.misses[name] = self.misses.get(name, 0) + 1
+        return None
+
+    def put(self, name: str, key, value) -> None:
+        self.entries[name] = (key, value)
+
+    def hit_rates(self) -> Dict[str, float]:
+        return {name: self.hits.get(name, 0) / (self.hits.get(name, 0) + misses)
+                for name, misses in self.misses.items()}
+
+    def dump(self) -> str:
+        rates = self.hit_rates()
+        width = max([14] + [len(name) for name in rates])
+        lines = ["%-*s %8s %8s %8s" % (width, "strategy", "hits", "misses", "hit %")]
+        for name in sorted(rates, key=lambda n: -rates[n]):
+            lines.append("%-*s %8d %8d %8.1f" % (width, name, self.hits.get(name, 0), self.misses[name],
+                                                100 * rates[name]))
+        return "\n".join(lines)
+
+
+class TickBudget:
+    """
+    Deadline watchdog for run(). start() opens the tick; before each non-core block
+    run() asks admit(name, priority), and a block is admitted while the time already
+    spent plus its expected cost (a moving average of its own past durations, folded
+    in by done()) fits in its priority's share of the budget. Blocks may nest, as the
+    voucher chain pricing does inside the VOLCANIC_ROCK hedge; a block's cost excludes
+    the blocks nested in it, which are charged to their own names. A shed also decays the
+    block's expected cost, so one slow call cannot starve it: it is retried once the
+    estimate fits again, and re-measured. Shed blocks are counted, and the latest are
+    logged as (timestamp, block, elapsed us) for tuning priorities. Outside start() /
+    stop(), e.g. when a benchmark calls a strategy directly, every block is admitted.
+    """
+
+    def __init__(self, budget_ms: float = TICK_BUDGET_MS):
+        self.budget_ns = budget_ms * 1e6
+        self.cost_ns: Dict[str, float] = {}
+        self.admitted: Dict[str, int] = {}
+        self.shed: Dict[str, int] = {}
+        self.events = deque(maxlen=SHED_LOG)
+        self.timestamp = 0
+        self.started = 0
+        self.running = False
+        self.blocks: List[list] = []   # admitted blocks still running as [name, started, nested ns], innermost last
+
+    def start(self, timestamp: int) -> "TickBudget":
+        self.timestamp = timestamp
+        self.started = time.perf_counter_ns()
+        self.running = True
+        self.blocks.clear()
+        return self
+
+    def stop(self) -> None:
+        self.running = False
+
+    def admit(self, name: str, priority: int) -> bool:
+        """Whether block `name` may run now; a refusal is recorded as a shed event."""
+        if not self.running:
+            self.blocks.append(None)
+            return True
+        now = time.perf_counter_ns()
+        elapsed = now - self.started
+        cost = self.cost_ns.get(name, 0.0)
+        if priority and elapsed + cost > self.budget_ns * BUDGET_SHARE[priority]:
+            self.cost_ns[name] = cost * (1 - BUDGET_COST_ALPHA)
+            self.shed[name] = self.shed.get(name, 0) + 1
+            self.events.append((self.timestamp, name, elapsed // 1000))
+            return False
+        self.admitted[name] = self.admitted.get(name, 0) + 1
+        self.blocks.append([name, now, 0])
+        return True
+
+    def drop(self, name: str) -> None:
+        """Record block `name` as shed without an admission test, e.g. with an input it requires."""
+        if self.running:
+            self.shed[name] = self.shed.get(name, 0) + 1
+            self.events.append((self.timestamp, name, (time.perf_counter_ns() - self.started) // 1000))
+
+    def done(self) -> None:
+        """Fold the duration of the innermost admitted block into its expected cost."""
+        block = self.blocks.pop() if self.blocks else None
+        if block is None:
+            return
+        name, started, nested = block
+        ns = time.perf_counter_ns() - started
+        if self.blocks and self.blocks[-1] is not None:
+            self.blocks[-1][2] += ns
+        ns -= nested
+        cost = self.cost_ns.get(name)
+        self.cost_ns[name] = ns if cost is None else cost + BUDGET_COST_ALPHA * (ns - cost)
+
+    def dump(self) -> str:
+        names = sorted(set(self.admitted) | set(self.shed), key=lambda n: (-self.shed.get(n, 0), n))
+        width = max([14] + [len(name) for name in names])
+        lines = ["%-*s %8s %8s %8s %10s" % (width, "block", "ran", "shed", "shed %", "cost us")]
+        for name in names:
+            ran, shed = self.admitted.get(name, 0), self.shed.get(name, 0)
+            lines.append("%-*s %8d %8d %8.1f %10.1f" % (width, name, ran, shed, 100 * shed / (ran + shed),
+                                                       self.cost_ns.get(name, 0.0) / 1e3))
+        return "\n".join(lines)
+
+
+def encode_trader_data(series: Dict[str, History], compress: bool = False,
+                       budget: int = TRADER_DATA_BUDGET) -> str:
+    """
+    Pack named float series into a compact, versioned traderData string.
+
+    Layout (little endian): version B, flags B, series count H, then per series
+    name length B, name, sample count I, and the samples as float64. The bytes are
+    optionally zlib-compressed and always base64-wrapped. If the raw payload would
+    exceed `budget` characters, every series is cut to a common length, dropping
+    the oldest samples first.
+    """
+    arrays = [(name.encode(), values.toarray() if isinstance(values, History) else array("d", values))
+              for name, values in series.items()]
+    header_size = 4 + sum(len(name) + 5 for name, _ in arrays)
+    max_bytes = budget // 4 * 3
+    if header_size + 8 * sum(len(values) for _, values in arrays) > max_bytes:
+        # Largest common length that fits; shorter series are kept whole.
+        low, high = 0, max(len(values) for _, values in arrays)
+        while low < high:
+            keep = (low + high + 1) // 2
+            if header_size + 8 * sum(min(len(values), keep) for _, values in arrays) <= max_bytes:
+                low = keep
+            else:
+                high = keep - 1
+        arrays = [(name, values[len(values) - low:] if len(values) > low else values) for name, values in arrays]
+
+    parts = [struct.pack("<BBH", TRADER_DATA_VERSION, 0, len(arrays))]
+    for name, values in arrays:
+        parts.append(struct.pack("<B", len(name)))
+        parts.append(name)
+        parts.append(struct.pack("<I", len(values)))
+        parts.append(values.tobytes())
+    payload = b"".join(parts)
+    if compress:
+        packed = zlib.compress(payload[4:], 1)
+        if len(packed) < len(payload) - 4:
+            payload = struct.pack("<BBH", TRADER_DATA_VERSION, TRADER_DATA_ZLIB, len(arrays)) + packed
+    return base64.b64encode(payload).decode("ascii")
+
+
+def decode_trader_data(text: str) -> Dict[str, array]:
+    """Inverse of encode_trader_data. Returns {} for empty, foreign or older-version strings."""
+    if not text:
+        return {}
+    try:
+        payload = base64.b64decode(text, validate=True)
+        version, flags, n = struct.unpack_from("<BBH", payload, 0)
+        if version != TRADER_DATA_VERSION:
+            return {}
+        body = zlib.decompress(payload[4:]) if flags & TRADER_DATA_ZLIB else payload[4:]
+        series = {}
+        offset = 0
+        for _ in range(n):
+            name_len = body[offset]
+            name = body[offset + 1:offset + 1 + name_len].decode()
+            offset += 1 + name_len
+            count, = struct.unpack_from("<I", body, offset)
+            offset += 4
+            values = array("d")
+            values.frombytes(body[offset:offset + 8 * count])
+            offset += 8 * count
+            series[name] = values
+        return series
+    except (ValueError, struct.error, zlib.error, IndexError):
+        return {}
+
+
 class Trader:
     def __init__(self,
                  execution_slippage: float = 0.2,     # Lower slippage to encourage trading
                  transaction_cost: float = 0.2,       # Lower transaction cost penalty
                  risk_coefficient: float = 0.05,      # Lower risk penalty
                  max_trade_volume: int = 10,          # Increase max trade volume per order
-                 reversion_coefficient: float = 0.5
+                 reversion_coefficient: float = 0.5,
+                 latency: bool = False,               # Time each strategy block in run()
+                 reuse: bool = True,                  # Reuse a block's orders while its inputs repeat
+                 budget_ms: float = TICK_BUDGET_MS    # Shed low-priority blocks near this run() time; 0 never sheds
                 ):
         self.execution_slippage = execution_slippage
         self.transaction_cost = transaction_cost
@@ -64,257 +1315,277 @@ class Trader:
         self.max_trade_volume = max_trade_volume
         self.reversion_coefficient = reversion_coefficient
 
-        # Historical data trackers for visualization or computing metrics.
-        self.kelp_prices = []        # Stores fair values for KELP.
-        self.kelp_vwap = []          # Stores VWAP and volume info for KELP.
-        self.squidink_prices = []    # Stores fair values for SQUID_INK.
+        # Per-strategy timings; None keeps run() free of timing calls.
+        self.latency = LatencyRecorder() if latency else None
+        # Previous inputs and orders per strategy block, with hit counts; None recomputes every tick.
+        self.reuse = ReuseCache() if reuse else None
+        # Per-tick deadline and shed log; None runs every block whatever the time.
+        self.budget = TickBudget(budget_ms) if budget_ms else None
 
-        self.flipper_second_bids = [] 
+        # Historical data trackers for visualization or computing metrics.
+        self.kelp_prices = History(10)                   # Stores fair values for KELP.
+        self.kelp_vwap = History(10)                     # Stores VWAP for KELP.
+        self.kelp_volume = History(10)                   # Stores top-of-book volume for KELP.
+        self.squidink_prices = History(HISTORY_CAPACITY) # Stores fair values for SQUID_INK.
+        self.squidink_stats = RollingStats(10)  # Rolling window behind the SQUID_INK z-score.
+
+        self.flipper_second_bids = History(HISTORY_CAPACITY)
+        # Recent MAGNIFICENT_MACARONS exit prices behind the conversion planner's forecast.
+        self.macarons_exit_long = History(MACARONS_TREND_WINDOW)
+        self.macarons_exit_short = History(MACARONS_TREND_WINDOW)
+
+        # Last traderData this instance emitted; an identical incoming blob needs no decoding.
+        self.trader_data = ""
+
+        # Basket/component conversion LP, built on first use; its optimal basis warm-starts the next tick.
+        self.conversion_lp = None
+
+        # Registry dispatch table: symbol -> (bound strategy, limit, fallback, params).
+        self.position_limits = {symbol: spec["limit"] for symbol, spec in PRODUCTS.items()}
+        self.strategies = {
+            symbol: (getattr(self, spec["strategy"]), spec["limit"], spec["fallback"], spec["params"])
+            for symbol, spec in PRODUCTS.items() if spec["strategy"]
+        }
+        # Symbols whose orders can be reused while their inputs repeat: symbol -> (state hook, track hook).
+        self.reusable = {
+            symbol: tuple(getattr(self, spec["reuse"][hook]) if hook in spec["reuse"] else None
+                          for hook in ("state", "track"))
+            for symbol, spec in PRODUCTS.items() if spec["strategy"] and "reuse" in spec
+        }
+        # Shared-input blocks a symbol is shed with: symbol -> bound "requires" method.
+        self.requirements = {symbol: getattr(self, spec["requires"])
+                             for symbol, spec in PRODUCTS.items() if "requires" in spec}
+        # Shedding priority per symbol; run() dispatches the symbols of a tick in this order.
+        self.priorities = {symbol: spec.get("priority", PRIORITY_CORE) for symbol, spec in PRODUCTS.items()}
+        # Take-only symbols, batched through one kernel once TAKE_BATCH_MIN_SYMBOLS of them are
+        # quoted in a tick: symbol -> (strategy name, limit, fallback).
+        self.take_products = {
+            symbol: (spec["strategy"], spec["limit"], spec["fallback"])
+            for symbol, spec in PRODUCTS.items() if np is not None and spec["strategy"] in TAKE_STRATEGIES
+        }
+        # Per-tick context for strategies that look beyond their own book; set by run().
+        self.books: Dict[str, BookView] = {}
+        self.positions: Dict[str, int] = {}
+        self.observations = None
+        self.voucher_prices = None
+        self.voucher_chain_shed = False
+        self.conversions = 0
 
         # Configure the Volcanic Rock Vouchers
         # We assume T=7 days, a placeholder for “time to expiry,” r=0, and sigma=0.2 by default
         self.volcanic_voucher_config = {
-            "VOLCANIC_ROCK_VOUCHER_9500":  {"strike": 9500,  "limit": 300, "T": 7, "r": 0.0, "sigma": 0.2},
-            "VOLCANIC_ROCK_VOUCHER_9750":  {"strike": 9750,  "limit": 200, "T": 7, "r": 0.0, "sigma": 0.2},
-            "VOLCANIC_ROCK_VOUCHER_10000": {"strike": 10000, "limit": 200, "T": 7, "r": 0.0, "sigma": 0.2},
-            "VOLCANIC_ROCK_VOUCHER_10250": {"strike": 10250, "limit": 200, "T": 7, "r": 0.0, "sigma": 0.2},
-            "VOLCANIC_ROCK_VOUCHER_10500": {"strike": 10500, "limit": 200, "T": 7, "r": 0.0, "sigma": 0.2},
+            "VOLCANIC_ROCK_VOUCHER_9500":  {"strike": 9500,  "T": 7, "r": 0.0, "sigma": 0.2},
+            "VOLCANIC_ROCK_VOUCHER_9750":  {"strike": 9750,  "T": 7, "r": 0.0, "sigma": 0.2},
+            "VOLCANIC_ROCK_VOUCHER_10000": {"strike": 10000, "T": 7, "r": 0.0, "sigma": 0.2},
+            "VOLCANIC_ROCK_VOUCHER_10250": {"strike": 10250, "T": 7, "r": 0.0, "sigma": 0.2},
+            "VOLCANIC_ROCK_VOUCHER_10500": {"strike": 10500, "T": 7, "r": 0.0, "sigma": 0.2},
         }
+        # The per-strike arrays are built by refresh_voucher_chain when the chain is first priced.
+        self.voucher_products = None
 
     # 1) RESIN STRATEGY (Fixed fair value)
-    def resin_orders(self, order_depth: OrderDepth, fair_value: int, width: int,
-                     position: int, position_limit: int) -> List[Order]:
+    def resin_orders(self, symbol: str, book: BookView, position: int, position_limit: int,
+                     fair_value: int, width: int) -> List[Order]:
         orders: List[Order] = []
         buy_order_volume = 0
         sell_order_volume = 0
 
-        # For Resin, we maintain a fixed fair value = 10000
-        fair_value = 10000
-
-        if order_depth.sell_orders:
-            best_ask = min(order_depth.sell_orders.keys())
-            best_ask_amount = -order_depth.sell_orders[best_ask]
+        if book.sell_orders:
+            best_ask = book.best_ask
+            best_ask_amount = book.best_ask_volume
             if best_ask < fair_value:
                 quantity = min(best_ask_amount, position_limit - position)
                 if quantity > 0:
-                    orders.append(Order("RAINFOREST_RESIN", round(best_ask), quantity))
+                    orders.append(Order(symbol, round(best_ask), quantity))
                     buy_order_volume += quantity
 
-        if order_depth.buy_orders:
-            best_bid = max(order_depth.buy_orders.keys())
-            best_bid_amount = order_depth.buy_orders[best_bid]
+        if book.buy_orders:
+            best_bid = book.best_bid
+            best_bid_amount = book.best_bid_volume
             if best_bid > fair_value:
                 quantity = min(best_bid_amount, position_limit + position)
                 if quantity > 0:
-                    orders.append(Order("RAINFOREST_RESIN", round(best_bid), -quantity))
+                    orders.append(Order(symbol, round(best_bid), -quantity))
                     sell_order_volume += quantity
 
         buy_order_volume, sell_order_volume = self.clear_position_order(
-            orders, order_depth, position, position_limit, "RAINFOREST_RESIN",
+            orders, book, position, position_limit, symbol,
             buy_order_volume, sell_order_volume, fair_value, width=1
         )
 
         # Fill remaining capacity with passive orders.
         buy_quantity = position_limit - (position + buy_order_volume)
         if buy_quantity > 0:
-            orders.append(Order("RAINFOREST_RESIN", round(fair_value - 1), buy_quantity))
+            orders.append(Order(symbol, round(fair_value - 1), buy_quantity))
         sell_quantity = position_limit + (position - sell_order_volume)
         if sell_quantity > 0:
-            orders.append(Order("RAINFOREST_RESIN", round(fair_value + 1), -sell_quantity))
+            orders.append(Order(symbol, round(fair_value + 1), -sell_quantity))
 
         return orders
 
     # 2) KELP STRATEGY
-    def kelp_fair_value(self, order_depth: OrderDepth, method="volume_weighted") -> float:
-        if not order_depth.sell_orders or not order_depth.buy_orders:
-            return 2000  # fallback value
+    def kelp_fair_value(self, book: BookView, fallback: float = 2000, method="volume_weighted") -> float:
+        if not book.has_both:
+            return fallback
 
-        best_ask = min(order_depth.sell_orders.keys())
-        best_bid = max(order_depth.buy_orders.keys())
         if method == "volume_weighted":
-            total_sell_volume = sum(abs(vol) for vol in order_depth.sell_orders.values())
-            total_buy_volume = sum(abs(vol) for vol in order_depth.buy_orders.values())
-            if total_sell_volume == 0 or total_buy_volume == 0:
-                return 2000
-            weighted_sell_price = sum(price * abs(vol) for price, vol in order_depth.sell_orders.items()) / total_sell_volume
-            weighted_buy_price  = sum(price * abs(vol) for price, vol in order_depth.buy_orders.items()) / total_buy_volume
-            return (weighted_sell_price + weighted_buy_price) / 2
-        return (best_ask + best_bid) / 2
-
-    def kelp_orders(self, order_depth: OrderDepth, timespan: int, width: float,
-                    take_width: float, position: int, position_limit: int) -> List[Order]:
-        orders: List[Order] = []
-        buy_order_volume = 0
-        sell_order_volume = 0
-
-        if not order_depth.sell_orders or not order_depth.buy_orders:
-            return orders
+            vwap = book.vwap
+            return fallback if vwap is None else vwap
+        return book.mid
+
+    def kelp_track(self, symbol: str, book: BookView, position: int, position_limit: int,
+                   fallback: float, timespan: int, **params) -> float:
+        """Record this tick's KELP fair value, top-of-book VWAP and volume; returns the fair value."""
+        if not book.has_both:
+            return fallback
+        fair_value = self.kelp_fair_value(book, fallback, method="volume_weighted")
 
-        best_ask = min(order_depth.sell_orders.keys())
-        best_bid = max(order_depth.buy_orders.keys())
-        fair_value = self.kelp_fair_value(order_depth, method="volume_weighted")
+        volume = book.best_ask_volume + book.best_bid_volume
+        vwap = (book.best_bid * book.best_ask_volume +
+                book.best_ask * book.best_bid_volume) / volume
 
-        volume = -order_depth.sell_orders[best_ask] + order_depth.buy_orders[best_bid]
-        vwap = (best_bid * (-order_depth.sell_orders[best_ask]) +
-                best_ask * order_depth.buy_orders[best_bid]) / volume
+        # Keep history within the defined time window.
+        if self.kelp_prices.capacity != timespan:
+            self.kelp_prices = History(timespan, self.kelp_prices)
+            self.kelp_vwap = History(timespan, self.kelp_vwap)
+            self.kelp_volume = History(timespan, self.kelp_volume)
 
         # Track fair value and VWAP.
-        self.kelp_vwap.append({"vol": volume, "vwap": vwap})
+        self.kelp_vwap.append(vwap)
+        self.kelp_volume.append(volume)
         self.kelp_prices.append(fair_value)
+        return fair_value
 
-        # Keep history within the defined time window.
-        if len(self.kelp_vwap) > timespan:
-            self.kelp_vwap.pop(0)
-        if len(self.kelp_prices) > timespan:
-            self.kelp_prices.pop(0)
+    def kelp_orders(self, symbol: str, book: BookView, position: int, position_limit: int,
+                    fallback: float, timespan: int, width: float, take_width: float) -> List[Order]:
+        orders: List[Order] = []
+        buy_order_volume = 0
+        sell_order_volume = 0
+
+        if not book.has_both:
+            return orders
+
+        best_ask = book.best_ask
+        best_bid = book.best_bid
+        fair_value = self.kelp_track(symbol, book, position, position_limit, fallback, timespan)
 
         # Aggressive buy if best_ask is well below fair_value
         if best_ask <= fair_value - take_width:
-            ask_amount = -order_depth.sell_orders[best_ask]
+            ask_amount = book.best_ask_volume
             if ask_amount <= 20:
                 quantity = min(ask_amount, position_limit - position)
                 if quantity > 0:
-                    orders.append(Order("KELP", round(best_ask), quantity))
+                    orders.append(Order(symbol, round(best_ask), quantity))
                     buy_order_volume += quantity
 
         # Aggressive sell if best_bid is well above fair_value
         if best_bid >= fair_value + take_width:
-            bid_amount = order_depth.buy_orders[best_bid]
+            bid_amount = book.best_bid_volume
             if bid_amount <= 20:
                 quantity = min(bid_amount, position_limit + position)
                 if quantity > 0:
-                    orders.append(Order("KELP", round(best_bid), -quantity))
+                    orders.append(Order(symbol, round(best_bid), -quantity))
                     sell_order_volume += quantity
 
         buy_order_volume, sell_order_volume = self.clear_position_order(
-            orders, order_depth, position, position_limit, "KELP",
+            orders, book, position, position_limit, symbol,
             buy_order_volume, sell_order_volume, fair_value, width=2
         )
 
         # Passive order pricing.
-        aaf = [price for price in order_depth.sell_orders.keys() if price > fair_value + 1]
-        bbf = [price for price in order_depth.buy_orders.keys() if price < fair_value - 1]
-        passive_sell_price = min(aaf) if aaf else fair_value + 2
-        passive_buy_price = max(bbf) if bbf else fair_value - 2
+        passive_sell_price = next((price for price, _ in book.asks if price > fair_value + 1), fair_value + 2)
+        passive_buy_price = next((price for price, _ in book.bids if price < fair_value - 1), fair_value - 2)
 
         buy_quantity = position_limit - (position + buy_order_volume)
         if buy_quantity > 0:
-            orders.append(Order("KELP", round(passive_buy_price + 1), buy_quantity))
+            orders.append(Order(symbol, round(passive_buy_price + 1), buy_quantity))
         sell_quantity = position_limit + (position - sell_order_volume)
         if sell_quantity > 0:
-            orders.append(Order("KELP", round(passive_sell_price - 1), -sell_quantity))
+            orders.append(Order(symbol, round(passive_sell_price - 1), -sell_quantity))
         return orders
 
     # 3) SQUID INK STRATEGY WITH MEAN REVERSION
-    def squidink_fair_value(self, order_depth: OrderDepth, method="volume_weighted") -> float:
-        if not order_depth.sell_orders or not order_depth.buy_orders:
-            return 2000
-        best_ask = min(order_depth.sell_orders.keys())
-        best_bid = max(order_depth.buy_orders.keys())
-        if method == "volume_weighted":
-            total_sell_volume = sum(abs(vol) for vol in order_depth.sell_orders.values())
-            total_buy_volume = sum(abs(vol) for vol in order_depth.buy_orders.values())
-            if total_sell_volume == 0 or total_buy_volume == 0:
-                return 2000
-            weighted_sell_price = sum(price * abs(vol) for price, vol in order_depth.sell_orders.items()) / total_sell_volume
-            weighted_buy_price  = sum(price * abs(vol) for price, vol in order_depth.buy_orders.items()) / total_buy_volume
-            return (weighted_sell_price + weighted_buy_price) / 2
-        return (best_ask + best_bid) / 2
-
-    def compute_swing_metric(self, window: int = 10) -> Tuple[float, float]:
-        """Compute the moving average and standard deviation for the recent Squid Ink fair values."""
-        recent = self.squidink_prices[-window:] if len(self.squidink_prices) >= window else self.squidink_prices
-        if not recent:
-            return 0, 0
-        avg = sum(recent) / len(recent)
-        variance = sum((x - avg) ** 2 for x in recent) / len(recent)
-        std = math.sqrt(variance)
-        return avg, std
-
-    def mid_price(self, order_depth: OrderDepth, fallback: float) -> float:
-        if not order_depth.sell_orders or not order_depth.buy_orders:
+    def squidink_fair_value(self, book: BookView, fallback: float = 2000, method="volume_weighted") -> float:
+        if not book.has_both:
             return fallback
-        best_ask = min(order_depth.sell_orders.keys())
-        best_bid = max(order_depth.buy_orders.keys())
-        return (best_ask + best_bid) / 2
+        if method == "volume_weighted":
+            vwap = book.vwap
+            return fallback if vwap is None else vwap
+        return book.mid
+
+    def compute_swing_metric(self) -> Tuple[float, float]:
+        """Moving average and standard deviation of the recent Squid Ink fair values."""
+        return self.squidink_stats.mean(), self.squidink_stats.std()
+
+    def mid_price(self, book: BookView, fallback: float) -> float:
+        return book.mid_or(fallback)
 
-    def optimize_conversion_arbitrage(self, prices: dict, position_limits: dict) -> Tuple[dict, float]:
+    def optimize_conversion_arbitrage(self, books: Dict[str, BookView], positions: Dict[str, int],
+                                      position_limits: dict,
+                                      pending: Dict[str, List[Order]]) -> Tuple[dict, float]:
         """
-        A math‐only approach that “solves” a linear program for baskets vs. components.
-        We keep it simple for demonstration.
+        Solve the basket/component conversion LP against the depth the `pending` orders
+        leave behind and within the capacity they leave free.
+        Returns the target position of every product that should trade and the cash edge.
         """
-        items = ["CROISSANT", "JAM", "DJEMBE", "PICNIC_BASKET1", "PICNIC_BASKET2"]
-        fv_c = prices["CROISSANT"]
-        fv_j = prices["JAM"]
-        fv_d = prices["DJEMBE"]
-        synthetic_b1 = 6 * fv_c + 3 * fv_j + 1 * fv_d
-        synthetic_b2 = 4 * fv_c + 2 * fv_j
-
-        # Construct the advantage vector
-        adv = [
-            prices["CROISSANT"] - fv_c,
-            prices["JAM"] - fv_j,
-            prices["DJEMBE"] - fv_d,
-            prices["PICNIC_BASKET1"] - synthetic_b1,
-            prices["PICNIC_BASKET2"] - synthetic_b2,
-        ]
-
-        decision = {}
-        total_profit = 0
-        for i, item in enumerate(items):
-            limit = position_limits[item]
-            if adv[i] > 0:
-                decision[item] = limit
-                total_profit += adv[i] * limit
-            elif adv[i] < 0:
-                decision[item] = -limit
-                total_profit += adv[i] * (-limit)
-            else:
-                decision[item] = 0
-
-        return decision, total_profit
+        if np is None or any(product not in books for product in CONVERSION_PRODUCTS):
+            return {}, 0.0
+        if self.conversion_lp is None:
+            self.conversion_lp = ConversionLP()
+        asks, bids, buy_caps, sell_caps = [], [], [], []
+        for product in CONVERSION_PRODUCTS:
+            book = books[product]
+            orders = pending.get(product, ())
+            position = positions.get(product, 0)
+            asks.append(residual_levels(book.asks, orders, buying=True))
+            bids.append(residual_levels(book.bids, orders, buying=False))
+            buy_caps.append(remaining_capacity(position, position_limits[product], orders, buying=True))
+            sell_caps.append(remaining_capacity(position, position_limits[product], orders, buying=False))
+        net, profit = self.conversion_lp.solve(asks, bids, buy_caps, sell_caps)
+        decision = {product: positions.get(product, 0) + qty for product, qty in net.items()}
+        return decision, profit
 
     # Helper: Decompose LP Decision into Executable Orders
-    def decompose_lp_conversion_orders(self, state: TradingState, prices: dict, lp_decision: dict) -> List[Order]:
+    def decompose_lp_conversion_orders(self, state: TradingState, books: Dict[str, BookView],
+                                       lp_decision: dict, pending: Dict[str, List[Order]]) -> List[Order]:
         """
         Using the LP conversion decision and current positions, compute the orders needed to adjust positions.
-        For each product, if the LP target differs from the current position, generate an order at
-        best available price.
+        Each order is priced at the worst level it has to reach once the `pending` orders
+        have taken their share of the book.
         """
         conversion_orders = []
         for product, target_net in lp_decision.items():
-            current_position = state.position.get(product, 0)
-            order_volume = target_net - current_position
-            # Only trade if the adjustment is nonzero.
-            if abs(order_volume) < 1:
+            order_volume = target_net - state.position.get(product, 0)
+            if order_volume == 0:
                 continue
-
-            # Determine order price using the order depth if available.
-            if product in state.order_depths:
-                od = state.order_depths[product]
-                if order_volume > 0 and od.sell_orders:
-                    price = min(od.sell_orders.keys())
-                elif order_volume < 0 and od.buy_orders:
-                    price = max(od.buy_orders.keys())
-                else:
-                    price = prices.get(product, 1000)  # fallback
-            else:
-                price = prices.get(product, 1000)
-            conversion_orders.append(Order(product, round(price), int(order_volume)))
+            book = books[product]
+            levels = book.asks if order_volume > 0 else book.bids
+            walker = LevelWalker(residual_levels(levels, pending.get(product, ()), buying=order_volume > 0))
+            walker.take(abs(order_volume))
+            conversion_orders.append(Order(product, round(walker.worst_price), int(order_volume)))
         return conversion_orders
 
-    def squidink_utility_orders(self, order_depth: OrderDepth, position: int, position_limit: int,
-                                fair_value_base: float = 2000, candidate_range: int = 2) -> List[Order]:
-        orders: List[Order] = []
-        fair_value = self.squidink_fair_value(order_depth, method="volume_weighted")
+    def squidink_track(self, symbol: str, book: BookView, position: int, position_limit: int,
+                       fair_value_base: float = 2000, **params) -> float:
+        """Record this tick's SQUID_INK fair value in the history and rolling window; returns it."""
+        fair_value = self.squidink_fair_value(book, fair_value_base, method="volume_weighted")
         if fair_value == 0:
             fair_value = fair_value_base
-
-        # Record the raw fair value.
         self.squidink_prices.append(fair_value)
-        # Compute recent average and volatility.
-        avg, std = self.compute_swing_metric(window=10)
-        z = (fair_value - avg) / std if std > 0 else 0  # z-score
+        self.squidink_stats.push(fair_value)
+        return fair_value
+
+    def squidink_window_state(self, symbol: str, book: BookView, position: int, position_limit: int,
+                              fair_value_base: float = 2000, **params) -> Tuple:
+        """What the z-score after this tick's push depends on besides the book: the running moments and the sample it evicts."""
+        return self.squidink_stats.state()
+
+    def squidink_utility_orders(self, symbol: str, book: BookView, position: int, position_limit: int,
+                                fair_value_base: float = 2000, candidate_range: int = 2) -> List[Order]:
+        orders: List[Order] = []
+        fair_value = self.squidink_track(symbol, book, position, position_limit, fair_value_base)
+        # z-score against the recent average and volatility.
+        z = self.squidink_stats.zscore(fair_value)
 
         candidate_prices = [int(fair_value + offset) for offset in range(-candidate_range, candidate_range + 1)]
         best_buy_price = None
@@ -322,8 +1593,8 @@ class Trader:
         best_sell_price = None
         best_sell_utility = float("-inf")
 
-        best_ask = min(order_depth.sell_orders.keys()) if order_depth.sell_orders else None
-        best_bid = max(order_depth.buy_orders.keys()) if order_depth.buy_orders else None
+        best_ask = book.best_ask
+        best_bid = book.best_bid
 
         for price in candidate_prices:
             if best_ask is not None and price < fair_value:
@@ -355,57 +1626,146 @@ class Trader:
         buy_volume = min(self.max_trade_volume, position_limit - position)
         sell_volume = min(self.max_trade_volume, position_limit + position)
         if best_buy_price is not None and buy_volume > 0:
-            orders.append(Order("SQUID_INK", best_buy_price, buy_volume))
+            orders.append(Order(symbol, best_buy_price, buy_volume))
         if best_sell_price is not None and sell_volume > 0:
-            orders.append(Order("SQUID_INK", round(best_sell_price), -sell_volume))
+            orders.append(Order(symbol, round(best_sell_price), -sell_volume))
         return orders
 
     # 4) NEW: VOLCANIC ROCK VOUCHERS
-    def volcanic_voucher_orders(self, product: str, order_depth: OrderDepth,
-                                position: int) -> List[Order]:
+    def refresh_voucher_chain(self) -> None:
+        """Rebuild the per-strike arrays used by the batch pricer; call after editing volcanic_voucher_config."""
+        self.voucher_products = list(self.volcanic_voucher_config)
+        chain = [self.volcanic_voucher_config[p] for p in self.voucher_products]
+        # Time T is in 'days'; the pricer wants a fraction of a year.
+        columns = ([c["strike"] for c in chain], [c["T"] / 365.0 for c in chain],
+                   [c["r"] for c in chain], [c["sigma"] for c in chain])
+        if np is not None:
+            columns = tuple(np.array(column, dtype=float) for column in columns)
+        self.voucher_strikes, self.voucher_T, self.voucher_r, self.voucher_sigma = columns
+        self.voucher_smile = VoucherSmile(self.voucher_sigma)
+        self.voucher_greeks = VoucherGreeks(self.voucher_products)
+        self.volcanic_rock_spot = VOLCANIC_ROCK_FALLBACK
+
+    def voucher_theoretical_prices(self, books: Dict[str, BookView]) -> Dict[str, float]:
         """
-        Simple Black–Scholes approach for each VOLCANIC_ROCK_VOUCHER_x product.
-        We treat them as (cash-settled) call options on some "VOLCANIC_ROCK" underlying
-        whose current “spot price” we must infer or guess.
+        Black–Scholes value of every voucher in the chain, priced in a single batch call.
+        Spot is the VOLCANIC_ROCK mid (last seen value if its book is one-sided), and the
+        vol for each strike comes from the smile fitted to the vouchers' own mids. Until
+        a smile exists the configured sigma is used. The same call refreshes the greeks
+        behind voucher_greeks.
+        """
+        if self.voucher_products is None:
+            self.refresh_voucher_chain()
+        if VOLCANIC_ROCK in books:
+            self.volcanic_rock_spot = books[VOLCANIC_ROCK].mid_or(self.volcanic_rock_spot)
+        S = self.volcanic_rock_spot
+        nan = float("nan")
+        mids = [books[p].mid_or(nan) if p in books else nan for p in self.voucher_products]
+        # Same spot and voucher mids as the last pricing: the smile and prices would repeat too.
+        key = (S, tuple(m if m == m else None for m in mids))
+        cached = self.reuse.get("voucher_chain", key) if self.reuse else None
+        if cached is not None:
+            prices, greeks = cached
+            self.voucher_greeks.reprice(S, greeks)
+            return prices
+        self.voucher_smile.update(S, self.voucher_strikes, self.voucher_T, self.voucher_r, mids)
+        sigma = self.voucher_smile.sigma(S, self.voucher_strikes, self.voucher_T)
+        prices, greeks = black_scholes_call_prices(S, self.voucher_strikes, self.voucher_T, self.voucher_r,
+                                                   self.voucher_sigma if sigma is None else sigma, greeks=True)
+        self.voucher_greeks.reprice(S, greeks)
+        prices = dict(zip(self.voucher_products, [float(p) for p in prices]))
+        if self.reuse:
+            self.reuse.put("voucher_chain", key, (prices, greeks))
+        return prices
+
+    def price_voucher_chain(self) -> bool:
+        """
+        Price the chain for this tick as the low-priority "voucher_chain" block, once, for the
+        hedge and every voucher to read. Returns whether prices are available: once the budget
+        sheds the block, it stays shed, and the vouchers with it, for the rest of the tick.
+        """
+        if self.voucher_prices is None and not self.voucher_chain_shed:
+            budget = self.budget
+            if budget is None or budget.admit("voucher_chain", PRIORITY_LOW):
+                self.voucher_prices = self.voucher_theoretical_prices(self.books)
+                if budget:
+                    budget.done()
+            else:
+                self.voucher_chain_shed = True
+        return self.voucher_prices is not None
+
+    def voucher_price(self, product: str, book: BookView, position: int, position_limit: int,
+                      fallback=None) -> float:
+        """This tick's theoretical price for one voucher, or None while the chain is not priced."""
+        return self.voucher_prices[product] if self.price_voucher_chain() else None
 
-        We'll do a naive approach:
-          - Assume a placeholder for 'S' (the underlying 'VOLCANIC_ROCK' spot),
-            or if you have a real order book for "VOLCANIC_ROCK", you can mid-price that.
+    def delta_hedge_orders(self, symbol: str, book: BookView, position: int, position_limit: int,
+                           fallback: float, band: float) -> List[Order]:
+        """
+        Keep the voucher book delta-neutral with VOLCANIC_ROCK. Voucher fills since the
+        last tick are folded into voucher_greeks; if any voucher is quoted the chain is
+        (re)priced, which this tick's voucher strategies share, otherwise delta follows
+        the spot move through gamma. The repricing is the low-priority voucher_chain
+        block: when the time budget sheds it, delta follows the spot move as well. When voucher
+        delta plus the rock position leaves +-band, the rock book is crossed to bring
+        the total back to zero.
+        """
+        if self.voucher_products is None:
+            self.refresh_voucher_chain()
+        greeks = self.voucher_greeks
+        greeks.fill(self.positions)
+        if not (any(p in self.books for p in self.voucher_products) and self.price_voucher_chain()):
+            if book.has_both:
+                self.volcanic_rock_spot = book.mid
+            greeks.move_spot(self.volcanic_rock_spot)
+        if greeks.unit is None:
+            return []
+
+        exposure = greeks.delta + position
+        if abs(exposure) <= band:
+            return []
+        if exposure > 0:
+            wanted, levels, side = min(round(exposure), position_limit + position), book.bids, -1
+        else:
+            wanted, levels, side = min(round(-exposure), position_limit - position), book.asks, 1
+        quantity, price = 0, None
+        for level_price, volume in levels:
+            if quantity >= wanted:
+                break
+            quantity += min(volume, wanted - quantity)
+            price = level_price
+        if quantity <= 0:
+            return []
+        return [Order(symbol, price, side * quantity)]
+
+    def volcanic_voucher_orders(self, product: str, book: BookView, position: int, position_limit: int,
+                                fallback=None) -> List[Order]:
+        """
+        Simple Black–Scholes approach for each VOLCANIC_ROCK_VOUCHER_x product.
+        We treat them as (cash-settled) call options on some "VOLCANIC_ROCK" underlying;
+        the theoretical price comes from the chain price_voucher_chain prices once per tick;
+        without it (shed by the time budget) there are no orders.
           - Compare best_ask and best_bid vs. Black–Scholes call price.
           - If ask < theoretical, buy. If bid > theoretical, sell.
         """
         orders: List[Order] = []
-        config = self.volcanic_voucher_config[product]
-        strike = config["strike"]
-        position_limit = config["limit"]
-        T = config["T"]
-        r = config["r"]
-        sigma = config["sigma"]
-
-        # Naive assumption for the underlying price S:
-        # If you actually have an order_depth for "VOLCANIC_ROCK", do a mid_price or volume-weighted.
-        # For now, let's guess underlying is ~ 10,000:
-        S = 10000.0
-
-        # Compute a simplistic “fair value” via Black–Scholes
-        # Time T is in 'days', we might convert T to fraction of year => T_years = T / 365
-        T_years = T / 365.0
-
-        theoretical_price = black_scholes_call_price(S, strike, T_years, r, sigma)
+        if not self.price_voucher_chain():
+            return orders
+        theoretical_price = self.voucher_prices[product]
 
         # Now see if best_ask < theoretical => buy, best_bid > theoretical => sell
-        if order_depth.sell_orders:
-            best_ask = min(order_depth.sell_orders.keys())
-            best_ask_qty = -order_depth.sell_orders[best_ask]
+        if book.sell_orders:
+            best_ask = book.best_ask
+            best_ask_qty = book.best_ask_volume
             if best_ask < theoretical_price:
                 # Attempt to buy up to best_ask_qty or up to position limit
                 buy_qty = min(best_ask_qty, position_limit - position)
                 if buy_qty > 0:
                     orders.append(Order(product, round(best_ask), buy_qty))
 
-        if order_depth.buy_orders:
-            best_bid = max(order_depth.buy_orders.keys())
-            best_bid_qty = order_depth.buy_orders[best_bid]
+        if book.buy_orders:
+            best_bid = book.best_bid
+            best_bid_qty = book.best_bid_volume
             if best_bid > theoretical_price:
                 # Attempt to sell up to best_bid_qty or up to position limit
                 sell_qty = min(best_bid_qty, position_limit + position)
@@ -415,146 +1775,125 @@ class Trader:
         return orders
 
     # 5) BREAD/JAM/DJEMBE/BASKET STRATEGIES
-    def croissant_fair_value(self, order_depth: OrderDepth) -> float:
-        if not order_depth.sell_orders or not order_depth.buy_orders:
-            return 4300
-        best_ask = min(order_depth.sell_orders.keys())
-        best_bid = max(order_depth.buy_orders.keys())
-        return (best_ask + best_bid) / 2
-
-    def jam_fair_value(self, order_depth: OrderDepth) -> float:
-        if not order_depth.sell_orders or not order_depth.buy_orders:
-            return 6600
-        best_ask = min(order_depth.sell_orders.keys())
-        best_bid = max(order_depth.buy_orders.keys())
-        return (best_ask + best_bid) / 2
-
-    def djembe_fair_value(self, order_depth: OrderDepth) -> float:
-        if not order_depth.sell_orders or not order_depth.buy_orders:
-            return 13400
-        best_ask = min(order_depth.sell_orders.keys())
-        best_bid = max(order_depth.buy_orders.keys())
-        return (best_ask + best_bid) / 2
-
-    def croissant_orders(self, order_depth: OrderDepth, position: int, position_limit: int) -> List[Order]:
+    def take_orders(self, symbol: str, book: BookView, position: int, position_limit: int,
+                    fallback: float) -> List[Order]:
+        """Take the top of book when it crosses the mid (`fallback` while one-sided), up to max_trade_volume."""
         orders: List[Order] = []
-        fair_value = self.croissant_fair_value(order_depth)
-        if order_depth.sell_orders:
-            best_ask = min(order_depth.sell_orders.keys())
-            available = -order_depth.sell_orders[best_ask]
+        fair_value = book.mid_or(fallback)
+        if book.sell_orders:
+            best_ask = book.best_ask
+            available = book.best_ask_volume
             if best_ask < fair_value:
                 quantity = min(available, position_limit - position, self.max_trade_volume)
                 if quantity > 0:
-                    orders.append(Order("CROISSANT", round(best_ask), quantity))
-        if order_depth.buy_orders:
-            best_bid = max(order_depth.buy_orders.keys())
-            available = order_depth.buy_orders[best_bid]
+                    orders.append(Order(symbol, round(best_ask), quantity))
+        if book.buy_orders:
+            best_bid = book.best_bid
+            available = book.best_bid_volume
             if best_bid > fair_value:
                 quantity = min(available, position_limit + position, self.max_trade_volume)
                 if quantity > 0:
-                    orders.append(Order("CROISSANT", round(best_bid), -quantity))
+                    orders.append(Order(symbol, round(best_bid), -quantity))
         return orders
 
-    def jam_orders(self, order_depth: OrderDepth,
-                   position: int, position_limit: int) -> List[Order]:
-        orders: List[Order] = []
-        fair_value = self.jam_fair_value(order_depth)
-        if order_depth.sell_orders:
-            best_ask = min(order_depth.sell_orders.keys())
-            available = -order_depth.sell_orders[best_ask]
-            if best_ask < fair_value:
-                quantity = min(available, position_limit - position, self.max_trade_volume)
-                if quantity > 0:
-                    orders.append(Order("JAM", round(best_ask), quantity))
-        if order_depth.buy_orders:
-            best_bid = max(order_depth.buy_orders.keys())
-            available = order_depth.buy_orders[best_bid]
-            if best_bid > fair_value:
-                quantity = min(available, position_limit + position, self.max_trade_volume)
-                if quantity > 0:
-                    orders.append(Order("JAM", round(best_bid), -quantity))
-        return orders
+    def batch_take_orders(self, symbols: List[str], books: Dict[str, BookView],
+                          positions: Dict[str, int]) -> Dict[str, List[Order]]:
+        """
+        take_orders and volcanic_voucher_orders for every symbol in `symbols` through one
+        take_mispriced call. Component fair values are mids (the registry fallback while
+        one-sided) with max_trade_volume as the size cap. Vouchers use the chain's
+        theoretical prices and are capped only by their limit.
+        """
+        nan = float("nan")
+        rows = []
+        for symbol in symbols:
+            # Read the raw depth dicts; the mids are formed below in one vector operation.
+            buy_orders, sell_orders = books[symbol].buy_orders, books[symbol].sell_orders
+            bid = max(buy_orders) if buy_orders else nan
+            ask = min(sell_orders) if sell_orders else nan
+            strategy, limit, fallback = self.take_products[symbol]
+            if strategy == "volcanic_voucher_orders":
+                # Without a priced chain the fair value is NaN, which no quote crosses.
+                fair_value = self.voucher_prices[symbol] if self.price_voucher_chain() else nan
+                rows.append((bid, buy_orders.get(bid, 0), ask, -sell_orders.get(ask, 0),
+                             fair_value, 0.0, positions.get(symbol, 0), limit, limit))
+            else:
+                rows.append((bid, buy_orders.get(bid, 0), ask, -sell_orders.get(ask, 0),
+                             fallback, 1.0, positions.get(symbol, 0), limit, self.max_trade_volume))
+        (best_bid, bid_volume, best_ask, ask_volume, fallback, use_mid,
+         position, limit, max_volume) = np.array(rows, dtype=float).T
+        mid = (best_bid + best_ask) / 2
+        fair_value = np.where((use_mid > 0) & ~np.isnan(mid), mid, fallback)
+        buy, sell = take_mispriced(best_bid, bid_volume, best_ask, ask_volume, fair_value, position, limit, max_volume)
+
+        result: Dict[str, List[Order]] = {}
+        for i in np.flatnonzero(buy | sell).tolist():
+            symbol = symbols[i]
+            bid_price, _, ask_price = rows[i][:3]
+            orders = result[symbol] = []
+            if buy[i]:
+                orders.append(Order(symbol, round(ask_price), int(buy[i])))
+            if sell[i]:
+                orders.append(Order(symbol, round(bid_price), -int(sell[i])))
+        return result
+
+    def basket_arbitrage_orders(self, basket: str, books: Dict[str, BookView], positions: Dict[str, int],
+                                pos_limits: Dict[str, int],
+                                pending: Dict[str, List[Order]]) -> Dict[str, List[Order]]:
+        """
+        Hedged basket-vs-components arbitrage across every book level.
+        Either sells the basket into its bids while lifting the component asks, or buys
+        the basket while hitting the component bids, sized to the largest quantity whose
+        marginal unit is still profitable. Capacity accounts for the position limits and
+        for orders already `pending` on the same symbols this tick, and every book is
+        walked from what those orders leave of it, so a second basket never counts on
+        component liquidity the first one already took. Each leg is a single order at
+        the worst level it needs, which sweeps the better levels in front of it.
+        """
+        recipe = BASKET_RECIPES[basket]
 
-    def djembe_orders(self, order_depth: OrderDepth,
-                      position: int, position_limit: int) -> List[Order]:
-        orders: List[Order] = []
-        fair_value = self.djembe_fair_value(order_depth)
-        if order_depth.sell_orders:
-            best_ask = min(order_depth.sell_orders.keys())
-            available = -order_depth.sell_orders[best_ask]
-            if best_ask < fair_value:
-                quantity = min(available, position_limit - position, self.max_trade_volume)
-                if quantity > 0:
-                    orders.append(Order("DJEMBE", round(best_ask), quantity))
-        if order_depth.buy_orders:
-            best_bid = max(order_depth.buy_orders.keys())
-            available = order_depth.buy_orders[best_bid]
-            if best_bid > fair_value:
-                quantity = min(available, position_limit + position, self.max_trade_volume)
-                if quantity > 0:
-                    orders.append(Order("DJEMBE", round(best_bid), -quantity))
-        return orders
+        def capacity(symbol: str, buying: bool) -> int:
+            return remaining_capacity(positions.get(symbol, 0), pos_limits[symbol], pending.get(symbol, ()), buying)
 
-    def basket1_orders(self, order_depths: dict, position: int, position_limit: int) -> List[Order]:
+        for sell_basket in (True, False):
+            max_qty = capacity(basket, buying=not sell_basket)
+            for component, weight in recipe.items():
+                max_qty = min(max_qty, capacity(component, buying=sell_basket) // weight)
+            if max_qty <= 0:
+                continue
+            basket_book = books[basket]
+            basket_levels = residual_levels(basket_book.bids if sell_basket else basket_book.asks,
+                                            pending.get(basket, ()), buying=not sell_basket)
+            legs = [(weight, residual_levels(books[component].asks if sell_basket else books[component].bids,
+                                             pending.get(component, ()), buying=sell_basket))
+                    for component, weight in recipe.items()]
+            qty, basket_price, leg_prices, _, _ = walk_basket_arbitrage(basket_levels, legs, max_qty, sell_basket)
+            if qty > 0:
+                side = -1 if sell_basket else 1
+                orders = {basket: [Order(basket, round(basket_price), side * qty)]}
+                for (component, weight), price in zip(recipe.items(), leg_prices):
+                    orders[component] = [Order(component, round(price), -side * weight * qty)]
+                return orders
+        return {}
+
+    def basket1_orders(self, books: Dict[str, BookView], positions: Dict[str, int], pos_limits: Dict[str, int],
+                       pending: Dict[str, List[Order]]) -> Dict[str, List[Order]]:
         """
         For PICNIC_BASKET1, which is composed of:
           6 CROISSANTS, 3 JAM, 1 DJEMBE.
-        We compute synthetic fair value from components.
         """
-        croissant_depth = order_depths["CROISSANT"]
-        jam_depth = order_depths["JAM"]
-        djembe_depth = order_depths["DJEMBE"]
-        basket_depth = order_depths["PICNIC_BASKET1"]
-
-        synthetic_fv = (6 * self.croissant_fair_value(croissant_depth) +
-                        3 * self.jam_fair_value(jam_depth) +
-                        1 * self.djembe_fair_value(djembe_depth))
-        orders = []
-        if basket_depth.sell_orders:
-            best_ask = min(basket_depth.sell_orders.keys())
-            available = -basket_depth.sell_orders[best_ask]
-            if best_ask < synthetic_fv:
-                quantity = min(available, position_limit - position, self.max_trade_volume)
-                if quantity > 0:
-                    orders.append(Order("PICNIC_BASKET1", round(best_ask), quantity))
-        if basket_depth.buy_orders:
-            best_bid = max(basket_depth.buy_orders.keys())
-            available = basket_depth.buy_orders[best_bid]
-            if best_bid > synthetic_fv:
-                quantity = min(available, position_limit + position, self.max_trade_volume)
-                if quantity > 0:
-                    orders.append(Order("PICNIC_BASKET1", round(best_bid), -quantity))
-        return orders
+        return self.basket_arbitrage_orders("PICNIC_BASKET1", books, positions, pos_limits, pending)
 
-    def basket2_orders(self, order_depths: dict, position: int, position_limit: int) -> List[Order]:
+    def basket2_orders(self, books: Dict[str, BookView], positions: Dict[str, int], pos_limits: Dict[str, int],
+                       pending: Dict[str, List[Order]]) -> Dict[str, List[Order]]:
         """
         For PICNIC_BASKET2, composed of:
           4 CROISSANTS, 2 JAM.
         """
-        croissant_depth = order_depths["CROISSANT"]
-        jam_depth = order_depths["JAM"]
-        basket_depth = order_depths["PICNIC_BASKET2"]
-
-        synthetic_fv = 4 * self.croissant_fair_value(croissant_depth) + 2 * self.jam_fair_value(jam_depth)
-        orders = []
-        if basket_depth.sell_orders:
-            best_ask = min(basket_depth.sell_orders.keys())
-            available = -basket_depth.sell_orders[best_ask]
-            if best_ask < synthetic_fv:
-                quantity = min(available, position_limit - position, self.max_trade_volume)
-                if quantity > 0:
-                    orders.append(Order("PICNIC_BASKET2", round(best_ask), quantity))
-        if basket_depth.buy_orders:
-            best_bid = max(basket_depth.buy_orders.keys())
-            available = basket_depth.buy_orders[best_bid]
-            if best_bid > synthetic_fv:
-                quantity = min(available, position_limit + position, self.max_trade_volume)
-                if quantity > 0:
-                    orders.append(Order("PICNIC_BASKET2", round(best_bid), -quantity))
-        return orders
+        return self.basket_arbitrage_orders("PICNIC_BASKET2", books, positions, pos_limits, pending)
 
     # HELPER: CLEAR POSITION (Shared)
-    def clear_position_order(self, orders: List[Order], order_depth: OrderDepth,
+    def clear_position_order(self, orders: List[Order], book: BookView,
                              position: int, position_limit: int, product: str,
                              buy_order_volume: int, sell_order_volume: int,
                              fair_value: float, width: int) -> (int, int):
@@ -564,15 +1903,15 @@ class Trader:
         buy_capacity  = position_limit - (position + buy_order_volume)
         sell_capacity = position_limit + (position - sell_order_volume)
         if position_after > 0:
-            if fair_ask in order_depth.buy_orders:
-                clear_qty = min(order_depth.buy_orders[fair_ask], position_after)
+            if fair_ask in book.buy_orders:
+                clear_qty = min(book.buy_orders[fair_ask], position_after)
                 qty_to_sell = min(sell_capacity, clear_qty)
                 if qty_to_sell > 0:
                     orders.append(Order(product, round(fair_ask), -abs(qty_to_sell)))
                     sell_order_volume += abs(qty_to_sell)
         elif position_after < 0:
-            if fair_bid in order_depth.sell_orders:
-                clear_qty = min(abs(order_depth.sell_orders[fair_bid]), abs(position_after))
+            if fair_bid in book.sell_orders:
+                clear_qty = min(abs(book.sell_orders[fair_bid]), abs(position_after))
                 qty_to_buy = min(buy_capacity, clear_qty)
                 if qty_to_buy > 0:
                     orders.append(Order(product, round(fair_bid), qty_to_buy))
@@ -585,7 +1924,7 @@ class Trader:
             obs.bidPrice
             - obs.exportTariff
             - obs.transportFees
-            - 0.1        # storage cost baked in
+            - self.macarons_planner.storage   # storage cost baked in
         )
         implied_ask = (
             obs.askPrice
@@ -595,36 +1934,34 @@ class Trader:
         return implied_bid, implied_ask
 
 
+    @memoized
+    def macarons_planner(self) -> ConversionPlanner:
+        return ConversionPlanner(MACARONS_LIMIT)
+
     def macarons_arb_take(
         self,
-        order_depth: OrderDepth,
+        book: BookView,
         obs: ConversionObservation,
         position: int,
     ) -> (List[Order], int, int):
         orders, buy_vol, sell_vol = [], 0, 0
-        ibid, iask = self.macarons_implied_bid_ask(obs)
+        planner = self.macarons_planner
 
-        # how far we’re willing to cross
-        aggressive_ask = round(obs.askPrice) - MACARONS_EDGE
-        edge = max(0.0, (aggressive_ask - iask) * MACARONS_PROB)
-
-        # BUY if sell‐orders under “ibid – edge”
-        for price, vol in sorted(order_depth.sell_orders.items()):
-            if price >= ibid - edge:
+        # BUY while each unit, converted away later, is worth more than the ask
+        for price, vol in book.asks:
+            qty = planner.buy_units(position + buy_vol, price, min(abs(vol), MACARONS_LIMIT - position - buy_vol))
+            if qty <= 0:
                 break
-            qty = min(abs(vol), MACARONS_LIMIT - position - buy_vol)
-            if qty > 0:
-                orders.append(Order(MACARONS, int(round(price)), qty))
-                buy_vol += qty
+            orders.append(Order(MACARONS, int(round(price)), qty))
+            buy_vol += qty
 
-        # SELL if buy‐orders above “iask + edge”
-        for price, vol in sorted(order_depth.buy_orders.items(), reverse=True):
-            if price <= iask + edge:
+        # SELL while the bid beats what each unit is worth to hold or convert
+        for price, vol in book.bids:
+            qty = planner.sell_units(position - sell_vol, price, min(vol, MACARONS_LIMIT + position - sell_vol))
+            if qty <= 0:
                 break
-            qty = min(vol, MACARONS_LIMIT + position - sell_vol)
-            if qty > 0:
-                orders.append(Order(MACARONS, int(round(price)), -qty))
-                sell_vol += qty
+            orders.append(Order(MACARONS, int(round(price)), -qty))
+            sell_vol += qty
 
         return orders, buy_vol, sell_vol
 
@@ -638,189 +1975,301 @@ class Trader:
     ) -> (List[Order], int, int):
         orders = []
         ibid, iask = self.macarons_implied_bid_ask(obs)
+        planner = self.macarons_planner
 
         # more aggressive than implied, but don’t chase too far
         aggr_bid = round(obs.bidPrice) + MACARONS_EDGE
         aggr_ask = round(obs.askPrice) - MACARONS_EDGE
-        bid_px = aggr_bid if aggr_bid < ibid else ibid - 1
-        ask_px = aggr_ask if aggr_ask > iask else iask + 1
+        bid_px = int(round(aggr_bid if aggr_bid < ibid else ibid - 1))
+        ask_px = int(round(aggr_ask if aggr_ask > iask else iask + 1))
 
-        # post buys up to limit
-        buy_qty = MACARONS_LIMIT - (position + buy_vol)
+        # post buys for as many units as can still be unwound at a profit
+        buy_qty = planner.buy_units(position + buy_vol, bid_px, MACARONS_LIMIT - (position + buy_vol))
         if buy_qty > 0:
-            orders.append(Order(MACARONS, int(round(bid_px)), buy_qty))
+            orders.append(Order(MACARONS, bid_px, buy_qty))
 
-        # post sells up to limit
-        sell_qty = MACARONS_LIMIT + (position - sell_vol)
+        # post sells likewise
+        sell_qty = planner.sell_units(position - sell_vol, ask_px, MACARONS_LIMIT + (position - sell_vol))
         if sell_qty > 0:
-            orders.append(Order(MACARONS, int(round(ask_px)), -sell_qty))
+            orders.append(Order(MACARONS, ask_px, -sell_qty))
 
         return orders, buy_vol, sell_vol
 
 
+    def macarons_orders(self, symbol: str, book: BookView, position: int, position_limit: int,
+                        fallback=None) -> List[Order]:
+        # 1) re-plan, and clear out inventory via conversion; run() returns the request
+        obs = self.macarons_track(symbol, book, position, position_limit)
+        if obs is None:
+            return []
+        pos_after = position + self.conversions
+
+        # 2) “take” crossed quotes
+        take_orders, bv, sv = self.macarons_arb_take(book, obs, pos_after)
+
+        # 3) “make” passive quotes
+        make_orders, _, _ = self.macarons_arb_make(obs, pos_after, bv, sv)
+        return take_orders + make_orders
+
     def macarons_arb_clear(self, position: int) -> int:
-        if position > 0:
-            return -min(position, MACARONS_CONV_LIMIT)
-        if position < 0:
-            return -max(position, -MACARONS_CONV_LIMIT)
-        return 0
+        return self.macarons_planner.conversion(position)
+
+    def macarons_observation_state(self, symbol: str, book: BookView, position: int, position_limit: int,
+                                   fallback=None) -> Tuple:
+        """What the plan after this tick's track depends on: the observation and the exit prices still in the window."""
+        obs = self.observations.conversionObservations.get(symbol) if self.observations else None
+        if obs is None:
+            return None
+        kept = tuple(tuple(history.tolist()[len(history) == history.capacity:])
+                     for history in (self.macarons_exit_long, self.macarons_exit_short))
+        return obs.bidPrice, obs.askPrice, obs.transportFees, obs.exportTariff, obs.importTariff, kept
+
+    def macarons_track(self, symbol: str, book: BookView, position: int, position_limit: int,
+                       fallback=None) -> ConversionObservation:
+        """
+        Record this tick's exit prices, re-plan, and set the conversion request; returns the
+        observation, or None without one. Also replays macarons_orders' updates when its orders are reused.
+        """
+        obs = self.observations.conversionObservations.get(symbol) if self.observations else None
+        if obs is None:
+            return None
+        self.macarons_exit_long.append(obs.bidPrice - obs.exportTariff - obs.transportFees)
+        self.macarons_exit_short.append(obs.askPrice + obs.importTariff + obs.transportFees)
+        self.macarons_planner.update(self.macarons_exit_long, self.macarons_exit_short)
+        self.conversions = self.macarons_arb_clear(position)
+        return obs
+
+    # HELPER: INPUT REUSE
+    def reuse_key(self, symbol: str, book: BookView, position: int, entry: Tuple, hooks: Tuple) -> Tuple:
+        """What a registry strategy's orders depend on: its book, its position and its state hook's value."""
+        strategy, limit, fallback, params = entry
+        state_hook = hooks[0]
+        state = state_hook(symbol, book, position, limit, fallback, **params) if state_hook else None
+        return book.key, position, state
+
+    def reused_orders(self, symbol: str, book: BookView, position: int, entry: Tuple, hooks: Tuple,
+                      key: Tuple) -> List[Order]:
+        """
+        A registry strategy's orders from the previous tick if its reuse_key is unchanged, or
+        None. On reuse the track hook replays the history updates the strategy would have made.
+        """
+        orders = self.reuse.get(symbol, key)
+        if orders is None:
+            return None
+        strategy, limit, fallback, params = entry
+        track = hooks[1]
+        if track:
+            track(symbol, book, position, limit, fallback, **params)
+        return list(orders)
+
+    def block_key(self, symbols, books: Dict[str, BookView], positions: Dict[str, int],
+                  pending: Dict[str, List[Order]]) -> Tuple:
+        """Inputs of a cross-product block: the books and positions of `symbols` and the orders already pending on them."""
+        return tuple((books[s].key, positions.get(s, 0), tuple((o.price, o.quantity) for o in pending.get(s, ())))
+                     for s in symbols)
+
+    # HELPER: TRADER DATA ROUND-TRIP
+    def restore_state(self, trader_data: str) -> None:
+        """
+        Rebuild the rolling histories from the previous tick's traderData, so a
+        restarted process or a fresh Trader per tick keeps its windows. When the
+        blob is the one this instance produced last tick, memory already matches it.
+        """
+        if trader_data == self.trader_data:
+            return
+        series = decode_trader_data(trader_data)
+        self.kelp_prices = History(self.kelp_prices.capacity, series.get("kelp_prices", ()))
+        self.kelp_vwap = History(self.kelp_vwap.capacity, series.get("kelp_vwap", ()))
+        self.kelp_volume = History(self.kelp_volume.capacity, series.get("kelp_volume", ()))
+        self.squidink_prices = History(self.squidink_prices.capacity, series.get("squidink_prices", ()))
+        self.flipper_second_bids = History(self.flipper_second_bids.capacity,
+                                           series.get("flipper_second_bids", ()))
+        self.macarons_exit_long = History(MACARONS_TREND_WINDOW, series.get("macarons_exit_long", ()))
+        self.macarons_exit_short = History(MACARONS_TREND_WINDOW, series.get("macarons_exit_short", ()))
+        self.squidink_stats = RollingStats(self.squidink_stats.window.capacity)
+        recent = self.squidink_prices.tolist()[-self.squidink_stats.window.capacity:]
+        for x in recent:
+            self.squidink_stats.push(x)
+        basis = series.get("conversion_lp_basis", ())
+        if np is not None and (len(basis) or self.conversion_lp is not None):
+            if self.conversion_lp is None:
+                self.conversion_lp = ConversionLP()
+            valid = len(basis) == self.conversion_lp.m
+            self.conversion_lp.basis = [int(i) for i in basis] if valid else None
+            self.conversion_lp.at_upper = [int(i) for i in series.get("conversion_lp_upper", ())] if valid else ()
+        ivs = series.get("voucher_iv", ())
+        if len(ivs):
+            # Warm-start the next implied-vol solve where the last one ended.
+            if self.voucher_products is None:
+                self.refresh_voucher_chain()
+            if len(ivs) == len(self.voucher_products):
+                self.voucher_smile.ivs = list(ivs) if np is None else np.array(ivs, dtype=float)
+        self.trader_data = trader_data
 
     # 7) MAIN RUN (ENTRY POINT)
     def run(self, state: TradingState):
         try:
+            clock = self.latency.start() if self.latency else None
+            budget = self.budget.start(state.timestamp) if self.budget else None
+            self.restore_state(state.traderData)
             result = {}
 
-            resin_position_limit = 50
-            kelp_position_limit = 50
-            squidink_position_limit = 50
-
-            kelp_make_width = 3.5
-            kelp_take_width = 1
-            timespan = 10  # historical steps for KELP
-
-            # RAINFOREST_RESIN orders:
-            if "RAINFOREST_RESIN" in state.order_depths:
-                resin_position = state.position.get("RAINFOREST_RESIN", 0)
-                resin_orders = self.resin_orders(
-                    state.order_depths["RAINFOREST_RESIN"],
-                    fair_value=10000,  # fixed value
-                    width=2,
-                    position=resin_position,
-                    position_limit=resin_position_limit
-                )
-                result["RAINFOREST_RESIN"] = resin_orders
-
-            # KELP orders:
-            if "KELP" in state.order_depths:
-                kelp_position = state.position.get("KELP", 0)
-                kelp_orders = self.kelp_orders(
-                    state.order_depths["KELP"],
-                    timespan,
-                    kelp_make_width,
-                    kelp_take_width,
-                    kelp_position,
-                    kelp_position_limit
-                )
-                result["KELP"] = kelp_orders
-
-            # SQUID_INK orders:
-            if "SQUID_INK" in state.order_depths:
-                squidink_position = state.position.get("SQUID_INK", 0)
-                squidink_orders = self.squidink_utility_orders(
-                    state.order_depths["SQUID_INK"],
-                    position=squidink_position,
-                    position_limit=squidink_position_limit,
-                    fair_value_base=2000,
-                    candidate_range=2
-                )
-                result["SQUID_INK"] = squidink_orders
-
-            pos_limits = {
-                "CROISSANT": 250,
-                "JAM": 350,
-                "DJEMBE": 60,
-                "PICNIC_BASKET1": 60,
-                "PICNIC_BASKET2": 100,
-            }
-            if "CROISSANT" in state.order_depths:
-                pos = state.position.get("CROISSANT", 0)
-                result["CROISSANT"] = self.croissant_orders(state.order_depths["CROISSANT"], pos, pos_limits["CROISSANT"])
-            if "JAM" in state.order_depths:
-                pos = state.position.get("JAM", 0)
-                result["JAM"] = self.jam_orders(state.order_depths["JAM"], pos, pos_limits["JAM"])
-            if "DJEMBE" in state.order_depths:
-                pos = state.position.get("DJEMBE", 0)
-                result["DJEMBE"] = self.djembe_orders(state.order_depths["DJEMBE"], pos, pos_limits["DJEMBE"])
-            if all(p in state.order_depths for p in ["CROISSANT", "DJEMBE", "JAM", "PICNIC_BASKET1"]):
-                basket_position = state.position.get("PICNIC_BASKET1", 0)
-                result["PICNIC_BASKET1"] = self.basket1_orders(
-                    state.order_depths,
-                    basket_position,
-                    pos_limits["PICNIC_BASKET1"]
-                )
-            if all(p in state.order_depths for p in ["CROISSANT", "DJEMBE", "JAM", "PICNIC_BASKET2"]):
-                basket_position = state.position.get("PICNIC_BASKET2", 0)
-                result["PICNIC_BASKET2"] = self.basket2_orders(
-                    state.order_depths,
-                    basket_position,
-                    pos_limits["PICNIC_BASKET2"]
-                )
-
-            for voucher_product in self.volcanic_voucher_config.keys():
-                if voucher_product in state.order_depths:
-                    pos = state.position.get(voucher_product, 0)
-                    voucher_od = state.order_depths[voucher_product]
-                    voucher_orders = self.volcanic_voucher_orders(voucher_product, voucher_od, pos)
-                    if voucher_orders:
-                        result[voucher_product] = voucher_orders
-
-            prices = {}
-            for prod, fallback in [("CROISSANT", 4300), ("JAM", 6600), ("DJEMBE", 13400)]:
-                if prod in state.order_depths:
-                    prices[prod] = self.mid_price(state.order_depths[prod], fallback)
+            # One BookView per product per tick, shared by every strategy below.
+            books = {product: BookView(depth) for product, depth in state.order_depths.items()}
+            if clock:
+                clock.lap("setup")
+
+            # One pass over the symbols quoted this tick, highest priority first.
+            self.books = books
+            self.positions = state.position
+            self.observations = state.observations
+            self.voucher_prices = None
+            self.voucher_chain_shed = False
+            self.conversions = 0
+            take_products, priorities, requirements = self.take_products, self.priorities, self.requirements
+            batch = [symbol for symbol in books if symbol in take_products]
+            if len(batch) < TAKE_BATCH_MIN_SYMBOLS:
+                batch = []   # the kernel's fixed cost only pays off from the crossover on
+            for symbol in sorted(books, key=lambda s: priorities.get(s, PRIORITY_CORE)):
+                entry = self.strategies.get(symbol)
+                if entry is None or batch and symbol in take_products:
+                    continue
+                priority = priorities[symbol]
+                requires = requirements.get(symbol)
+                if requires and not requires():
+                    budget.drop(symbol)
+                    continue
+                book = books[symbol]
+                strategy, limit, fallback, params = entry
+                position = state.position.get(symbol, 0)
+                hooks = self.reusable.get(symbol) if self.reuse else None
+                key = self.reuse_key(symbol, book, position, entry, hooks) if hooks else None
+                orders = self.reused_orders(symbol, book, position, entry, hooks, key) if hooks else None
+                if orders is None:
+                    # Reused orders cost nothing; only a recomputation has to fit the budget.
+                    if budget and priority and not budget.admit(symbol, priority):
+                        continue
+                    orders = strategy(symbol, book, position, limit, fallback, **params)
+                    if budget and priority:
+                        budget.done()
+                    if hooks:
+                        self.reuse.put(symbol, key, orders)
+                        orders = list(orders)
+                if orders:
+                    result[symbol] = orders
+                if clock:
+                    clock.lap(symbol)
+            if batch and requirements:
+                kept = []
+                for symbol in batch:
+                    requires = requirements.get(symbol)
+                    if requires and not requires():
+                        budget.drop(symbol)
+                    else:
+                        kept.append(symbol)
+                batch = kept
+            if batch:
+                reuse = self.reuse
+                if reuse:
+                    prices = self.voucher_prices or {}
+                    key = (self.block_key(batch, books, state.position, {}), tuple(prices.get(s) for s in batch))
+                batch_orders = reuse.get("take_batch", key) if reuse else None
+                if batch_orders is None:
+                    # Reused orders cost nothing; past the budget a recomputation covers the core symbols only.
+                    timed, symbols = False, batch
+                    priority = max(priorities[symbol] for symbol in batch)
+                    if budget and priority:
+                        timed = budget.admit("take_batch", priority)
+                        if not timed:
+                            symbols = [symbol for symbol in batch if not priorities[symbol]]
+                    batch_orders = self.batch_take_orders(symbols, books, state.position) if symbols else {}
+                    if timed:
+                        budget.done()
+                    if reuse and symbols is batch:
+                        reuse.put("take_batch", key, batch_orders)
+                result.update({symbol: list(orders) for symbol, orders in batch_orders.items()})
+                if clock:
+                    clock.lap("take_batch")
+
+            pos_limits = self.position_limits
+            for name, symbols, block in (("basket1", ("CROISSANT", "DJEMBE", "JAM", "PICNIC_BASKET1"), self.basket1_orders),
+                                         ("basket2", ("CROISSANT", "DJEMBE", "JAM", "PICNIC_BASKET2"), self.basket2_orders)):
+                if not all(p in books for p in symbols):
+                    continue
+                key = self.block_key(symbols, books, state.position, result) if self.reuse else None
+                basket_orders = self.reuse.get(name, key) if self.reuse else None
+                if basket_orders is None:
+                    # Reused orders cost nothing; only a recomputation has to fit the budget.
+                    if budget and not budget.admit(name, PRIORITY_NORMAL):
+                        continue
+                    basket_orders = block(books, state.position, pos_limits, result)
+                    if budget:
+                        budget.done()
+                    if self.reuse:
+                        self.reuse.put(name, key, basket_orders)
+                for symbol, orders in basket_orders.items():
+                    result.setdefault(symbol, []).extend(orders)
+                if clock:
+                    clock.lap(name)
+
+            key = self.block_key([p for p in CONVERSION_PRODUCTS if p in books], books, state.position,
+                                 result) if self.reuse else None
+            conversion_orders = self.reuse.get("lp_arbitrage", key) if self.reuse else None
+            if conversion_orders is None:
+                if budget and not budget.admit("lp_arbitrage", PRIORITY_LOW):
+                    conversion_orders = []
                 else:
-                    prices[prod] = fallback
-            if "PICNIC_BASKET1" in state.order_depths:
-                prices["PICNIC_BASKET1"] = self.mid_price(
-                    state.order_depths["PICNIC_BASKET1"],
-                    6 * prices["CROISSANT"] + 3 * prices["JAM"] + prices["DJEMBE"]
-                )
-            else:
-                prices["PICNIC_BASKET1"] = 6 * prices["CROISSANT"] + 3 * prices["JAM"] + prices["DJEMBE"]
-            if "PICNIC_BASKET2" in state.order_depths:
-                prices["PICNIC_BASKET2"] = self.mid_price(
-                    state.order_depths["PICNIC_BASKET2"],
-                    4 * prices["CROISSANT"] + 2 * prices["JAM"]
-                )
-            else:
-                prices["PICNIC_BASKET2"] = 4 * prices["CROISSANT"] + 2 * prices["JAM"]
-
-            lp_decision, lp_profit = self.optimize_conversion_arbitrage(prices, pos_limits)
-            conversion_orders = self.decompose_lp_conversion_orders(state, prices, lp_decision)
+                    lp_decision, lp_profit = self.optimize_conversion_arbitrage(books, state.position, pos_limits,
+                                                                                result)
+                    conversion_orders = self.decompose_lp_conversion_orders(state, books, lp_decision, result)
+                    if budget:
+                        budget.done()
+                    if self.reuse:
+                        self.reuse.put("lp_arbitrage", key, conversion_orders)
             for order in conversion_orders:
                 symbol = order.symbol
                 if symbol in result:
                     result[symbol].append(order)
                 else:
                     result[symbol] = [order]
+            if clock:
+                clock.lap("lp_arbitrage")
 
-            if MACARONS in state.order_depths and MACARONS in state.observations.conversionObservations:
-                pos = state.position.get(MACARONS, 0)
+            # Build traderData (e.g., time series data). Never shed: it is cheap next to the
+            # state a restarted process would lose with a stale blob.
+            traderData = self.encode_histories()
+            if budget:
+                budget.stop()
+            if clock:
+                clock.lap("trader_data")
+                clock.stop()
 
-                # 1) clear out existing inventory via conversion
-                conv_qty = self.macarons_arb_clear(pos)
-                pos_after = pos + conv_qty
-
-                # 2) “take” crossed quotes
-                take_orders, bv, sv = self.macarons_arb_take(
-                    state.order_depths[MACARONS],
-                    state.observations.conversionObservations[MACARONS],
-                    pos_after
-                )
-
-                # 3) “make” passive quotes
-                make_orders, _, _ = self.macarons_arb_make(
-                    state.observations.conversionObservations[MACARONS],
-                    pos_after, bv, sv
-                )
-
-                # 4) publish orders & conversions
-                result[MACARONS] = take_orders + make_orders
-                conversions = conv_qty
-
-            # Build traderData (e.g., time series data)
-            traderData = jsonpickle.encode({
-                "kelp_prices": self.kelp_prices,
-                "kelp_vwap": self.kelp_vwap,
-                "squidink_prices": self.squidink_prices,
-                "flipper_second_bids": self.flipper_second_bids,
-            })
-
-            conversions = 1
+            conversions = self.conversions
 
             return result, conversions, traderData
 
         except Exception as e:
             raise Exception(e)
             print("Exception in trader.run:", e)
-            return {}, 0, ""
\ No newline at end of file
+            return {}, 0, ""
+
+    def encode_histories(self) -> str:
+        """This tick's traderData: the recorded time series, encoded."""
+        series = {
+            "kelp_prices": self.kelp_prices,
+            "kelp_vwap": self.kelp_vwap,
+            "kelp_volume": self.kelp_volume,
+            "squidink_prices": self.squidink_prices,
+            "flipper_second_bids": self.flipper_second_bids,
+            "macarons_exit_long": self.macarons_exit_long,
+            "macarons_exit_short": self.macarons_exit_short,
+        }
+        if self.conversion_lp is not None and self.conversion_lp.basis is not None:
+            series["conversion_lp_basis"] = self.conversion_lp.basis
+            series["conversion_lp_upper"] = self.conversion_lp.at_upper
+        if self.voucher_prices is not None:
+            # Snapshot of this tick's implied vols, read by the offline report.
+            series["voucher_iv"] = self.voucher_smile.ivs
+        traderData = encode_trader_data(series)
+        self.trader_data = traderData
+        return traderData
\ No newline at end of file
@@ -0,0 +1,23 @@
+"""
+Offline tooling for replaying historical exchange data through the Round N `Trader` classes.
+
+    from backtester import load_day, load_trader, run_backtest
+    trader = load_trader("Round 5.py")
+    result = run_backtest(trader, [load_day("data/prices_round_5_day_2.csv")])
+    print(result.summary())
+"""
+
+from backtester.data import Day, load_day
+from backtester.engine import POSITION_LIMITS, BacktestResult, run_backtest
+from backtester.loader import install_datamodel, load_module, load_trader
+
+__all__ = [
+    "Day",
+    "load_day",
+    "POSITION_LIMITS",
+    "BacktestResult",
+    "run_backtest",
+    "install_datamodel",
+    "load_module",
+    "load_trader",
+]
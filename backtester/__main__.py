@@ -0,0 +1,52 @@
+"""
+Command line entry point:
+
+    python -m backtester "Round 5.py" data/prices_round_5_day_*.csv
+"""
+
+import argparse
+
+from backtester.data import load_day
+from backtester.engine import run_backtest
+from backtester.loader import load_trader
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Replay historical prices through a Round file's Trader.")
+    parser.add_argument("round_file", help="path to a Round N.py file")
+    parser.add_argument("prices", nargs="+", help="prices_round_X_day_Y.csv files, one per day")
+    parser.add_argument("--verbose", action="store_true", help="let the trader print to stdout")
+    parser.add_argument("--passive", action="store_true",
+                        help="also fill resting orders against the market trades, behind the visible queue")
+    parser.add_argument("--latency", action="store_true",
+                        help="enable the Trader's per-strategy timing hooks and print them at the end")
+    parser.add_argument("--reuse-stats", action="store_true",
+                        help="print how often each strategy block reused the previous tick's orders")
+    parser.add_argument("--budget-ms", type=float, metavar="MS",
+                        help="time budget per run() call, past which the Trader sheds low-priority blocks")
+    parser.add_argument("--shed-stats", action="store_true",
+                        help="print how often each strategy block was shed to stay within the time budget")
+    args = parser.parse_args(argv)
+
+    params = {}
+    if args.latency:
+        params["latency"] = True
+    if args.budget_ms is not None:
+        params["budget_ms"] = args.budget_ms
+    trader = load_trader(args.round_file, **params)
+    days = [load_day(path) for path in args.prices]
+    result = run_backtest(trader, days, quiet=not args.verbose, passive=args.passive)
+    print(result.summary())
+    if args.latency:
+        print()
+        print(trader.latency.dump())
+    if args.reuse_stats:
+        print()
+        print(trader.reuse.dump() if getattr(trader, "reuse", None) else "this Trader does not reuse orders")
+    if args.shed_stats:
+        print()
+        print(trader.budget.dump() if getattr(trader, "budget", None) else "this Trader has no time budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Loading of the exchange's historical price, trade and observation logs.
+
+Each CSV is parsed exactly once into plain tuples grouped by timestamp, so
+the replay loop only has to copy small level tuples into fresh `OrderDepth`
+dicts instead of re-reading text on every tick.
+"""
+
+import csv
+import os
+from typing import Dict, List, Optional, Tuple
+
+# (price, volume) pairs, best level first. Ask volumes are stored negative,
+# exactly as they appear in `OrderDepth.sell_orders`.
+Levels = Tuple[Tuple[int, int], ...]
+# (product, bid levels, ask levels, mid price)
+BookRow = Tuple[str, Levels, Levels, float]
+# (symbol, price, quantity, buyer, seller)
+TradeRow = Tuple[str, int, int, str, str]
+# (bidPrice, askPrice, transportFees, exportTariff, importTariff, sugarPrice, sunlightIndex)
+ObservationRow = Tuple[float, float, float, float, float, float, float]
+
+OBSERVATION_FIELDS = ("bidPrice", "askPrice", "transportFees", "exportTariff",
+                      "importTariff", "sugarPrice", "sunlightIndex")
+CONVERSION_PRODUCT = "MAGNIFICENT_MACARONS"
+MAX_LEVELS = 3
+
+
+class Day:
+    """One day of market data, pre-parsed into per-timestamp rows."""
+
+    def __init__(self, day: int, timestamps: List[int], books: List[List[BookRow]],
+                 trades: Dict[int, List[TradeRow]],
+                 observations: Dict[int, Dict[str, ObservationRow]]):
+        self.day = day
+        self.timestamps = timestamps
+        self.books = books
+        self.trades = trades
+        self.observations = observations
+
+    @property
+    def products(self) -> List[str]:
+        seen = {}
+        for rows in self.books:
+            for row in rows:
+                seen[row[0]] = True
+        return list(seen)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def ticks(self):
+        """Yield (timestamp, book rows, market trade rows, observations) in time order."""
+        trades, observations = self.trades, self.observations
+        for timestamp, rows in zip(self.timestamps, self.books):
+            yield timestamp, rows, trades.get(timestamp, ()), observations.get(timestamp, {})
+
+
+def _open_rows(path: str):
+    with open(path, newline="") as handle:
+        header = handle.readline()
+        delimiter = ";" if header.count(";") > header.count(",") else ","
+        fields = [name.strip() for name in header.strip().split(delimiter)]
+        for row in csv.reader(handle, delimiter=delimiter):
+            if row:
+                yield fields, row
+
+
+def _number(text: str):
+    if not text:
+        return None
+    value = float(text)
+    return int(value) if value.is_integer() else value
+
+
+def load_prices(path: str) -> Tuple[int, List[int], List[List[BookRow]]]:
+    """
+    Parse a `prices_round_X_day_Y.csv` file.
+    Returns the day number, the sorted timestamps and one list of book rows per timestamp.
+    """
+    day = 0
+    by_timestamp: Dict[int, List[BookRow]] = {}
+    index = None
+    for fields, row in _open_rows(path):
+        if index is None:
+            index = {name: i for i, name in enumerate(fields)}
+            bid_cols = [(index["bid_price_%d" % n], index["bid_volume_%d" % n]) for n in range(1, MAX_LEVELS + 1)]
+            ask_cols = [(index["ask_price_%d" % n], index["ask_volume_%d" % n]) for n in range(1, MAX_LEVELS + 1)]
+            i_day, i_ts, i_product, i_mid = index["day"], index["timestamp"], index["product"], index["mid_price"]
+
+        bids = []
+        for i_price, i_volume in bid_cols:
+            if row[i_price]:
+                bids.append((int(float(row[i_price])), int(float(row[i_volume]))))
+        asks = []
+        for i_price, i_volume in ask_cols:
+            if row[i_price]:
+                asks.append((int(float(row[i_price])), -abs(int(float(row[i_volume])))))
+
+        timestamp = int(row[i_ts])
+        day = int(row[i_day]) if row[i_day] else day
+        mid = float(row[i_mid]) if row[i_mid] else 0.0
+        by_timestamp.setdefault(timestamp, []).append((row[i_product], tuple(bids), tuple(asks), mid))
+
+    timestamps = sorted(by_timestamp)
+    return day, timestamps, [by_timestamp[ts] for ts in timestamps]
+
+
+def load_trades(path: str) -> Dict[int, List[TradeRow]]:
+    """Parse a `trades_round_X_day_Y.csv` file into market trades grouped by timestamp."""
+    trades: Dict[int, List[TradeRow]] = {}
+    index = None
+    for fields, row in _open_rows(path):
+        if index is None:
+            index = {name: i for i, name in enumerate(fields)}
+        symbol = row[index["symbol"]]
+        trades.setdefault(int(row[index["timestamp"]]), []).append((
+            symbol,
+            int(float(row[index["price"]])),
+            int(float(row[index["quantity"]])),
+            row[index["buyer"]],
+            row[index["seller"]],
+        ))
+    return trades
+
+
+def load_observations(path: str, product: str = CONVERSION_PRODUCT) -> Dict[int, Dict[str, ObservationRow]]:
+    """Parse an `observations_round_X_day_Y.csv` file into conversion observations by timestamp."""
+    observations: Dict[int, Dict[str, ObservationRow]] = {}
+    index = None
+    for fields, row in _open_rows(path):
+        if index is None:
+            index = {name: i for i, name in enumerate(fields)}
+        values = tuple(float(row[index[name]]) if name in index and row[index[name]] else 0.0
+                       for name in OBSERVATION_FIELDS)
+        observations[int(row[index["timestamp"]])] = {product: values}
+    return observations
+
+
+def _sibling(prices_path: str, kind: str) -> Optional[str]:
+    directory, name = os.path.split(prices_path)
+    if "prices" not in name:
+        return None
+    candidate = os.path.join(directory, name.replace("prices", kind, 1))
+    return candidate if os.path.exists(candidate) else None
+
+
+def load_day(prices_path: str, trades_path: Optional[str] = None,
+             observations_path: Optional[str] = None) -> Day:
+    """
+    Load one day of data. When the trade or observation paths are not given,
+    the files next to `prices_path` following the exchange naming scheme are used.
+    A `.ticks` directory written by `backtester.store` is memory-mapped instead.
+    """
+    if os.path.isdir(prices_path):
+        from backtester.store import open_day
+        return open_day(prices_path)
+    day, timestamps, books = load_prices(prices_path)
+    trades_path = trades_path or _sibling(prices_path, "trades")
+    observations_path = observations_path or _sibling(prices_path, "observations")
+    trades = load_trades(trades_path) if trades_path else {}
+    observations = load_observations(observations_path) if observations_path else {}
+    return Day(day, timestamps, books, trades, observations)
@@ -0,0 +1,233 @@
+"""
+Tick-replay backtest loop.
+
+For every tick of every day (a parsed `Day`, or any object with the same
+`ticks()` stream, such as a `SyntheticDay`) a `TradingState` is rebuilt from
+the book rows, `Trader.run` is called, and the returned orders are matched
+against that tick's book. With `passive=True` what is left of each order then
+rests in a price-time queue and can fill against the tick's market trades (see
+`backtester.matching`). Positions, cash and mark-to-market PnL are tracked per
+product.
+"""
+
+import contextlib
+import io
+import time
+from array import array
+from typing import Dict, List, Optional
+
+from backtester.data import Day
+from backtester.matching import match_with_queue
+from backtester.datamodel import (ConversionObservation, Listing, Observation, Order,
+                                  OrderDepth, Trade, TradingState)
+
+# The exchange's position limits. They model the exchange, not any one strategy: tests/test_engine.py
+# checks Round 5's PRODUCTS registry against them.
+POSITION_LIMITS = {
+    "RAINFOREST_RESIN": 50,
+    "KELP": 50,
+    "SQUID_INK": 50,
+    "CROISSANT": 250,
+    "JAM": 350,
+    "DJEMBE": 60,
+    "PICNIC_BASKET1": 60,
+    "PICNIC_BASKET2": 100,
+    "VOLCANIC_ROCK": 400,
+    "VOLCANIC_ROCK_VOUCHER_9500": 200,
+    "VOLCANIC_ROCK_VOUCHER_9750": 200,
+    "VOLCANIC_ROCK_VOUCHER_10000": 200,
+    "VOLCANIC_ROCK_VOUCHER_10250": 200,
+    "VOLCANIC_ROCK_VOUCHER_10500": 200,
+    "MAGNIFICENT_MACARONS": 75,
+}
+CONVERSION_LIMIT = 10
+STORAGE_COST = 0.1
+SUBMISSION = "SUBMISSION"
+
+
+class BacktestResult:
+    """Outcome of a replay: final positions, per-product PnL and the total PnL curve."""
+
+    def __init__(self):
+        self.positions: Dict[str, int] = {}
+        self.cash: Dict[str, float] = {}
+        self.pnl: Dict[str, float] = {}
+        self.timestamps = array("q")
+        self.pnl_history = array("d")
+        self.own_trades: List[Trade] = []
+        self.ticks = 0
+        self.elapsed = 0.0
+
+    @property
+    def total_pnl(self) -> float:
+        return sum(self.pnl.values())
+
+    def summary(self) -> str:
+        lines = ["%-30s %14s %8s" % ("product", "pnl", "pos")]
+        for product in sorted(self.pnl):
+            lines.append("%-30s %14.1f %8d" % (product, self.pnl[product], self.positions.get(product, 0)))
+        lines.append("%-30s %14.1f" % ("TOTAL", self.total_pnl))
+        lines.append("%d ticks in %.2fs (%.0f ticks/s)" % (
+            self.ticks, self.elapsed, self.ticks / self.elapsed if self.elapsed else 0.0))
+        return "\n".join(lines)
+
+
+def _limit_breached(orders: List[Order], position: int, limit: Optional[int]) -> bool:
+    """Exchange rule: if all buys (or all sells) filling would breach the limit, every order is cancelled."""
+    if limit is None:
+        return False
+    total_buy = sum(o.quantity for o in orders if o.quantity > 0)
+    total_sell = -sum(o.quantity for o in orders if o.quantity < 0)
+    return position + total_buy > limit or position - total_sell < -limit
+
+
+def match_orders(symbol: str, orders: List[Order], bids, asks, timestamp: int) -> List[Trade]:
+    """
+    Match `orders` against the book levels of one tick, best price first.
+    Fills happen at the resting price; consumed volume is not available to later orders.
+    """
+    bid_book = [list(level) for level in bids]
+    ask_book = [[price, -volume] for price, volume in asks]
+    fills: List[Trade] = []
+    for order in orders:
+        if order.quantity > 0:
+            remaining = order.quantity
+            for level in ask_book:
+                if remaining == 0 or level[0] > order.price:
+                    break
+                if level[1] <= 0:
+                    continue
+                qty = min(remaining, level[1])
+                level[1] -= qty
+                remaining -= qty
+                fills.append(Trade(symbol, level[0], qty, SUBMISSION, "", timestamp))
+        elif order.quantity < 0:
+            remaining = -order.quantity
+            for level in bid_book:
+                if remaining == 0 or level[0] < order.price:
+                    break
+                if level[1] <= 0:
+                    continue
+                qty = min(remaining, level[1])
+                level[1] -= qty
+                remaining -= qty
+                fills.append(Trade(symbol, level[0], qty, "", SUBMISSION, timestamp))
+    return fills
+
+
+def _convert(conversions: int, product: str, position: int, obs: ConversionObservation):
+    """Return (quantity converted, cash delta) for a conversion request, capped by position and limit."""
+    if conversions > 0 and position < 0:
+        qty = min(conversions, -position, CONVERSION_LIMIT)
+        return qty, -qty * (obs.askPrice + obs.transportFees + obs.importTariff)
+    if conversions < 0 and position > 0:
+        qty = min(-conversions, position, CONVERSION_LIMIT)
+        return -qty, qty * (obs.bidPrice - obs.transportFees - obs.exportTariff)
+    return 0, 0.0
+
+
+def run_backtest(trader, days: List[Day], position_limits: Optional[Dict[str, int]] = None,
+                 quiet: bool = True, passive: bool = False) -> BacktestResult:
+    """
+    Replay `days` through `trader.run` and return the resulting PnL.
+    Timestamps of later days are offset so the PnL curve stays monotonic in time.
+    `passive` also fills resting orders against the market trades tape.
+    """
+    limits = dict(POSITION_LIMITS)
+    if position_limits:
+        limits.update(position_limits)
+
+    result = BacktestResult()
+    position = result.positions
+    cash = result.cash
+    mids: Dict[str, float] = {}
+    listings: Dict[str, Listing] = {}
+    trader_data = ""
+    own_trades: Dict[str, List[Trade]] = {}
+    market_trades: Dict[str, List[Trade]] = {}
+    sink = io.StringIO()
+    started = time.perf_counter()
+
+    for day_index, day in enumerate(days):
+        offset = day_index * 1_000_000
+        for timestamp, rows, trade_rows, observation_rows in day.ticks():
+            order_depths = {}
+            books = {}
+            for product, bids, asks, mid in rows:
+                depth = OrderDepth()
+                depth.buy_orders = dict(bids)
+                depth.sell_orders = dict(asks)
+                order_depths[product] = depth
+                books[product] = (bids, asks)
+                if mid:
+                    mids[product] = mid
+                if product not in listings:
+                    listings[product] = Listing(product, product, "SEASHELLS")
+
+            conversion_obs = {}
+            for product, values in observation_rows.items():
+                conversion_obs[product] = ConversionObservation(*values)
+
+            state = TradingState(trader_data, timestamp, listings, order_depths, own_trades,
+                                 market_trades, dict(position), Observation({}, conversion_obs))
+
+            if quiet:
+                sink.seek(0)
+                sink.truncate()
+                with contextlib.redirect_stdout(sink):
+                    orders, conversions, trader_data = trader.run(state)
+            else:
+                orders, conversions, trader_data = trader.run(state)
+
+            own_trades = {}
+            tape: Dict[str, List] = {}
+            if passive:
+                for symbol, price, quantity, _, _ in trade_rows:
+                    tape.setdefault(symbol, []).append((price, quantity))
+            for symbol, symbol_orders in orders.items():
+                if not symbol_orders or symbol not in books:
+                    continue
+                held = position.get(symbol, 0)
+                if _limit_breached(symbol_orders, held, limits.get(symbol)):
+                    continue
+                if passive:
+                    fills = match_with_queue(symbol, symbol_orders, books[symbol][0], books[symbol][1],
+                                             tape.get(symbol, ()), timestamp, SUBMISSION)
+                else:
+                    fills = match_orders(symbol, symbol_orders, books[symbol][0], books[symbol][1], timestamp)
+                if not fills:
+                    continue
+                for fill in fills:
+                    signed = fill.quantity if fill.buyer == SUBMISSION else -fill.quantity
+                    held += signed
+                    cash[symbol] = cash.get(symbol, 0.0) - signed * fill.price
+                position[symbol] = held
+                own_trades[symbol] = fills
+                result.own_trades.extend(fills)
+
+            for product, obs in conversion_obs.items():
+                held = position.get(product, 0)
+                if conversions:
+                    qty, delta = _convert(conversions, product, held, obs)
+                    held += qty
+                    position[product] = held
+                    cash[product] = cash.get(product, 0.0) + delta
+                if held > 0:
+                    cash[product] = cash.get(product, 0.0) - held * STORAGE_COST
+
+            market_trades = {}
+            for symbol, price, quantity, buyer, seller in trade_rows:
+                market_trades.setdefault(symbol, []).append(
+                    Trade(symbol, price, quantity, buyer, seller, timestamp))
+
+            total = 0.0
+            for product, amount in cash.items():
+                total += amount + position.get(product, 0) * mids.get(product, 0.0)
+            result.timestamps.append(offset + timestamp)
+            result.pnl_history.append(total)
+            result.ticks += 1
+
+    for product, amount in cash.items():
+        result.pnl[product] = amount + position.get(product, 0) * mids.get(product, 0.0)
+    result.elapsed = time.perf_counter() - started
+    return result
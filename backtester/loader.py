@@ -0,0 +1,39 @@
+"""
+Importing the `Round N.py` files, whose names are not valid module names.
+"""
+
+import importlib.util
+import os
+import re
+import sys
+
+from backtester import datamodel
+
+
+def install_datamodel() -> None:
+    """Make `from datamodel import ...` resolve to the local stand-in unless a real one exists."""
+    if "datamodel" in sys.modules:
+        return
+    if importlib.util.find_spec("datamodel") is None:
+        sys.modules["datamodel"] = datamodel
+
+
+def module_name(path: str) -> str:
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return re.sub(r"\W+", "_", stem).strip("_").lower()
+
+
+def load_module(path: str):
+    """Import a Round file by path and return the module object."""
+    install_datamodel()
+    name = module_name(path)
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_trader(path: str, **params):
+    """Import a Round file and instantiate its `Trader` with the given keyword arguments."""
+    return load_module(path).Trader(**params)
@@ -0,0 +1,209 @@
+"""
+Price-time-priority order book with queue positions, for passive fills.
+
+The tick engine only fills orders that cross the recorded book, so quotes that
+rest at or inside the touch (RESIN at 9999/10001, KELP one tick inside,
+the macarons make leg) never trade. `OrderBook` keeps each side's price levels
+in a heap and a FIFO queue of orders per level. With `run_backtest(...,
+passive=True)` the tick's visible book is loaded as anonymous volume; every
+order takes liquidity exactly as before, and what is left of it joins the back of
+its level. The tick's market trades are then printed against the book:
+
+  - a print strictly through our price fills us at our price;
+  - a print at our price first eats the volume queued ahead of us;
+  - a print fills one side of the book, never both.
+
+Orders are cancelled at the end of the tick, as on the exchange.
+
+    python -m backtester "Round 5.py" data/prices_round_5_day_0.csv --passive
+
+`benchmarks.order_book` measures the book's throughput on its own.
+"""
+
+import heapq
+from collections import deque
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from backtester.datamodel import Order, Trade
+
+BID, ASK = 0, 1
+COMPACT_SLACK = 1024   # cancelled entries tolerated beyond the live order count before compacting
+
+# A resting order is a list, mutated in place: [remaining, order id, owner, side, price].
+# Fills are (order id, owner, price, signed quantity), signed from that order's side.
+Fill = Tuple[int, str, int, int]
+
+
+class OrderBook:
+    """
+    One symbol's resting orders. Prices live in a heap per side (bids negated) and map
+    to a FIFO deque of orders; a level empties lazily, when matching reaches it.
+    Cancels zero the order in place, so they are O(1) and never walk a queue; once
+    cancelled entries outnumber live orders the queues are compacted in one pass.
+    """
+
+    __slots__ = ("levels", "heaps", "orders", "fills", "next_id", "cancelled")
+
+    def __init__(self):
+        self.levels: Tuple[Dict[int, deque], Dict[int, deque]] = ({}, {})
+        self.heaps: Tuple[List[int], List[int]] = ([], [])
+        self.orders: Dict[int, list] = {}
+        self.fills: List[Fill] = []
+        self.next_id = 0
+        self.cancelled = 0
+
+    def best(self, side: int) -> Optional[int]:
+        """Best live price on `side`, or None if it is empty."""
+        levels, heap = self.levels[side], self.heaps[side]
+        while heap:
+            price = -heap[0] if side == BID else heap[0]
+            queue = levels.get(price)
+            while queue and not queue[0][0]:
+                queue.popleft()
+            if queue:
+                return price
+            levels.pop(price, None)
+            heapq.heappop(heap)
+        return None
+
+    def rest(self, price: int, quantity: int, owner: str = "") -> int:
+        """Queue an order at the back of its level without matching it; quantity > 0 buys. Returns its id."""
+        order_id = self.next_id
+        self.next_id = order_id + 1
+        if quantity > 0:
+            entry = [quantity, order_id, owner, BID, price]
+            levels, key = self.levels[BID], -price
+        else:
+            entry = [-quantity, order_id, owner, ASK, price]
+            levels, key = self.levels[ASK], price
+        queue = levels.get(price)
+        if queue is None:
+            queue = levels[price] = deque()
+            heapq.heappush(self.heaps[entry[3]], key)
+        queue.append(entry)
+        self.orders[order_id] = entry
+        return order_id
+
+    def take(self, price: int, quantity: int, owner: str = "") -> int:
+        """
+        Match an order against the opposite side, best price then time first, and return
+        the unfilled quantity (signed like `quantity`). Fills for both sides are appended
+        to `fills` at the resting price.
+        """
+        order_id = self.next_id
+        self.next_id += 1
+        if quantity > 0:
+            return self._sweep(ASK, price, quantity, (order_id, owner, 1))
+        return -self._sweep(BID, price, -quantity, (order_id, owner, -1))
+
+    def add(self, price: int, quantity: int, owner: str = "") -> Tuple[int, Optional[int]]:
+        """Limit order: take what crosses, rest the remainder. Returns (unfilled quantity, resting id or None)."""
+        remaining = self.take(price, quantity, owner)
+        return remaining, self.rest(price, remaining, owner) if remaining else None
+
+    def cancel(self, order_id: int) -> int:
+        """Cancel a resting order; returns the quantity it still had."""
+        entry = self.orders.pop(order_id, None)
+        if entry is None:
+            return 0
+        remaining, entry[0] = entry[0], 0
+        self.cancelled += 1
+        if self.cancelled > len(self.orders) + COMPACT_SLACK:
+            self._compact()
+        return remaining
+
+    def _compact(self) -> None:
+        for levels in self.levels:
+            for price in list(levels):
+                queue = deque(entry for entry in levels[price] if entry[0])
+                if queue:
+                    levels[price] = queue
+                else:
+                    del levels[price]   # its heap key is dropped when it reaches the top
+        self.cancelled = 0
+
+    def print_trade(self, price: int, quantity: int) -> None:
+        """
+        A trade printed on the market tape at `price` for `quantity`. It fills one side:
+        the bids at or above the price if there are any (a seller went that low), else
+        the asks at or below it, best first.
+        """
+        best_bid = self.best(BID)
+        if best_bid is not None and best_bid >= price:
+            self._sweep(BID, price, quantity)
+        elif self.heaps[ASK]:
+            self._sweep(ASK, price, quantity)
+
+    def queue_position(self, order_id: int) -> Optional[int]:
+        """Volume queued ahead of a resting order at its price, or None if it is no longer resting."""
+        entry = self.orders.get(order_id)
+        if entry is None:
+            return None
+        ahead = 0
+        for other in self.levels[entry[3]][entry[4]]:
+            if other is entry:
+                return ahead
+            ahead += other[0]
+        return None
+
+    def _sweep(self, side: int, limit: int, quantity: int, taker: Optional[Tuple[int, str, int]] = None) -> int:
+        """
+        Fill up to `quantity` from `side` at prices no worse than `limit`, recording each
+        resting fill and, for a `taker` (id, owner, sign), its mirror. Returns the quantity left over.
+        """
+        levels, heap, orders, fills = self.levels[side], self.heaps[side], self.orders, self.fills
+        # Heap keys are -price for bids and price for asks, so "worse than limit" is one comparison.
+        sign = 1 if side == BID else -1
+        worst = -sign * limit
+        while quantity and heap:
+            key = heap[0]
+            if key > worst:
+                break
+            price = -sign * key
+            queue = levels.get(price)
+            while quantity and queue:
+                entry = queue[0]
+                filled = entry[0] if entry[0] <= quantity else quantity
+                if filled:
+                    entry[0] -= filled
+                    quantity -= filled
+                    fills.append((entry[1], entry[2], price, sign * filled))
+                    if taker:
+                        fills.append((taker[0], taker[1], price, taker[2] * filled))
+                if not entry[0]:
+                    queue.popleft()
+                    orders.pop(entry[1], None)
+            if not queue:
+                levels.pop(price, None)
+                heapq.heappop(heap)
+        return quantity
+
+
+def match_with_queue(symbol: str, orders: List[Order], bids, asks, tape: Sequence[Tuple[int, int]],
+                     timestamp: int, owner: str) -> List[Trade]:
+    """
+    `engine.match_orders` plus passive fills. The book rows are loaded as anonymous
+    volume and each order first takes liquidity, best price first, exactly as there.
+    Only then do the remainders rest, at the back of their levels (so none of them
+    can trade with another), and the tick's (price, quantity) market prints run
+    against the book. Returns `owner`'s fills.
+    """
+    book = OrderBook()
+    for price, volume in bids:
+        book.rest(price, volume)
+    for price, volume in asks:
+        book.rest(price, volume)
+    resting = []
+    for order in orders:
+        if order.quantity:
+            left = book.take(order.price, order.quantity, owner)
+            if left:
+                resting.append((order.price, left))
+    if resting and tape:
+        for price, left in resting:
+            book.rest(price, left, owner)
+        for price, quantity in tape:
+            book.print_trade(price, quantity)
+    return [Trade(symbol, price, quantity, owner, "", timestamp) if quantity > 0 else
+            Trade(symbol, price, -quantity, "", owner, timestamp)
+            for _, who, price, quantity in book.fills if who == owner]
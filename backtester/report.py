@@ -0,0 +1,150 @@
+"""
+Offline charts of the time series a Trader persists in traderData.
+
+The Round files no longer plot anything while trading. Instead a backtest is
+replayed once, the traderData string returned on every tick is decoded, and
+all charts are rendered in one batch afterwards:
+
+    python -m backtester.report "Round 5.py" data/prices_round_5_day_*.csv --out report.png
+
+Rolling series (kelp prices and VWAP, squid ink prices) contribute their newest
+sample per tick; snapshot series (the voucher implied vols) are recorded whole.
+matplotlib is only imported when the charts are rendered.
+"""
+
+import argparse
+import json
+import math
+from typing import Dict, List, Optional, Sequence
+
+from backtester.data import load_day
+from backtester.engine import BacktestResult, run_backtest
+from backtester.loader import load_module
+
+ROLLING_SERIES = ("kelp_prices", "kelp_vwap", "squidink_prices")
+SNAPSHOT_SERIES = ("voucher_iv",)
+ZSCORE_WINDOW = 10   # matches the SQUID_INK RollingStats window in Round 5
+
+
+class SeriesRecorder:
+    """Wraps a Trader and decodes the traderData it returns on every tick."""
+
+    def __init__(self, trader, decode):
+        self.trader = trader
+        self.decode = decode
+        self.timestamps: List[int] = []
+        self.series: Dict[str, List] = {name: [] for name in ROLLING_SERIES + SNAPSHOT_SERIES}
+
+    def run(self, state):
+        orders, conversions, trader_data = self.trader.run(state)
+        decoded = self.decode(trader_data)
+        self.timestamps.append(state.timestamp)
+        for name in ROLLING_SERIES:
+            values = decoded.get(name)
+            self.series[name].append(_sample(values[-1]) if values else math.nan)
+        for name in SNAPSHOT_SERIES:
+            values = decoded.get(name)
+            self.series[name].append([float(v) for v in values] if values else None)
+        return orders, conversions, trader_data
+
+
+def _sample(value) -> float:
+    # Rounds 1-4 keep the KELP VWAP history as {"vol": ..., "vwap": ...} entries.
+    if isinstance(value, dict):
+        value = value.get("vwap", math.nan)
+    return float(value)
+
+
+def decoder_for(module):
+    """traderData decoder for a Round module: its own codec if it has one, else the JSON written by jsonpickle."""
+    decode = getattr(module, "decode_trader_data", None)
+    if decode is not None:
+        return decode
+
+    def decode_json(text: str) -> Dict[str, list]:
+        try:
+            data = json.loads(text) if text else {}
+        except ValueError:
+            return {}
+        return data if isinstance(data, dict) else {}
+    return decode_json
+
+
+def rolling_zscore(values: Sequence[float], window: int = ZSCORE_WINDOW) -> List[float]:
+    """Z-score of each sample against the trailing `window` samples including itself (population std)."""
+    scores = []
+    for i, value in enumerate(values):
+        recent = [v for v in values[max(0, i - window + 1):i + 1] if v == v]
+        if len(recent) < 2 or value != value:
+            scores.append(math.nan)
+            continue
+        mean = sum(recent) / len(recent)
+        std = math.sqrt(sum((v - mean) ** 2 for v in recent) / len(recent))
+        scores.append((value - mean) / std if std > 0 else 0.0)
+    return scores
+
+
+def collect(round_file: str, prices: Sequence[str]):
+    """Replay `prices` through the Round file and return (recorder, backtest result)."""
+    module = load_module(round_file)
+    recorder = SeriesRecorder(module.Trader(), decoder_for(module))
+    result = run_backtest(recorder, [load_day(path) for path in prices])
+    return recorder, result
+
+
+def render(recorder: SeriesRecorder, result: BacktestResult, out: str, strikes: Optional[Sequence] = None) -> None:
+    """Draw every chart into one figure and save it to `out`."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    series = recorder.series
+    ticks = list(range(len(recorder.timestamps)))
+    fig, axes = plt.subplots(4, 1, figsize=(12, 14), sharex=False)
+
+    axes[0].plot(list(result.pnl_history), linewidth=0.8)
+    axes[0].set_title("Total PnL")
+
+    axes[1].plot(ticks, series["kelp_prices"], label="fair value", linewidth=0.8)
+    axes[1].plot(ticks, series["kelp_vwap"], label="VWAP", linewidth=0.8)
+    axes[1].set_title("KELP")
+    axes[1].legend()
+
+    squid = series["squidink_prices"]
+    axes[2].plot(ticks, squid, label="fair value", linewidth=0.8)
+    axes[2].set_title("SQUID_INK")
+    zscore_axis = axes[2].twinx()
+    zscore_axis.plot(ticks, rolling_zscore(squid), color="tab:red", alpha=0.5, linewidth=0.6, label="z-score")
+    zscore_axis.set_ylabel("z-score")
+
+    snapshots = series["voucher_iv"]
+    width = max((len(s) for s in snapshots if s), default=0)
+    for k in range(width):
+        label = "K=%s" % strikes[k] if strikes is not None and k < len(strikes) else "strike %d" % k
+        axes[3].plot(ticks, [s[k] if s and k < len(s) else math.nan for s in snapshots],
+                     label=label, linewidth=0.8)
+    axes[3].set_title("Voucher implied volatility")
+    if width:
+        axes[3].legend()
+
+    fig.tight_layout()
+    fig.savefig(out, dpi=120)
+    plt.close(fig)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Render the series a Round file persists in traderData.")
+    parser.add_argument("round_file")
+    parser.add_argument("prices", nargs="+")
+    parser.add_argument("--out", default="report.png")
+    args = parser.parse_args(argv)
+
+    recorder, result = collect(args.round_file, args.prices)
+    strikes = getattr(recorder.trader, "voucher_strikes", None)
+    render(recorder, result, args.out, None if strikes is None else list(strikes))
+    print(result.summary())
+    print("charts written to %s" % args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+Columnar on-disk tick store, read back through memory maps.
+
+`ingest` parses a day of exchange logs once and writes one fixed-width `.npy`
+array per field into a `<name>.ticks` directory:
+
+    book_timestamp  int64   (rows,)             one row per product per timestamp
+    book_symbol     int16   (rows,)             index into meta.json "symbols"
+    bid_levels      int8    (rows,)             quoted levels per side; later slots are zero
+    bid_price       int32   (rows, MAX_LEVELS)
+    bid_volume      int32   (rows, MAX_LEVELS)
+    ask_levels      int8    (rows,)
+    ask_price       int32   (rows, MAX_LEVELS)
+    ask_volume      int32   (rows, MAX_LEVELS)  negative, as in OrderDepth.sell_orders
+    mid_price       float64 (rows,)
+    tick_start      int64   (ticks + 1,)        first book row of every timestamp
+    trade_*         timestamp, symbol, price, quantity, buyer, seller (ids into meta.json "traders")
+    observation_*   timestamp (n,) and values (n, 7) in OBSERVATION_FIELDS order
+
+`open_day` memory-maps every array read-only (`np.load(..., mmap_mode="r")`),
+so reopening a multi-day dataset costs a few `open` calls and only the pages a
+replay or an analysis actually touches are read into RAM. `StoredDay` exposes
+the arrays directly for analytics and the same `ticks()` stream as a parsed
+`Day` for the backtester; `load_day` accepts a `.ticks` directory directly.
+
+    python -m backtester.store data/prices_round_5_day_*.csv --out data/store
+    python -m backtester "Round 5.py" data/store/prices_round_5_day_*.ticks
+
+Needs NumPy.
+"""
+
+import argparse
+import json
+import os
+from typing import Dict, List
+
+import numpy as np
+
+from backtester.data import CONVERSION_PRODUCT, MAX_LEVELS, OBSERVATION_FIELDS, load_day
+
+SUFFIX = ".ticks"
+META = "meta.json"
+FORMAT_VERSION = 1
+BOOK_COLUMNS = ("book_timestamp", "book_symbol", "bid_levels", "bid_price", "bid_volume", "ask_levels",
+                "ask_price", "ask_volume", "mid_price", "tick_start")
+TRADE_COLUMNS = ("trade_timestamp", "trade_symbol", "trade_price", "trade_quantity", "trade_buyer",
+                 "trade_seller")
+OBSERVATION_COLUMNS = ("observation_timestamp", "observation_values")
+CHUNK_TICKS = 1000
+
+
+def _levels_array(rows, side: int):
+    counts = np.zeros(len(rows), dtype=np.int8)
+    prices = np.zeros((len(rows), MAX_LEVELS), dtype=np.int32)
+    volumes = np.zeros((len(rows), MAX_LEVELS), dtype=np.int32)
+    for i, row in enumerate(rows):
+        levels = row[side][:MAX_LEVELS]
+        counts[i] = len(levels)
+        for k, (price, volume) in enumerate(levels):
+            prices[i, k] = price
+            volumes[i, k] = volume
+    return counts, prices, volumes
+
+
+def ingest(prices_path: str, out_dir: str, trades_path: str = None, observations_path: str = None) -> str:
+    """Convert one day of CSV logs into a `.ticks` store under `out_dir`; returns the store path."""
+    parsed = load_day(prices_path, trades_path, observations_path)
+    timestamps, books, trades, observations = parsed.timestamps, parsed.books, parsed.trades, parsed.observations
+
+    symbols: Dict[str, int] = {}
+    traders: Dict[str, int] = {"": 0}
+    rows = [row for tick in books for row in tick]
+    trade_rows = [(ts,) + row for ts in sorted(trades) for row in trades[ts]]
+    for row in rows:
+        symbols.setdefault(row[0], len(symbols))
+    for row in trade_rows:
+        symbols.setdefault(row[1], len(symbols))
+        traders.setdefault(row[4], len(traders))
+        traders.setdefault(row[5], len(traders))
+
+    bid_levels, bid_price, bid_volume = _levels_array(rows, 1)
+    ask_levels, ask_price, ask_volume = _levels_array(rows, 2)
+    observed = sorted(observations)
+    columns = {
+        "book_timestamp": np.repeat(np.array(timestamps, dtype=np.int64), [len(tick) for tick in books]),
+        "book_symbol": np.array([symbols[row[0]] for row in rows], dtype=np.int16),
+        "bid_levels": bid_levels,
+        "bid_price": bid_price,
+        "bid_volume": bid_volume,
+        "ask_levels": ask_levels,
+        "ask_price": ask_price,
+        "ask_volume": ask_volume,
+        "mid_price": np.array([row[3] for row in rows], dtype=np.float64),
+        "tick_start": np.concatenate(([0], np.cumsum([len(tick) for tick in books]))).astype(np.int64),
+        "trade_timestamp": np.array([row[0] for row in trade_rows], dtype=np.int64),
+        "trade_symbol": np.array([symbols[row[1]] for row in trade_rows], dtype=np.int16),
+        "trade_price": np.array([row[2] for row in trade_rows], dtype=np.int32),
+        "trade_quantity": np.array([row[3] for row in trade_rows], dtype=np.int32),
+        "trade_buyer": np.array([traders[row[4]] for row in trade_rows], dtype=np.int16),
+        "trade_seller": np.array([traders[row[5]] for row in trade_rows], dtype=np.int16),
+        "observation_timestamp": np.array(observed, dtype=np.int64),
+        "observation_values": np.array([observations[ts][CONVERSION_PRODUCT] for ts in observed],
+                                       dtype=np.float64).reshape(len(observed), len(OBSERVATION_FIELDS)),
+    }
+
+    name = os.path.splitext(os.path.basename(prices_path))[0] + SUFFIX
+    path = os.path.join(out_dir, name)
+    os.makedirs(path, exist_ok=True)
+    for column, values in columns.items():
+        np.save(os.path.join(path, column + ".npy"), values)
+    with open(os.path.join(path, META), "w") as handle:
+        json.dump({"version": FORMAT_VERSION, "day": parsed.day, "symbols": list(symbols), "traders": list(traders),
+                   "max_levels": MAX_LEVELS}, handle)
+    return path
+
+
+class StoredDay:
+    """
+    A memory-mapped `.ticks` store. Column arrays are attributes (e.g. `day.mid_price`)
+    and are never copied; `ticks()` builds the per-tick rows the backtester expects.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, META)) as handle:
+            meta = json.load(handle)
+        if meta["version"] != FORMAT_VERSION:
+            raise ValueError("%s: unsupported tick store version %r" % (path, meta["version"]))
+        self.day = meta["day"]
+        self.symbols: List[str] = meta["symbols"]
+        self.traders: List[str] = meta["traders"]
+        for column in BOOK_COLUMNS + TRADE_COLUMNS + OBSERVATION_COLUMNS:
+            setattr(self, column, np.load(os.path.join(path, column + ".npy"), mmap_mode="r"))
+
+    def __reduce__(self):
+        # Pickle as the path: worker processes re-map the same files instead of copying the arrays.
+        return StoredDay, (self.path,)
+
+    @property
+    def timestamps(self):
+        return self.book_timestamp[self.tick_start[:-1]]
+
+    @property
+    def products(self) -> List[str]:
+        return [self.symbols[i] for i in sorted(set(self.book_symbol.tolist()))]
+
+    def __len__(self) -> int:
+        return len(self.tick_start) - 1
+
+    def rows(self, symbol: str):
+        """Indices of `symbol`'s book rows, for slicing any book column."""
+        return np.flatnonzero(self.book_symbol == self.symbols.index(symbol))
+
+    def ticks(self, chunk: int = CHUNK_TICKS):
+        """
+        Yield (timestamp, book rows, market trade rows, observations) in time order, like `Day.ticks()`.
+        Columns are converted `chunk` ticks at a time, so memory stays bounded on long days.
+        """
+        symbols, traders = self.symbols, self.traders
+        starts = self.tick_start
+        trade_ts, obs_ts = self.trade_timestamp, self.observation_timestamp
+        for first_tick in range(0, len(self), chunk):
+            last_tick = min(first_tick + chunk, len(self))
+            lo, hi = int(starts[first_tick]), int(starts[last_tick])
+            bounds = (starts[first_tick:last_tick + 1] - lo).tolist()
+            timestamps = self.book_timestamp[lo:hi][bounds[:-1]].tolist()
+            book = list(zip(
+                [symbols[i] for i in self.book_symbol[lo:hi].tolist()],
+                self.bid_levels[lo:hi].tolist(), self.bid_price[lo:hi].tolist(), self.bid_volume[lo:hi].tolist(),
+                self.ask_levels[lo:hi].tolist(), self.ask_price[lo:hi].tolist(), self.ask_volume[lo:hi].tolist(),
+                self.mid_price[lo:hi].tolist()))
+
+            trades: Dict[int, list] = {}
+            t_lo, t_hi = trade_ts.searchsorted(timestamps[0]), trade_ts.searchsorted(timestamps[-1], side="right")
+            for ts, symbol, price, quantity, buyer, seller in zip(
+                    trade_ts[t_lo:t_hi].tolist(), self.trade_symbol[t_lo:t_hi].tolist(),
+                    self.trade_price[t_lo:t_hi].tolist(), self.trade_quantity[t_lo:t_hi].tolist(),
+                    self.trade_buyer[t_lo:t_hi].tolist(), self.trade_seller[t_lo:t_hi].tolist()):
+                trades.setdefault(ts, []).append((symbols[symbol], price, quantity, traders[buyer], traders[seller]))
+
+            o_lo, o_hi = obs_ts.searchsorted(timestamps[0]), obs_ts.searchsorted(timestamps[-1], side="right")
+            observations = {ts: {CONVERSION_PRODUCT: tuple(values)} for ts, values in
+                            zip(obs_ts[o_lo:o_hi].tolist(), self.observation_values[o_lo:o_hi].tolist())}
+
+            for i, timestamp in enumerate(timestamps):
+                rows = [(symbol, tuple(zip(bp[:bn], bv[:bn])), tuple(zip(ap[:an], av[:an])), mid)
+                        for symbol, bn, bp, bv, an, ap, av, mid in book[bounds[i]:bounds[i + 1]]]
+                yield timestamp, rows, trades.get(timestamp, ()), observations.get(timestamp, {})
+
+
+def open_day(path: str) -> StoredDay:
+    return StoredDay(path)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Convert exchange CSV logs into memory-mapped tick stores.")
+    parser.add_argument("prices", nargs="+", help="prices_round_X_day_Y.csv files; trades/observations are found alongside")
+    parser.add_argument("--out", default=".", help="directory the .ticks stores are written into")
+    args = parser.parse_args(argv)
+    for prices in args.prices:
+        print(ingest(prices, args.out))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Parallel parameter sweep over the `Trader.__init__` knobs.
+
+The market data is parsed once in the parent process. On platforms that fork,
+workers inherit it read-only (the parent freezes the GC first so the parsed
+tuples are not copied on write); elsewhere each worker parses it once in its
+initializer. Every worker also imports the Round file once and then only
+builds a fresh `Trader` per configuration.
+
+    python -m backtester.sweep "Round 5.py" data/prices_round_5_day_*.csv \\
+        --grid risk_coefficient=0.01,0.05,0.1 --grid max_trade_volume=5,10,20
+"""
+
+import argparse
+import gc
+import itertools
+import multiprocessing
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from backtester.data import Day, load_day
+from backtester.engine import run_backtest
+from backtester.loader import load_module
+
+SWEEP_PARAMETERS = (
+    "execution_slippage",
+    "transaction_cost",
+    "risk_coefficient",
+    "max_trade_volume",
+    "reversion_coefficient",
+)
+
+# Per-process state, filled either before fork or by the pool initializer.
+_DAYS: List[Day] = []
+_ROUND_FILE: Optional[str] = None
+_MODULE = None
+
+
+def grid(**axes: Sequence) -> List[Dict]:
+    """Cartesian product of the given parameter values."""
+    names = list(axes)
+    return [dict(zip(names, values)) for values in itertools.product(*(axes[n] for n in names))]
+
+
+def random_sample(space: Dict[str, Sequence], n: int, seed: int = 0) -> List[Dict]:
+    """
+    Draw `n` configurations. A `(low, high)` tuple is sampled uniformly (as an int when
+    both bounds are ints); a list is sampled as a discrete choice.
+    """
+    rng = random.Random(seed)
+    configs = []
+    for _ in range(n):
+        config = {}
+        for name, values in space.items():
+            if isinstance(values, tuple) and len(values) == 2:
+                low, high = values
+                if isinstance(low, int) and isinstance(high, int):
+                    config[name] = rng.randint(low, high)
+                else:
+                    config[name] = rng.uniform(low, high)
+            else:
+                config[name] = rng.choice(list(values))
+        configs.append(config)
+    return configs
+
+
+def _init_worker(round_file: str, prices: Sequence[str]) -> None:
+    global _DAYS, _ROUND_FILE, _MODULE
+    if not _DAYS:
+        _DAYS = [load_day(path) for path in prices]
+    _ROUND_FILE = round_file
+    _MODULE = None
+
+
+def _evaluate(params: Dict) -> Tuple[Dict, float, Dict[str, float]]:
+    global _MODULE
+    if _MODULE is None:
+        _MODULE = load_module(_ROUND_FILE)
+    result = run_backtest(_MODULE.Trader(**params), _DAYS)
+    return params, result.total_pnl, dict(result.pnl)
+
+
+def sweep(round_file: str, prices: Sequence[str], configs: Sequence[Dict],
+          workers: Optional[int] = None) -> List[Tuple[Dict, float, Dict[str, float]]]:
+    """
+    Backtest every configuration across a process pool.
+    Returns `(params, total_pnl, pnl_by_product)` rows ranked best first.
+    """
+    global _DAYS
+    workers = workers or os.cpu_count() or 1
+    prices = list(prices)
+    methods = multiprocessing.get_all_start_methods()
+    if "fork" in methods:
+        _DAYS = [load_day(path) for path in prices]
+        gc.freeze()
+        context = multiprocessing.get_context("fork")
+    else:
+        context = multiprocessing.get_context()
+
+    chunksize = max(1, len(configs) // (workers * 4))
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                 initializer=_init_worker, initargs=(round_file, prices)) as pool:
+            rows = list(pool.map(_evaluate, configs, chunksize=chunksize))
+    finally:
+        if "fork" in methods:
+            gc.unfreeze()
+    rows.sort(key=lambda row: row[1], reverse=True)
+    return rows
+
+
+def format_table(rows, limit: int = 20) -> str:
+    if not rows:
+        return "no results"
+    names = list(rows[0][0])
+    header = "%4s  " % "rank" + "  ".join("%22s" % name for name in names) + "  %14s" % "total_pnl"
+    lines = [header]
+    for rank, (params, total, _) in enumerate(rows[:limit], 1):
+        cells = [("%22.6g" if isinstance(params[name], float) else "%22s") % params[name] for name in names]
+        lines.append("%4d  " % rank + "  ".join(cells) + "  %14.1f" % total)
+    return "\n".join(lines)
+
+
+def _parse_axis(text: str) -> Tuple[str, List]:
+    name, _, values = text.partition("=")
+    if name not in SWEEP_PARAMETERS:
+        raise argparse.ArgumentTypeError("unknown parameter %r, expected one of %s" % (name, ", ".join(SWEEP_PARAMETERS)))
+    parsed = []
+    for value in values.split(","):
+        number = float(value)
+        parsed.append(int(number) if name == "max_trade_volume" else number)
+    return name, parsed
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Sweep Trader.__init__ parameters across CPU cores.")
+    parser.add_argument("round_file")
+    parser.add_argument("prices", nargs="+")
+    parser.add_argument("--grid", action="append", type=_parse_axis, default=[],
+                        help="name=v1,v2,... ; with --samples the values bound a uniform range")
+    parser.add_argument("--samples", type=int, default=0, help="random configurations instead of the full grid")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    axes = dict(args.grid)
+    if args.samples:
+        space = {name: (min(values), max(values)) for name, values in axes.items()}
+        configs = random_sample(space, args.samples, args.seed)
+    else:
+        configs = grid(**axes)
+    rows = sweep(args.round_file, args.prices, configs, args.workers)
+    print(format_table(rows, args.top))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+"""
+Synthetic order-book streams for stress and throughput runs.
+
+`MarketSimulator` evolves a fair value per product and quotes a book around it
+on every tick, in the same row formats `backtester.data` parses from the
+exchange logs. `SyntheticDay` wraps it as a `ticks()` stream, so `run_backtest`
+can replay millions of ticks without materialising them:
+
+    python -m backtester.synthetic "Round 5.py" --ticks 1000000 --seed 7 --depth 3 --volatility 2
+
+Fair value models:
+  - RAINFOREST_RESIN is pinned at 10000;
+  - KELP, the basket components and VOLCANIC_ROCK follow random walks;
+  - SQUID_INK mean-reverts with occasional jumps;
+  - each basket tracks its recipe's synthetic value plus a mean-reverting premium;
+  - the vouchers are Black-Scholes calls on VOLCANIC_ROCK, priced off a smile;
+  - MAGNIFICENT_MACARONS follows a random walk, and its conversion observations
+    quote around that walk.
+
+A two-state regime (calm / stressed) scales every shock and widens spreads; it
+switches with probability `regime_switch` per tick.
+"""
+
+import argparse
+import math
+import random
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from backtester.data import CONVERSION_PRODUCT, MAX_LEVELS, BookRow, ObservationRow, TradeRow
+
+# Per product: (initial fair value, per-tick volatility, half spread in ticks).
+BASE_PRODUCTS = {
+    "RAINFOREST_RESIN": (10000.0, 0.0, 2),
+    "KELP": (2000.0, 0.5, 1),
+    "SQUID_INK": (2000.0, 1.5, 1),
+    "CROISSANT": (4300.0, 1.0, 1),
+    "JAM": (6600.0, 1.2, 1),
+    "DJEMBE": (13400.0, 2.0, 1),
+    "VOLCANIC_ROCK": (10200.0, 4.0, 1),
+    CONVERSION_PRODUCT: (650.0, 0.8, 3),
+}
+BASKETS = {
+    "PICNIC_BASKET1": ({"CROISSANT": 6, "JAM": 3, "DJEMBE": 1}, 50.0, 4),
+    "PICNIC_BASKET2": ({"CROISSANT": 4, "JAM": 2}, 30.0, 3),
+}
+VOUCHER_STRIKES = (9500, 9750, 10000, 10250, 10500)
+VOUCHER_PREFIX = "VOLCANIC_ROCK_VOUCHER_"
+TICK = 100
+SQUID_INK_MEAN = 2000.0
+
+
+def _call_price(spot: float, strike: float, years: float, sigma: float) -> float:
+    if years <= 0 or sigma <= 0:
+        return max(spot - strike, 0.0)
+    d1 = (math.log(spot / strike) + 0.5 * sigma * sigma * years) / (sigma * math.sqrt(years))
+    d2 = d1 - sigma * math.sqrt(years)
+    return spot * 0.5 * (1 + math.erf(d1 / math.sqrt(2))) - strike * 0.5 * (1 + math.erf(d2 / math.sqrt(2)))
+
+
+class MarketSimulator:
+    """
+    Seeded generator of per-tick books, market trades and conversion observations.
+    `depth` is the number of levels quoted per side, `volatility` scales every
+    fair-value shock, and `regime_scale` is the extra shock and spread multiplier
+    while the stressed regime is active.
+    """
+
+    def __init__(self, seed: int = 0, depth: int = 3, volatility: float = 1.0,
+                 regime_switch: float = 0.001, regime_scale: float = 3.0,
+                 trade_probability: float = 0.1, days_to_expiry: float = 7.0,
+                 products: Optional[Sequence[str]] = None):
+        self.rng = random.Random(seed)
+        self.depth = depth
+        self.volatility = volatility
+        self.regime_switch = regime_switch
+        self.regime_scale = regime_scale
+        self.trade_probability = trade_probability
+        self.years = days_to_expiry / 365.0
+        self.stressed = False
+
+        self.fair = {product: initial for product, (initial, _, _) in BASE_PRODUCTS.items()}
+        self.premium = {basket: premium for basket, (_, premium, _) in BASKETS.items()}
+        known = (list(BASE_PRODUCTS) + list(BASKETS) + [VOUCHER_PREFIX + str(k) for k in VOUCHER_STRIKES])
+        self.products = [p for p in known if products is None or p in products]
+
+    def _step(self) -> None:
+        rng = self.rng
+        if rng.random() < self.regime_switch:
+            self.stressed = not self.stressed
+        scale = self.volatility * (self.regime_scale if self.stressed else 1.0)
+        for product, (_, sigma, _) in BASE_PRODUCTS.items():
+            if not sigma:
+                continue
+            shock = rng.gauss(0.0, sigma * scale)
+            if product == "SQUID_INK":
+                shock += 0.02 * (SQUID_INK_MEAN - self.fair[product])
+                if rng.random() < 0.002 * scale:
+                    shock += rng.choice((-1, 1)) * 40 * scale
+            self.fair[product] = max(1.0, self.fair[product] + shock)
+        for basket, (_, premium, _) in BASKETS.items():
+            self.premium[basket] += 0.05 * (premium - self.premium[basket]) + rng.gauss(0.0, 2.0 * scale)
+
+    def _levels(self, fair: float, half_spread: int) -> Tuple[Tuple, Tuple]:
+        rng = self.rng
+        widen = 2 if self.stressed else 1
+        bid = math.floor(fair) - rng.randint(1, half_spread * widen)
+        ask = math.ceil(fair) + rng.randint(1, half_spread * widen)
+        if ask <= bid:
+            ask = bid + 1
+        bids = tuple((bid - i, rng.randint(1, 30)) for i in range(self.depth))
+        asks = tuple((ask + i, -rng.randint(1, 30)) for i in range(self.depth))
+        return bids, asks
+
+    def _fair_value(self, product: str) -> Tuple[float, int]:
+        if product in BASE_PRODUCTS:
+            return self.fair[product], BASE_PRODUCTS[product][2]
+        if product in BASKETS:
+            recipe, _, half_spread = BASKETS[product]
+            return sum(w * self.fair[c] for c, w in recipe.items()) + self.premium[product], half_spread
+        strike = int(product[len(VOUCHER_PREFIX):])
+        spot = self.fair["VOLCANIC_ROCK"]
+        moneyness = math.log(strike / spot) / math.sqrt(self.years)
+        sigma = 0.16 + 0.4 * moneyness * moneyness
+        return max(1.0, _call_price(spot, strike, self.years, sigma)), 1
+
+    def ticks(self, n: int, start: int = 0, step: int = TICK) -> Iterator[Tuple[int, List[BookRow], List[TradeRow],
+                                                                                 Dict[str, ObservationRow]]]:
+        """Yield `n` ticks as (timestamp, book rows, market trade rows, observations), one at a time."""
+        rng = self.rng
+        for i in range(n):
+            self._step()
+            timestamp = start + i * step
+            rows: List[BookRow] = []
+            trades: List[TradeRow] = []
+            for product in self.products:
+                fair, half_spread = self._fair_value(product)
+                bids, asks = self._levels(fair, half_spread)
+                rows.append((product, bids, asks, (bids[0][0] + asks[0][0]) / 2))
+                if rng.random() < self.trade_probability:
+                    price = bids[0][0] if rng.random() < 0.5 else asks[0][0]
+                    trades.append((product, price, rng.randint(1, 5), "", ""))
+            observations: Dict[str, ObservationRow] = {}
+            if CONVERSION_PRODUCT in self.products:
+                fair = self.fair[CONVERSION_PRODUCT]
+                observations[CONVERSION_PRODUCT] = (
+                    fair - 1.0, fair + 1.0, 1.0 + rng.random(), 9.0 + rng.random(), -3.0 + rng.random(),
+                    200.0 + rng.gauss(0.0, 5.0), 60.0 + rng.gauss(0.0, 3.0))
+            yield timestamp, rows, trades, observations
+
+
+class SyntheticDay:
+    """A `Day` stand-in whose ticks are generated on demand, so its length is not bounded by memory."""
+
+    def __init__(self, n_ticks: int, day: int = 0, **params):
+        self.day = day
+        self.n_ticks = n_ticks
+        self.params = params
+
+    @property
+    def products(self) -> List[str]:
+        return MarketSimulator(**self.params).products
+
+    def ticks(self):
+        # A fresh simulator per pass keeps repeated replays of the same day identical.
+        return MarketSimulator(**self.params).ticks(self.n_ticks)
+
+    def __len__(self) -> int:
+        return self.n_ticks
+
+
+def write_day(path_prefix: str, n_ticks: int, day: int = 0, round_number: int = 5, **params) -> None:
+    """
+    Write exchange-format prices/trades/observations CSVs (semicolon-separated, like the logs).
+    The exchange format has three book levels per side, so deeper synthetic books are cut to
+    MAX_LEVELS and read back exactly as written.
+    """
+    prices = open("%sprices_round_%d_day_%d.csv" % (path_prefix, round_number, day), "w")
+    trades = open("%strades_round_%d_day_%d.csv" % (path_prefix, round_number, day), "w")
+    observations = open("%sobservations_round_%d_day_%d.csv" % (path_prefix, round_number, day), "w")
+    with prices, trades, observations:
+        levels = MAX_LEVELS
+        prices.write("day;timestamp;product;" + ";".join(
+            "bid_price_%d;bid_volume_%d" % (n, n) for n in range(1, levels + 1)) + ";" + ";".join(
+            "ask_price_%d;ask_volume_%d" % (n, n) for n in range(1, levels + 1)) + ";mid_price;profit_and_loss\n")
+        trades.write("timestamp;buyer;seller;symbol;currency;price;quantity\n")
+        observations.write("timestamp,bidPrice,askPrice,transportFees,exportTariff,importTariff,"
+                           "sugarPrice,sunlightIndex\n")
+        for timestamp, rows, trade_rows, observation_rows in SyntheticDay(n_ticks, day, **params).ticks():
+            for product, bids, asks, mid in rows:
+                bid_cells = [c for price, volume in bids[:levels] for c in (price, volume)]
+                ask_cells = [c for price, volume in asks[:levels] for c in (price, -volume)]
+                bid_cells += [""] * (2 * levels - len(bid_cells))
+                ask_cells += [""] * (2 * levels - len(ask_cells))
+                prices.write("%d;%d;%s;%s;%s;%s;0\n" % (day, timestamp, product, ";".join(map(str, bid_cells)),
+                                                        ";".join(map(str, ask_cells)), mid))
+            for symbol, price, quantity, buyer, seller in trade_rows:
+                trades.write("%d;%s;%s;%s;SEASHELLS;%d;%d\n" % (timestamp, buyer, seller, symbol, price, quantity))
+            for values in observation_rows.values():
+                observations.write("%d,%s\n" % (timestamp, ",".join("%.4f" % v for v in values)))
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Replay a synthetic market through a Round file's Trader.")
+    parser.add_argument("round_file", nargs="?", help="Round file to run; omit with --write to only emit CSVs")
+    parser.add_argument("--ticks", type=int, default=100000)
+    parser.add_argument("--days", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--volatility", type=float, default=1.0)
+    parser.add_argument("--regime-switch", type=float, default=0.001)
+    parser.add_argument("--regime-scale", type=float, default=3.0)
+    parser.add_argument("--write", metavar="DIR", help="write exchange-format CSVs for each day into DIR")
+    args = parser.parse_args(argv)
+
+    params = dict(depth=args.depth, volatility=args.volatility, regime_switch=args.regime_switch,
+                  regime_scale=args.regime_scale)
+    days = [SyntheticDay(args.ticks, day, seed=args.seed + day, **params) for day in range(args.days)]
+    if args.write:
+        import os
+        os.makedirs(args.write, exist_ok=True)
+        for day in days:
+            write_day(os.path.join(args.write, ""), args.ticks, day.day, seed=args.seed + day.day, **params)
+    if args.round_file:
+        from backtester.engine import run_backtest
+        from backtester.loader import load_trader
+        print(run_backtest(load_trader(args.round_file), days).summary())
+
+
+if __name__ == "__main__":
+    main()
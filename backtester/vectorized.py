@@ -0,0 +1,369 @@
+"""
+Whole-day vectorized backtests for strategies whose orders depend only on the
+current book and the position (RAINFOREST_RESIN and KELP in Round 5).
+
+Everything that does not depend on the position (best levels, fair values, take
+signals, the clear-level volumes and the passive quote prices) is computed for
+the whole day at once as NumPy array operations over the book columns. A short
+plain-Python scan then carries the position forward tick by tick, sizes the
+orders exactly as the Trader does and matches them against that tick's book
+with the same rules as `backtester.engine`, so the PnL is identical to a
+tick-by-tick replay:
+
+    python -m backtester.vectorized "Round 5.py" data/prices_round_5_day_*.csv --compare
+
+Strategy parameters and limits are read from the Round file's `PRODUCTS`
+registry, so only Round files with one (Round 5 onwards) are supported. Needs NumPy.
+"""
+
+import argparse
+import math
+import time
+from typing import Callable, Dict, List, Sequence
+
+import numpy as np
+
+from backtester.data import MAX_LEVELS, load_day
+from backtester.engine import POSITION_LIMITS, BacktestResult, run_backtest
+from backtester.loader import load_module
+
+DAY_OFFSET = 1_000_000    # as in run_backtest
+
+
+class SymbolBook:
+    """
+    One symbol's book over a day as (ticks, MAX_LEVELS) arrays, best level first.
+    Volumes are positive on both sides; missing levels have `valid` False.
+    """
+
+    def __init__(self, timestamps, bid_price, bid_volume, bid_valid, ask_price, ask_volume, ask_valid, mid):
+        self.timestamps = timestamps
+        self.bid_price, self.bid_volume, self.bid_valid = bid_price, bid_volume, bid_valid
+        self.ask_price, self.ask_volume, self.ask_valid = ask_price, ask_volume, ask_valid
+        self.mid = mid
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @property
+    def has_bid(self):
+        return self.bid_valid[:, 0]
+
+    @property
+    def has_ask(self):
+        return self.ask_valid[:, 0]
+
+    def volume_at(self, side: str, price):
+        """Volume resting at `price` (one per tick) on `side`, 0 where there is none."""
+        prices, volumes, valid = ((self.bid_price, self.bid_volume, self.bid_valid) if side == "bid"
+                                  else (self.ask_price, self.ask_volume, self.ask_valid))
+        return np.where(valid & (prices == price[:, None]), volumes, 0).sum(axis=1)
+
+
+def symbol_book(day, symbol: str) -> SymbolBook:
+    """Extract `symbol`'s rows from a parsed `Day` or a memory-mapped `StoredDay`."""
+    if hasattr(day, "bid_levels"):
+        rows = day.rows(symbol)
+        levels = np.arange(MAX_LEVELS)
+        return SymbolBook(np.asarray(day.book_timestamp[rows]),
+                          np.asarray(day.bid_price[rows], dtype=np.int64),
+                          np.asarray(day.bid_volume[rows], dtype=np.int64),
+                          levels < np.asarray(day.bid_levels[rows])[:, None],
+                          np.asarray(day.ask_price[rows], dtype=np.int64),
+                          -np.asarray(day.ask_volume[rows], dtype=np.int64),
+                          levels < np.asarray(day.ask_levels[rows])[:, None],
+                          np.asarray(day.mid_price[rows], dtype=np.float64))
+
+    timestamps, mids, bids, asks, bid_depth, ask_depth = [], [], [], [], [], []
+    pad = ((0, 0),) * MAX_LEVELS
+    for timestamp, rows in zip(day.timestamps, day.books):
+        for product, bid_levels, ask_levels, mid in rows:
+            if product == symbol:
+                timestamps.append(timestamp)
+                mids.append(mid)
+                bid_depth.append(min(len(bid_levels), MAX_LEVELS))
+                ask_depth.append(min(len(ask_levels), MAX_LEVELS))
+                bids.append((bid_levels + pad)[:MAX_LEVELS])
+                asks.append((ask_levels + pad)[:MAX_LEVELS])
+                break
+    levels = np.arange(MAX_LEVELS)
+    bids = np.array(bids, dtype=np.int64).reshape(len(timestamps), MAX_LEVELS, 2)
+    asks = np.array(asks, dtype=np.int64).reshape(len(timestamps), MAX_LEVELS, 2)
+    bid_valid = levels < np.array(bid_depth, dtype=np.int64)[:, None]
+    ask_valid = levels < np.array(ask_depth, dtype=np.int64)[:, None]
+    return SymbolBook(np.array(timestamps, dtype=np.int64), bids[:, :, 0], bids[:, :, 1], bid_valid,
+                      asks[:, :, 0], -asks[:, :, 1], ask_valid, np.array(mids, dtype=np.float64))
+
+
+class Signals:
+    """
+    Position-independent per-tick inputs of the order sizing in the scan. Take and clear
+    capacities are 0 where the Trader would not send that order; `active` is False on
+    ticks where the strategy returns no orders at all.
+    """
+
+    def __init__(self, active, take_buy_price, take_buy_volume, take_sell_price, take_sell_volume,
+                 clear_buy_price, clear_buy_volume, clear_sell_price, clear_sell_volume,
+                 passive_buy_price, passive_sell_price):
+        self.active = active
+        self.take_buy_price, self.take_buy_volume = take_buy_price, take_buy_volume
+        self.take_sell_price, self.take_sell_volume = take_sell_price, take_sell_volume
+        self.clear_buy_price, self.clear_buy_volume = clear_buy_price, clear_buy_volume
+        self.clear_sell_price, self.clear_sell_volume = clear_sell_price, clear_sell_volume
+        self.passive_buy_price, self.passive_sell_price = passive_buy_price, passive_sell_price
+
+
+def _clear(book: SymbolBook, fair):
+    """clear_position_order inputs: buy back at floor(fair) from asks, sell at ceil(fair) into bids."""
+    fair_bid, fair_ask = np.floor(fair).astype(np.int64), np.ceil(fair).astype(np.int64)
+    return fair_bid, book.volume_at("ask", fair_bid), fair_ask, book.volume_at("bid", fair_ask)
+
+
+def resin_signals(book: SymbolBook, fair_value: float, width: int) -> Signals:
+    """`Trader.resin_orders`: take through a fixed fair value, clear at it, quote one tick either side."""
+    n = len(book)
+    fair = np.full(n, float(fair_value))
+    best_bid, best_ask = book.bid_price[:, 0], book.ask_price[:, 0]
+    take_buy = book.has_ask & (best_ask < fair)
+    take_sell = book.has_bid & (best_bid > fair)
+    return Signals(np.ones(n, dtype=bool),
+                   best_ask, np.where(take_buy, book.ask_volume[:, 0], 0),
+                   best_bid, np.where(take_sell, book.bid_volume[:, 0], 0),
+                   *_clear(book, fair),
+                   np.round(fair - 1).astype(np.int64), np.round(fair + 1).astype(np.int64))
+
+
+def kelp_signals(book: SymbolBook, fallback: float, timespan: int, width: float, take_width: float) -> Signals:
+    """`Trader.kelp_orders`: VWAP fair value, small-size takes, clear at fair, quote inside the first outside level."""
+    active = book.has_bid & book.has_ask
+    bid_volume = np.where(book.bid_valid, book.bid_volume, 0)
+    ask_volume = np.where(book.ask_valid, book.ask_volume, 0)
+    total_bid, total_ask = bid_volume.sum(axis=1), ask_volume.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vwap = ((book.ask_price * ask_volume).sum(axis=1) / total_ask +
+                (book.bid_price * bid_volume).sum(axis=1) / total_bid) / 2
+    fair = np.where(active & (total_bid > 0) & (total_ask > 0), vwap, fallback)
+
+    best_bid, best_ask = book.bid_price[:, 0], book.ask_price[:, 0]
+    take_buy = active & (best_ask <= fair - take_width) & (book.ask_volume[:, 0] <= 20)
+    take_sell = active & (best_bid >= fair + take_width) & (book.bid_volume[:, 0] <= 20)
+
+    # First level strictly outside fair +- 1, else fair +- 2; the quote goes one tick inside it.
+    outside_ask = book.ask_valid & (book.ask_price > (fair + 1)[:, None])
+    outside_bid = book.bid_valid & (book.bid_price < (fair - 1)[:, None])
+    ticks = np.arange(len(book))
+    passive_sell = np.where(outside_ask.any(axis=1), book.ask_price[ticks, outside_ask.argmax(axis=1)], fair + 2)
+    passive_buy = np.where(outside_bid.any(axis=1), book.bid_price[ticks, outside_bid.argmax(axis=1)], fair - 2)
+
+    return Signals(active,
+                   best_ask, np.where(take_buy, book.ask_volume[:, 0], 0),
+                   best_bid, np.where(take_sell, book.bid_volume[:, 0], 0),
+                   *_clear(book, fair),
+                   np.round(passive_buy + 1).astype(np.int64), np.round(passive_sell - 1).astype(np.int64))
+
+
+SIGNALS: Dict[str, Callable[..., Signals]] = {
+    "resin_orders": resin_signals,
+    "kelp_orders": kelp_signals,
+}
+
+
+def _fill(orders, levels, volumes, crosses) -> List:
+    """engine.match_orders for one side: each order walks the remaining levels, best first."""
+    fills = []
+    for price, quantity in orders:
+        for k, level in enumerate(levels):
+            if quantity == 0 or not crosses(level, price):
+                break
+            if volumes[k] <= 0:
+                continue
+            qty = quantity if quantity < volumes[k] else volumes[k]
+            volumes[k] -= qty
+            quantity -= qty
+            fills.append((level, qty))
+    return fills
+
+
+def _buy_crosses(level, price):
+    return level <= price
+
+
+def _sell_crosses(level, price):
+    return level >= price
+
+
+def _events(book: SymbolBook, signals: Signals):
+    """
+    Ticks on which some order could fill at any position: a take or clear level exists,
+    or a passive quote crosses the touch. On every other tick the position is unchanged.
+    """
+    passive_buy = book.has_ask & (signals.passive_buy_price >= book.ask_price[:, 0])
+    passive_sell = book.has_bid & (signals.passive_sell_price <= book.bid_price[:, 0])
+    return signals.active & ((signals.take_buy_volume > 0) | (signals.take_sell_volume > 0) |
+                             (signals.clear_buy_volume > 0) | (signals.clear_sell_volume > 0) |
+                             passive_buy | passive_sell)
+
+
+def scan(book: SymbolBook, signals: Signals, limit: int, engine_limit: int, position: int = 0):
+    """
+    Carry the position through the day. Returns per-tick (position, cash delta) arrays
+    after that tick's fills, starting from `position`. Only the ticks flagged by `_events`
+    are visited; the position is forward-filled across the rest.
+    """
+    n, start = len(book), position
+    ticks = np.flatnonzero(_events(book, signals))
+    columns = [a[ticks].tolist() for a in (
+        signals.take_buy_price, signals.take_buy_volume, signals.take_sell_price, signals.take_sell_volume,
+        signals.clear_buy_price, signals.clear_buy_volume, signals.clear_sell_price, signals.clear_sell_volume,
+        signals.passive_buy_price, signals.passive_sell_price,
+        book.bid_price, book.bid_volume, book.bid_valid.sum(axis=1),
+        book.ask_price, book.ask_volume, book.ask_valid.sum(axis=1))]
+
+    after = np.empty(len(ticks), dtype=np.int64)
+    deltas = np.zeros(len(ticks), dtype=np.float64)
+    for j, (tb_price, tb_volume, ts_price, ts_volume, cb_price, cb_volume, cs_price, cs_volume,
+            pb_price, ps_price, bid_prices, bid_volumes, bid_depth,
+            ask_prices, ask_volumes, ask_depth) in enumerate(zip(*columns)):
+        buys, sells = [], []
+        bought = sold = 0
+        quantity = min(tb_volume, limit - position)
+        if quantity > 0:
+            buys.append((tb_price, quantity))
+            bought += quantity
+        quantity = min(ts_volume, limit + position)
+        if quantity > 0:
+            sells.append((ts_price, quantity))
+            sold += quantity
+        net = position + bought - sold
+        if net > 0:
+            quantity = min(limit + (position - sold), min(cs_volume, net))
+            if quantity > 0:
+                sells.append((cs_price, quantity))
+                sold += quantity
+        elif net < 0:
+            quantity = min(limit - (position + bought), min(cb_volume, -net))
+            if quantity > 0:
+                buys.append((cb_price, quantity))
+                bought += quantity
+        quantity = limit - (position + bought)
+        if quantity > 0:
+            buys.append((pb_price, quantity))
+        quantity = limit + (position - sold)
+        if quantity > 0:
+            sells.append((ps_price, quantity))
+
+        total_buy = sum(q for _, q in buys)
+        total_sell = sum(q for _, q in sells)
+        if position + total_buy <= engine_limit and position - total_sell >= -engine_limit:
+            delta = 0.0
+            for price, qty in _fill(buys, ask_prices[:ask_depth], ask_volumes, _buy_crosses):
+                position += qty
+                delta -= price * qty
+            for price, qty in _fill(sells, bid_prices[:bid_depth], bid_volumes, _sell_crosses):
+                position -= qty
+                delta += price * qty
+            deltas[j] = delta
+        after[j] = position
+
+    # Forward-fill the position from the last event at or before every tick.
+    last = np.full(n, -1, dtype=np.int64)
+    last[ticks] = np.arange(len(ticks))
+    last = np.maximum.accumulate(last)
+    positions = np.full(n, start, dtype=np.int64)
+    if len(ticks):
+        positions = np.where(last >= 0, after[np.maximum(last, 0)], start)
+    cash = np.zeros(n, dtype=np.float64)
+    cash[ticks] = deltas
+    return positions, cash
+
+
+def run_vectorized(module, days: Sequence, symbols: Sequence[str] = ("RAINFOREST_RESIN", "KELP")) -> BacktestResult:
+    """Backtest `symbols` over `days` with the vectorized kernels; positions carry over between days."""
+    registry = getattr(module, "PRODUCTS", None)
+    if registry is None:
+        raise ValueError("vectorized backtests need a Round file with a PRODUCTS registry")
+    result = BacktestResult()
+    started = time.perf_counter()
+    curves = []
+    for symbol in symbols:
+        entry = registry[symbol]
+        kernel = SIGNALS.get(entry["strategy"])
+        if kernel is None:
+            raise ValueError("%s: no vectorized kernel for %s" % (symbol, entry["strategy"]))
+        position, cash, mid = 0, 0.0, 0.0
+        times, values = [], []
+        for day_index, day in enumerate(days):
+            book = symbol_book(day, symbol)
+            if not len(book):
+                continue
+            signals = kernel(book, entry["fallback"], **entry["params"])
+            positions, deltas = scan(book, signals, entry["limit"], POSITION_LIMITS.get(symbol, entry["limit"]),
+                                     position)
+            cash_curve = cash + np.cumsum(deltas)
+            # Mark to the last non-zero mid, as run_backtest does.
+            marks = np.where(book.mid != 0, book.mid, np.nan)
+            marks[0] = mid if np.isnan(marks[0]) else marks[0]
+            valid = ~np.isnan(marks)
+            marks = marks[np.maximum.accumulate(np.where(valid, np.arange(len(marks)), 0))]
+            times.append(day_index * DAY_OFFSET + book.timestamps)
+            values.append(cash_curve + positions * marks)
+            position, cash, mid = int(positions[-1]), float(cash_curve[-1]), float(marks[-1])
+        if times:
+            curves.append((np.concatenate(times), np.concatenate(values)))
+        result.positions[symbol] = position
+        result.cash[symbol] = cash
+        result.pnl[symbol] = cash + position * mid
+
+    if curves:
+        # Sum the per-symbol curves on the union of their timestamps, holding each symbol's last value.
+        timeline = np.unique(np.concatenate([ts for ts, _ in curves]))
+        total = np.zeros(len(timeline))
+        for ts, curve in curves:
+            index = np.searchsorted(ts, timeline, side="right") - 1
+            total += np.where(index >= 0, curve[np.maximum(index, 0)], 0.0)
+        result.timestamps.extend(timeline.tolist())
+        result.pnl_history.extend(total.tolist())
+    result.ticks = sum(len(day) for day in days)
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+class OnlySymbols:
+    """Wraps a Trader so a tick-by-tick replay only sends orders for `symbols` (for comparisons)."""
+
+    def __init__(self, trader, symbols: Sequence[str]):
+        self.trader = trader
+        self.symbols = set(symbols)
+
+    def run(self, state):
+        state.order_depths = {s: d for s, d in state.order_depths.items() if s in self.symbols}
+        orders, conversions, trader_data = self.trader.run(state)
+        return {s: o for s, o in orders.items() if s in self.symbols}, 0, trader_data
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Vectorized whole-day backtest of the position-only strategies.")
+    parser.add_argument("round_file")
+    parser.add_argument("prices", nargs="+", help="prices CSVs or .ticks stores, one per day")
+    parser.add_argument("--symbols", nargs="+", default=["RAINFOREST_RESIN", "KELP"])
+    parser.add_argument("--compare", action="store_true",
+                        help="also run the tick-by-tick backtest for the same symbols and report the speedup")
+    args = parser.parse_args(argv)
+
+    module = load_module(args.round_file)
+    days = [load_day(path) for path in args.prices]
+    result = run_vectorized(module, days, args.symbols)
+    print(result.summary())
+    if args.compare:
+        reference = run_backtest(OnlySymbols(module.Trader(), args.symbols), days)
+        print()
+        print("tick-by-tick:")
+        print(reference.summary())
+        worst = max(abs(result.pnl.get(s, 0.0) - reference.pnl.get(s, 0.0)) for s in args.symbols)
+        print()
+        print("speedup %.0fx, max per-symbol PnL difference %.6f" % (
+            reference.elapsed / result.elapsed if result.elapsed else math.inf, worst))
+
+
+if __name__ == "__main__":
+    main()
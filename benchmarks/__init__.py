@@ -0,0 +1,3 @@
+"""
+Micro-benchmarks for the Round files. Run each module with `python -m benchmarks.<name>`.
+"""
@@ -0,0 +1,78 @@
+"""
+Cold-start cost of each Round file: importing it and building its Trader in a
+fresh interpreter, the way the exchange harness loads a submission.
+
+    python -m benchmarks.import_time "Round 1.py" "Round 5.py" --repeat 5 --top 5
+
+Every run spawns `python -X importtime`, so the heaviest imports pulled in by
+the Round file itself (not by the backtester stand-ins) are listed as well.
+"""
+
+import argparse
+import glob
+import statistics
+import subprocess
+import sys
+from typing import List, Tuple
+
+BUDGET_MS = 50.0
+MARK = "--round-file--"
+
+_PROBE = """
+import sys, time
+from backtester.loader import install_datamodel, load_module
+install_datamodel()
+sys.stderr.write(%(mark)r + "\\n")
+started = time.perf_counter()
+load_module(%(path)r).Trader()
+print((time.perf_counter() - started) * 1e3)
+"""
+
+
+def _probe(path: str) -> Tuple[float, List[Tuple[int, str]]]:
+    """One fresh-interpreter cold start: (milliseconds, [(cumulative us, module)] imported by the Round file)."""
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", _PROBE % {"mark": MARK, "path": path}],
+                               capture_output=True, text=True, check=True)
+    imports = []
+    seen_mark = False
+    for line in completed.stderr.splitlines():
+        if line == MARK:
+            seen_mark = True
+        elif seen_mark and line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            if cumulative.strip().isdigit():
+                imports.append((int(cumulative), name.rstrip()))
+    return float(completed.stdout.strip().splitlines()[-1]), imports
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("round_files", nargs="*")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=5, help="heaviest top-level imports to list per file")
+    args = parser.parse_args(argv)
+
+    paths = args.round_files or sorted(glob.glob("Round *.py"))
+    print("%-12s %10s %10s %8s" % ("file", "best ms", "median ms", "budget"))
+    details = []
+    for path in paths:
+        runs = [_probe(path) for _ in range(args.repeat)]
+        times = [ms for ms, _ in runs]
+        best = min(times)
+        print("%-12s %10.1f %10.1f %8s" % (path, best, statistics.median(times),
+                                          "ok" if best <= BUDGET_MS else "over"))
+        # Top-level imports are the unindented names; their cumulative time includes their children.
+        heaviest = sorted((item for item in runs[times.index(best)][1] if not item[1].startswith("  ")),
+                          reverse=True)[:args.top]
+        details.append((path, heaviest))
+
+    for path, heaviest in details:
+        if heaviest:
+            print()
+            print("%s, heaviest imports:" % path)
+            for cumulative, name in heaviest:
+                print("  %10.1f ms  %s" % (cumulative / 1e3, name.strip()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Throughput of `backtester.matching.OrderBook` on a random event stream.
+
+    python -m benchmarks.order_book --events 1000000
+
+Adds are roughly balanced by cancels and fills (takes and tape prints), so the
+book stays bounded instead of growing with the stream.
+"""
+
+import argparse
+import random
+import time
+
+from backtester.matching import OrderBook
+
+
+def bench(events: int, seed: int = 0, levels: int = 10) -> float:
+    """Replay a random add / cancel / take / print stream through one book; returns events per second."""
+    rng = random.Random(seed)
+    book = OrderBook()
+    stream = []
+    mid = 10000
+    for _ in range(events):
+        r = rng.random()
+        if r < 0.42:
+            buy = rng.random() < 0.5
+            price = mid - rng.randint(1, levels) if buy else mid + rng.randint(1, levels)
+            stream.append((0, price, rng.randint(1, 20) * (1 if buy else -1)))
+        elif r < 0.85:
+            stream.append((1, rng.random(), 0))
+        elif r < 0.95:
+            buy = rng.random() < 0.5
+            stream.append((2, mid + levels if buy else mid - levels, rng.randint(1, 20) * (1 if buy else -1)))
+        else:
+            stream.append((3, mid + rng.randint(-levels, levels), rng.randint(1, 20)))
+
+    resting = []
+    add_id, pop_id = resting.append, resting.pop
+    rest, take, cancel, print_trade, fills = book.rest, book.take, book.cancel, book.print_trade, book.fills
+    started = time.perf_counter()
+    for kind, price, quantity in stream:
+        if kind == 0:
+            add_id(rest(price, quantity))
+        elif kind == 1:
+            if resting:
+                # Cancel a random resting order: swap it to the end and pop.
+                k = int(price * len(resting))
+                resting[k], resting[-1] = resting[-1], resting[k]
+                cancel(pop_id())
+        else:
+            if kind == 2:
+                take(price, quantity)
+            else:
+                print_trade(price, quantity)
+            if len(fills) > 4096:
+                fills.clear()
+    return events / (time.perf_counter() - started)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Order-book throughput on a random event stream.")
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--levels", type=int, default=10, help="price levels per side the stream quotes on")
+    args = parser.parse_args(argv)
+    print("%.0f events/s" % bench(args.events, args.seed, args.levels))
+
+
+if __name__ == "__main__":
+    main()
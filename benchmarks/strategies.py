@@ -0,0 +1,320 @@
+"""
+Per-call latency of every Trader strategy method, and full-tick `run()` throughput.
+
+    python -m benchmarks.strategies "Round 1.py" "Round 5.py" --depths 1 3 5 --json strategies.json
+    python -m benchmarks.strategies "Round 5.py" --baseline strategies.json --tolerance 0.2
+
+The Trader is first warmed up on a synthetic market (see `backtester.synthetic`)
+so its histories are populated; every method is then timed on the final tick's
+books, positions and conversion observation at each requested book depth. The
+same seed gives the same books for every Round file, so their numbers compare.
+Round 5's reuse cache is switched off for the method timings, which would
+otherwise time a cache hit; the full-tick `run()` numbers keep it on. Round 5
+prices the voucher chain once per tick for the hedge and every voucher to share,
+so the chain is timed once, as `voucher_chain`, and the voucher and hedge cases
+time only their own work on top of the tick's prices.
+Methods a Round file does not have are skipped. `--baseline` re-reads an
+earlier JSON report and exits non-zero if any timing regressed past the tolerance.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import timeit
+from typing import Callable, Dict, Optional
+
+from backtester.datamodel import ConversionObservation, OrderDepth
+from backtester.engine import POSITION_LIMITS, run_backtest
+from backtester.loader import load_module
+from backtester.synthetic import SyntheticDay
+
+WARMUP_TICKS = 200
+RUN_TICKS = 1000
+TARGET_SECONDS = 0.05   # per timing repeat
+
+
+class _TickTimer:
+    """Wraps a Trader, timing each `run()` and keeping the last state it saw."""
+
+    def __init__(self, trader):
+        self.trader = trader
+        self.state = None
+        self.ns = []
+
+    def run(self, state):
+        started = time.perf_counter_ns()
+        output = self.trader.run(state)
+        self.ns.append(time.perf_counter_ns() - started)
+        self.state = state
+        return output
+
+
+class Tick:
+    """The fixed inputs every method is timed on."""
+
+    def __init__(self, module, trader, state):
+        self.state = state
+        self.order_depths: Dict[str, OrderDepth] = state.order_depths
+        self.positions: Dict[str, int] = dict(state.position)
+        self.observation: Optional[ConversionObservation] = state.observations.conversionObservations.get(
+            "MAGNIFICENT_MACARONS")
+        self.round5 = hasattr(module, "BookView")
+        self.books = {p: module.BookView(d) for p, d in self.order_depths.items()} if self.round5 else None
+
+    def depth(self, symbol: str):
+        return self.books[symbol] if self.round5 else self.order_depths[symbol]
+
+    def position(self, symbol: str) -> int:
+        return self.positions.get(symbol, 0)
+
+
+def _registry_case(symbol: str):
+    """Round 5 dispatches through its product registry; earlier Rounds call each method with its own signature."""
+    def case(trader, tick: Tick) -> Optional[Callable]:
+        if tick.round5:
+            entry = trader.strategies.get(symbol)
+            if entry is None:
+                return None
+            strategy, limit, fallback, params = entry
+            book, position = tick.books[symbol], tick.position(symbol)
+
+            return lambda: strategy(symbol, book, position, limit, fallback, **params)
+        return _legacy_case(symbol, trader, tick)
+    return case
+
+
+def _legacy_case(symbol: str, trader, tick: Tick) -> Optional[Callable]:
+    depth, position, limit = tick.order_depths[symbol], tick.position(symbol), POSITION_LIMITS[symbol]
+    if symbol == "RAINFOREST_RESIN":
+        return lambda: trader.resin_orders(depth, 10000, 2, position, limit)
+    if symbol == "KELP":
+        return lambda: trader.kelp_orders(depth, 10, 3.5, 1, position, limit)
+    if symbol == "SQUID_INK":
+        return lambda: trader.squidink_utility_orders(depth, position, limit)
+    if symbol.startswith("VOLCANIC_ROCK_VOUCHER_") and hasattr(trader, "volcanic_voucher_orders"):
+        return lambda: trader.volcanic_voucher_orders(symbol, depth, position)
+    method = getattr(trader, "%s_orders" % symbol.lower(), None)
+    if method is not None:
+        return lambda: method(depth, position, limit)
+    return None
+
+
+def _basket_case(name: str):
+    def case(trader, tick: Tick) -> Optional[Callable]:
+        method = getattr(trader, name, None)
+        if method is None:
+            return None
+        if tick.round5:
+            return lambda: method(tick.books, tick.positions, trader.position_limits, {})
+        basket = "PICNIC_BASKET1" if name == "basket1_orders" else "PICNIC_BASKET2"
+        return lambda: method(tick.order_depths, tick.position(basket), POSITION_LIMITS[basket])
+    return case
+
+
+def _voucher_chain(trader, tick: Tick) -> Optional[Callable]:
+    if not hasattr(trader, "voucher_theoretical_prices"):
+        return None
+    return lambda: trader.voucher_theoretical_prices(tick.books)
+
+
+def _take_batch(trader, tick: Tick) -> Optional[Callable]:
+    if not tick.round5 or not trader.take_products:
+        return None
+    symbols = [s for s in tick.books if s in trader.take_products]
+    return lambda: trader.batch_take_orders(symbols, tick.books, tick.positions)
+
+
+def _clear_position(trader, tick: Tick) -> Optional[Callable]:
+    symbol = "KELP"
+    depth, position = tick.depth(symbol), tick.position(symbol) or 10
+    return lambda: trader.clear_position_order([], depth, position, POSITION_LIMITS[symbol], symbol,
+                                               0, 0, depth_mid(tick, symbol), 1)
+
+
+def depth_mid(tick: Tick, symbol: str) -> float:
+    depth = tick.order_depths[symbol]
+    return (max(depth.buy_orders) + min(depth.sell_orders)) / 2
+
+
+def _conversion_lp(trader, tick: Tick) -> Optional[Callable]:
+    if not hasattr(trader, "optimize_conversion_arbitrage"):
+        return None
+    if tick.round5:
+        return lambda: trader.optimize_conversion_arbitrage(tick.books, tick.positions, trader.position_limits, {})
+    prices = {p: depth_mid(tick, p) for p in ("CROISSANT", "JAM", "DJEMBE", "PICNIC_BASKET1", "PICNIC_BASKET2")}
+    limits = {p: POSITION_LIMITS[p] for p in prices}
+    return lambda: trader.optimize_conversion_arbitrage(prices, limits)
+
+
+def _macarons(name: str):
+    def case(trader, tick: Tick) -> Optional[Callable]:
+        method = getattr(trader, name, None)
+        if method is None or tick.observation is None:
+            return None
+        symbol, obs = "MAGNIFICENT_MACARONS", tick.observation
+        position = tick.position(symbol)
+        if name == "macarons_arb_take":
+            depth = tick.depth(symbol)
+            return lambda: method(depth, obs, position)
+        if name == "macarons_arb_make":
+            return lambda: method(obs, position, 0, 0)
+        if name == "macarons_track":
+            depth = tick.depth(symbol)
+
+            def call():
+                trader.macarons_planner.forecast = None   # time the re-plan, not the unchanged-forecast shortcut
+                return method(symbol, depth, position, POSITION_LIMITS[symbol])
+            return call
+        return lambda: method(position)
+    return case
+
+
+CASES = {
+    "resin_orders": _registry_case("RAINFOREST_RESIN"),
+    "kelp_orders": _registry_case("KELP"),
+    "squidink_utility_orders": _registry_case("SQUID_INK"),
+    "croissant_orders": _registry_case("CROISSANT"),
+    "jam_orders": _registry_case("JAM"),
+    "djembe_orders": _registry_case("DJEMBE"),
+    "take_batch": _take_batch,
+    "voucher_chain": _voucher_chain,
+    "volcanic_voucher_orders": _registry_case("VOLCANIC_ROCK_VOUCHER_10000"),
+    "delta_hedge_orders": _registry_case("VOLCANIC_ROCK"),
+    "basket1_orders": _basket_case("basket1_orders"),
+    "basket2_orders": _basket_case("basket2_orders"),
+    "clear_position_order": _clear_position,
+    "conversion_lp": _conversion_lp,
+    "macarons_arb_take": _macarons("macarons_arb_take"),
+    "macarons_arb_make": _macarons("macarons_arb_make"),
+    "macarons_arb_clear": _macarons("macarons_arb_clear"),
+    "macarons_track": _macarons("macarons_track"),
+}
+
+
+def _time(fn: Callable, repeat: int) -> Dict[str, float]:
+    """Best and median microseconds per call over `repeat` runs of an auto-sized loop."""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    number = max(1, int(number * TARGET_SECONDS / 0.2))
+    runs = [t / number * 1e6 for t in timer.repeat(repeat=repeat, number=number)]
+    return {"best_us": min(runs), "median_us": statistics.median(runs), "calls": number}
+
+
+def warm_trader(module, depth: int, seed: int):
+    """A Trader warmed up on WARMUP_TICKS synthetic ticks, and the final Tick to time its methods on."""
+    timed = _TickTimer(module.Trader())
+    run_backtest(timed, [SyntheticDay(WARMUP_TICKS, seed=seed, depth=depth)])
+    trader = timed.trader
+    tick = Tick(module, trader, timed.state)
+    if hasattr(trader, "reuse"):
+        # Time the computation itself: with the reuse cache every repeat call would be a hit.
+        trader.reuse = None
+    if hasattr(trader, "voucher_theoretical_prices"):
+        # This tick's chain prices, as the first voucher-reading block would leave them.
+        trader.books = tick.books
+        trader.voucher_prices = trader.voucher_theoretical_prices(tick.books)
+    return trader, tick
+
+
+def bench_round(path: str, depths, seed: int, repeat: int, run_ticks: int) -> Dict:
+    """Timings for one Round file: {"methods": {name: {depth: timing}}, "run": {...}}."""
+    module = load_module(path)
+    methods: Dict[str, Dict[str, Dict[str, float]]] = {}
+    run = {}
+    with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+        for depth in depths:
+            trader, tick = warm_trader(module, depth, seed)
+            for name, case in CASES.items():
+                fn = case(trader, tick)
+                if fn is not None:
+                    methods.setdefault(name, {})[str(depth)] = _time(fn, repeat)
+
+            # Full ticks, exchange-style: a fresh TradingState every call, traderData round-tripped.
+            timed = _TickTimer(module.Trader())
+            started = time.perf_counter()
+            run_backtest(timed, [SyntheticDay(run_ticks, seed=seed, depth=depth)])
+            elapsed = time.perf_counter() - started
+            us = sorted(ns / 1e3 for ns in timed.ns)
+            run[str(depth)] = {
+                "ticks": len(us),
+                "mean_us": statistics.fmean(us),
+                "p50_us": us[len(us) // 2],
+                "p99_us": us[min(len(us) - 1, int(len(us) * 0.99))],
+                "run_ticks_per_s": len(us) / (sum(us) / 1e6),
+                "backtest_ticks_per_s": len(us) / elapsed,
+            }
+    return {"methods": methods, "run": run}
+
+
+def regressions(report: Dict, baseline: Dict, tolerance: float):
+    """Yield (round file, metric, depth, baseline us, current us) for every timing slower than baseline * (1 + tolerance)."""
+    for path, current in report["rounds"].items():
+        before = baseline.get("rounds", {}).get(path)
+        if before is None:
+            continue
+        pairs = [(name, depth, before["methods"].get(name, {}).get(depth, {}).get("best_us"), timing["best_us"])
+                 for name, by_depth in current["methods"].items() for depth, timing in by_depth.items()]
+        pairs += [("run", depth, before["run"].get(depth, {}).get("p50_us"), timing["p50_us"])
+                  for depth, timing in current["run"].items()]
+        for name, depth, old, new in pairs:
+            if old is not None and new > old * (1 + tolerance):
+                yield path, name, depth, old, new
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("round_files", nargs="*", default=["Round 5.py"])
+    parser.add_argument("--depths", type=int, nargs="+", default=[1, 3, 5], help="book levels per side")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--run-ticks", type=int, default=RUN_TICKS)
+    parser.add_argument("--json", metavar="PATH", help="write the report to PATH")
+    parser.add_argument("--baseline", metavar="PATH", help="earlier report to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown against the baseline")
+    args = parser.parse_args(argv)
+
+    report = {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "depths": args.depths,
+        "rounds": {path: bench_round(path, args.depths, args.seed, args.repeat, args.run_ticks)
+                   for path in args.round_files},
+    }
+
+    columns = ["%s d=%d" % (path.replace(".py", ""), depth) for path in args.round_files for depth in args.depths]
+    print("%-24s" % "best us/call" + "".join("%14s" % c for c in columns))
+    for name in list(CASES) + ["run p50", "run p99"]:
+        cells = []
+        for path in args.round_files:
+            result = report["rounds"][path]
+            for depth in map(str, args.depths):
+                if name.startswith("run "):
+                    value = result["run"][depth]["%s_us" % name.split()[1]]
+                else:
+                    value = result["methods"].get(name, {}).get(depth, {}).get("best_us")
+                cells.append("%14s" % ("-" if value is None else "%.1f" % value))
+        print("%-24s" % name + "".join(cells))
+
+    if args.json:
+        with open(args.json, "w") as handle:
+            json.dump(report, handle, indent=2)
+        print("report written to %s" % args.json)
+
+    if args.baseline:
+        with open(args.baseline) as handle:
+            baseline = json.load(handle)
+        slower = list(regressions(report, baseline, args.tolerance))
+        for path, name, depth, old, new in slower:
+            print("REGRESSION %s %s depth %s: %.1f us -> %.1f us" % (path, name, depth, old, new))
+        if slower:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Round 5 `run()` time per tick against the number of take-only symbols quoted, with
+the NumPy take batch forced on and off; where the batch starts to win is what
+TAKE_BATCH_MIN_SYMBOLS is set to.
+
+    python -m benchmarks.take_batch "Round 5.py" --symbols 4 8 12 16 32 64
+
+The extra symbols are registered as take_orders products in the loaded module's
+registry. Every tick gets fresh random books, so the reuse cache never hits and
+both paths compute every tick; the same ticks are replayed through both.
+"""
+
+import argparse
+import random
+import time
+from typing import Dict, List
+
+from backtester.datamodel import Observation, OrderDepth, TradingState
+from backtester.loader import load_module
+
+FAIR = 1000
+LIMIT = 100
+
+
+def _ticks(symbols: List[str], ticks: int, seed: int) -> List[TradingState]:
+    """Three-level books around FAIR, sometimes crossed, for `ticks` ticks."""
+    rng = random.Random(seed)
+    states = []
+    for tick in range(ticks):
+        depths: Dict[str, OrderDepth] = {}
+        for symbol in symbols:
+            depth = OrderDepth()
+            mid = FAIR + rng.randint(-3, 3)
+            for level in range(3):
+                depth.buy_orders[mid - 1 - level] = rng.randint(1, 20)
+                depth.sell_orders[mid + 1 + level] = -rng.randint(1, 20)
+            depths[symbol] = depth
+        positions = {symbol: rng.randint(-LIMIT // 2, LIMIT // 2) for symbol in symbols}
+        states.append(TradingState("", tick * 100, {}, depths, {}, {}, positions, Observation({}, {})))
+    return states
+
+
+def bench(module, count: int, ticks: int, seed: int, repeat: int = 3) -> Dict[str, float]:
+    """Best of `repeat` mean run() microseconds per tick with `count` take symbols, batched and per symbol."""
+    symbols = ["TAKE_%d" % i for i in range(count)]
+    for symbol in symbols:
+        module.PRODUCTS[symbol] = {"limit": LIMIT, "fallback": FAIR, "strategy": "take_orders", "params": {},
+                                   "reuse": {}}
+    threshold = module.TAKE_BATCH_MIN_SYMBOLS
+    states = _ticks(symbols, ticks, seed)
+    timings = {"batch": float("inf"), "loop": float("inf")}
+    try:
+        # Alternate the two paths so drift in machine load hits both alike.
+        for _ in range(repeat):
+            for name, minimum in (("batch", 1), ("loop", count + 1)):
+                module.TAKE_BATCH_MIN_SYMBOLS = minimum
+                trader = module.Trader()
+                for state in states[:ticks // 10]:
+                    trader.run(state)
+                started = time.perf_counter()
+                for state in states:
+                    trader.run(state)
+                timings[name] = min(timings[name], (time.perf_counter() - started) / len(states) * 1e6)
+    finally:
+        module.TAKE_BATCH_MIN_SYMBOLS = threshold
+        for symbol in symbols:
+            del module.PRODUCTS[symbol]
+    return timings
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Round 5 take batch against the per-symbol loop.")
+    parser.add_argument("round_file", nargs="?", default="Round 5.py")
+    parser.add_argument("--symbols", type=int, nargs="+", default=[4, 8, 12, 16, 24, 32, 64, 128])
+    parser.add_argument("--ticks", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    module = load_module(args.round_file)
+    if module.np is None:
+        parser.error("the take batch needs NumPy")
+    print("%8s %10s %10s" % ("symbols", "batch us", "loop us"))
+    crossover = None
+    for count in args.symbols:
+        timings = bench(module, count, args.ticks, args.seed, args.repeat)
+        print("%8d %10.1f %10.1f" % (count, timings["batch"], timings["loop"]))
+        if crossover is None and timings["batch"] < timings["loop"]:
+            crossover = count
+    print("batch first wins at %s symbols; TAKE_BATCH_MIN_SYMBOLS = %d"
+          % ("no measured count of" if crossover is None else crossover, module.TAKE_BATCH_MIN_SYMBOLS))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Compare the binary traderData codec against the jsonpickle encoding it replaced.
+
+    python -m benchmarks.traderdata_codec "Round 5.py" --samples 200 1000 10000
+
+Both paths encode the same KELP / SQUID_INK / Flippers series; the jsonpickle
+side uses the old layout (plain lists, KELP VWAP as a list of dicts).
+"""
+
+import argparse
+import random
+import timeit
+
+import jsonpickle
+
+from backtester.loader import load_module
+
+
+def _series(module, samples: int, seed: int = 0):
+    rng = random.Random(seed)
+    histories = {name: module.History(samples) for name in
+                 ("kelp_prices", "kelp_vwap", "kelp_volume", "squidink_prices", "flipper_second_bids")}
+    for _ in range(samples):
+        for history in histories.values():
+            history.append(2000 + rng.gauss(0, 5))
+    return histories
+
+
+def _legacy(histories):
+    return {
+        "kelp_prices": histories["kelp_prices"].tolist(),
+        "kelp_vwap": [{"vol": vol, "vwap": vwap}
+                      for vol, vwap in zip(histories["kelp_volume"], histories["kelp_vwap"])],
+        "squidink_prices": histories["squidink_prices"].tolist(),
+        "flipper_second_bids": histories["flipper_second_bids"].tolist(),
+    }
+
+
+def _best(fn, number: int) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("round_file", nargs="?", default="Round 5.py")
+    parser.add_argument("--samples", type=int, nargs="+", default=[200, 1000, 10000])
+    args = parser.parse_args(argv)
+
+    module = load_module(args.round_file)
+    print("%8s %14s %14s %14s %9s %9s %8s" % ("samples", "jsonpickle us", "codec us", "codec+zlib us",
+                                              "json len", "codec len", "speedup"))
+    for samples in args.samples:
+        histories = _series(module, samples)
+        budget = 10 ** 9    # measure the full payload, not the trimmed one
+        legacy = _legacy(histories)
+        number = max(1, 20000 // samples)
+        t_json = _best(lambda: jsonpickle.encode(legacy), number)
+        t_codec = _best(lambda: module.encode_trader_data(histories, budget=budget), number)
+        t_zlib = _best(lambda: module.encode_trader_data(histories, compress=True, budget=budget), number)
+        json_len = len(jsonpickle.encode(legacy))
+        codec_len = len(module.encode_trader_data(histories, budget=budget))
+        print("%8d %14.1f %14.1f %14.1f %9d %9d %7.1fx" % (
+            samples, t_json * 1e6, t_codec * 1e6, t_zlib * 1e6, json_len, codec_len, t_json / t_codec))
+
+
+if __name__ == "__main__":
+    main()
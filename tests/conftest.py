@@ -0,0 +1,55 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from backtester.loader import load_module  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def round5():
+    """The Round 5 module, imported once for the whole session."""
+    return load_module(os.path.join(ROOT, "Round 5.py"))
+
+
+@pytest.fixture(scope="session")
+def messy_day_csv(tmp_path_factory):
+    """
+    A short synthetic Round 5 day written as exchange CSVs, with some books crossed,
+    one-sided or empty (the simulator on its own never quotes those). Returns the prices path.
+    """
+    import random
+
+    from backtester.data import MAX_LEVELS
+    from backtester.synthetic import write_day
+
+    directory = tmp_path_factory.mktemp("messy")
+    write_day(str(directory) + "/", 400, seed=11)
+    path = directory / "prices_round_5_day_0.csv"
+    rng = random.Random(11)
+    lines = path.read_text().splitlines()
+    bid_cells, ask_cells = slice(3, 3 + 2 * MAX_LEVELS), slice(3 + 2 * MAX_LEVELS, 3 + 4 * MAX_LEVELS)
+    for i in range(1, len(lines)):
+        cells = lines[i].split(";")
+        bids, asks = cells[bid_cells], cells[ask_cells]
+        roll = rng.random()
+        if roll < 0.1:
+            # Crossed: the asks move to below the best bid.
+            shift = int(asks[0]) - int(bids[0]) + rng.randint(1, 3)
+            asks = [str(int(c) - shift) if c and k % 2 == 0 else c for k, c in enumerate(asks)]
+        elif roll < 0.15:
+            bids = [""] * len(bids)
+        elif roll < 0.2:
+            asks = [""] * len(asks)
+        elif roll < 0.22:
+            bids, asks = [""] * len(bids), [""] * len(asks)
+        if roll < 0.22:
+            quoted = [int(side[0]) for side in (bids, asks) if side[0]]
+            cells[-2] = str(sum(quoted) / len(quoted)) if quoted else ""
+        cells[bid_cells], cells[ask_cells] = bids, asks
+        lines[i] = ";".join(cells)
+    path.write_text("\n".join(lines) + "\n")
+    return str(path)
@@ -0,0 +1,58 @@
+"""
+pytest wrappers around benchmarks.strategies: one test per Round file and strategy
+case, on the same warmed-up Trader and tick the CLI times. With pytest-benchmark
+installed each case is timed through its `benchmark` fixture
+(`pytest tests/test_benchmarks.py --benchmark-only`); without it every case runs
+once, so the suite still checks that each one works.
+"""
+
+import contextlib
+import io
+import os
+
+import pytest
+
+from backtester.loader import load_module
+from benchmarks.strategies import CASES, warm_trader
+
+from conftest import ROOT
+
+ROUND_FILES = ["Round 1.py", "Round 2.py", "Round 3.py", "Round 4.py", "Round 5.py"]
+DEPTH = 3
+
+# The older Round files encode traderData with jsonpickle, which warns on every call.
+pytestmark = pytest.mark.filterwarnings("ignore::DeprecationWarning")
+
+
+@pytest.fixture(scope="module")
+def warmed():
+    """Round file -> (trader, tick), warmed up once per module."""
+    cache = {}
+
+    def get(round_file):
+        if round_file not in cache:
+            module = load_module(os.path.join(ROOT, round_file))
+            with contextlib.redirect_stdout(io.StringIO()):
+                cache[round_file] = warm_trader(module, DEPTH, seed=0)
+        return cache[round_file]
+    return get
+
+
+@pytest.fixture
+def bench(request):
+    """pytest-benchmark's `benchmark` fixture when installed, else a single call."""
+    try:
+        return request.getfixturevalue("benchmark")
+    except pytest.FixtureLookupError:
+        return lambda fn: fn()
+
+
+@pytest.mark.parametrize("name", list(CASES))
+@pytest.mark.parametrize("round_file", ROUND_FILES)
+def test_strategy(bench, warmed, round_file, name):
+    trader, tick = warmed(round_file)
+    fn = CASES[name](trader, tick)
+    if fn is None:
+        pytest.skip("%s has no %s" % (round_file, name))
+    with contextlib.redirect_stdout(io.StringIO()):
+        bench(fn)
@@ -0,0 +1,112 @@
+"""
+ConversionLP against brute force: on small books every whole-basket pair of
+counts can be priced directly, so the LP's answer must match the best of them.
+"""
+
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+
+FAIR = {"CROISSANT": 4300, "JAM": 6600, "DJEMBE": 13400}
+FAIR["PICNIC_BASKET1"] = 6 * FAIR["CROISSANT"] + 3 * FAIR["JAM"] + FAIR["DJEMBE"]
+FAIR["PICNIC_BASKET2"] = 4 * FAIR["CROISSANT"] + 2 * FAIR["JAM"]
+
+
+def random_books(module, rng, spread=6, skew=60, volume=25, cap=60):
+    """Three-level books around fair value, sometimes mispriced enough to arbitrage."""
+    asks, bids, buy_caps, sell_caps = [], [], [], []
+    for product in module.CONVERSION_PRODUCTS:
+        fair = FAIR[product] + rng.randint(-skew, skew)
+        half = rng.randint(1, spread)
+        ask, bid = fair + half, fair - half
+        asks.append([(ask + level, rng.randint(1, volume)) for level in range(3)])
+        bids.append([(bid - level, rng.randint(1, volume)) for level in range(3)])
+        buy_caps.append(rng.randint(0, cap))
+        sell_caps.append(rng.randint(0, cap))
+    return asks, bids, buy_caps, sell_caps
+
+
+def walk(levels, units):
+    """Cash for `units` walked from `levels`, or None past the depth."""
+    cash = 0
+    for price, volume in levels:
+        take = min(volume, units)
+        cash += take * price
+        units -= take
+    return None if units else cash
+
+
+def brute_force(module, asks, bids, buy_caps, sell_caps):
+    """Best cash over every pair of whole-basket counts the depth allows."""
+    products = list(module.CONVERSION_PRODUCTS)
+    recipes = list(module.BASKET_RECIPES.items())
+    best = 0
+    for k1 in range(-75, 76):
+        for k2 in range(-75, 76):
+            net = dict.fromkeys(products, 0)
+            for k, (basket, recipe) in zip((k1, k2), recipes):
+                net[basket] -= k
+                for component, weight in recipe.items():
+                    net[component] += weight * k
+            cash = 0
+            for i, product in enumerate(products):
+                qty = net[product]
+                side = walk(asks[i], qty) if qty > 0 else walk(bids[i], -qty) if qty < 0 else 0
+                if side is None or qty > buy_caps[i] or -qty > sell_caps[i]:
+                    break
+                cash += -side if qty > 0 else side
+            else:
+                if (k1 or k2) and cash > module.BASKET_MIN_EDGE * (abs(k1) + abs(k2)):
+                    best = max(best, cash)
+    return best
+
+
+def net_cash(asks, bids, net, products):
+    cash = 0
+    for i, product in enumerate(products):
+        qty = net.get(product, 0)
+        cash += -walk(asks[i], qty) if qty > 0 else walk(bids[i], -qty) if qty < 0 else 0
+    return cash
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_matches_brute_force(round5, seed):
+    books = random_books(round5, random.Random(seed))
+    net, cash = round5.ConversionLP().solve(*books)
+    assert cash == pytest.approx(brute_force(round5, *books))
+    if net:
+        assert net_cash(books[0], books[1], net, round5.CONVERSION_PRODUCTS) == pytest.approx(cash)
+
+
+def test_fill_respects_capacity(round5):
+    rng = random.Random(7)
+    for _ in range(50):
+        asks, bids, buy_caps, sell_caps = random_books(round5, rng)
+        net, _ = round5.ConversionLP().solve(asks, bids, buy_caps, sell_caps)
+        for i, product in enumerate(round5.CONVERSION_PRODUCTS):
+            assert -sell_caps[i] <= net.get(product, 0) <= buy_caps[i]
+
+
+def test_no_edge_no_trade(round5):
+    books = random_books(round5, random.Random(0), skew=0)
+    assert round5.ConversionLP().solve(*books) == ({}, 0.0)
+
+
+def test_warm_start_matches_cold_solve(round5):
+    """A solve that starts from the previous tick's basis ends where a cold solve does."""
+    rng = random.Random(3)
+    warm = round5.ConversionLP()
+    for _ in range(60):
+        books = random_books(round5, rng)
+        assert warm.solve(*books) == pytest.approx(round5.ConversionLP().solve(*books))
+
+
+def test_warm_start_reuses_optimal_basis(round5):
+    books = random_books(round5, random.Random(11))
+    lp = round5.ConversionLP()
+    first = lp.solve(*books)
+    assert lp.basis is not None
+    assert lp.solve(*books) == first
+    assert lp.iterations == 0
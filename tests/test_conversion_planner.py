@@ -0,0 +1,103 @@
+"""
+ConversionPlanner against brute force: on a small position range the DP over
+(position, tick) can be solved by trying every conversion size, so the planner's
+marginal values and conversion requests must match it.
+"""
+
+import random
+
+import pytest
+
+LIMIT, CAP, STORAGE, HORIZON = 14, 3, 0.5, 4
+
+
+def planner(module, significance=0.0):
+    return module.ConversionPlanner(LIMIT, cap=CAP, storage=STORAGE, horizon=HORIZON, significance=significance)
+
+
+def histories(module, rng, n=8):
+    """Exit prices drifting by a random trend, the short exit above the long one."""
+    base, spread = rng.uniform(600, 700), rng.uniform(0.5, 6)
+    trend_long, trend_short = rng.uniform(-3, 3), rng.uniform(-3, 3)
+    longs = [base + trend_long * i + rng.gauss(0, 0.3) for i in range(n)]
+    shorts = [x + spread + (trend_short - trend_long) * i for i, x in enumerate(longs)]
+    return module.History(n, longs), module.History(n, shorts)
+
+
+def brute_force(longs, shorts):
+    """Worth of ending tick 0 at each position, and of each position at its start."""
+    def terminal(x):
+        if x < 0:
+            return x * shorts[-1]
+        # Past the horizon: storage at the end of the last tick, then converted at the cap.
+        return x * (longs[-1] - STORAGE) - STORAGE * sum(max(x - j * CAP, 0) for j in range(1, LIMIT + 1))
+
+    def start(after, exit_long, exit_short):
+        worth = {}
+        for x in after:
+            moves = range(0, min(abs(x), CAP) + 1)
+            if x > 0:
+                worth[x] = max(c * exit_long + after[x - c] for c in moves)
+            else:
+                worth[x] = max(-c * exit_short + after[x + c] for c in moves)
+        return worth
+
+    after = {x: terminal(x) for x in range(-LIMIT, LIMIT + 1)}
+    for k in range(HORIZON, 0, -1):
+        worth = start(after, longs[k], shorts[k])
+        after = {x: w - STORAGE * max(x, 0) for x, w in worth.items()}
+    return after, start(after, longs[0], shorts[0])
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_matches_brute_force(round5, seed):
+    plan = planner(round5)
+    plan.update(*histories(round5, random.Random(seed)))
+    longs, shorts = plan.forecast
+    after, worth = brute_force(longs, shorts)
+    assert plan.margins == pytest.approx([after[x] - after[x + 1] for x in range(-LIMIT, LIMIT)])
+    for x in range(-LIMIT, LIMIT + 1):
+        conversion = plan.conversion(x)
+        assert abs(conversion) <= min(abs(x), CAP) and x * (x + conversion) >= 0
+        price = longs[0] if x > 0 else shorts[0]
+        assert -conversion * price + after[x + conversion] == pytest.approx(worth[x])
+
+
+def test_flat_prices_convert_at_the_cap(round5):
+    plan = planner(round5)
+    plan.update(round5.History(8, [650.0] * 8), round5.History(8, [655.0] * 8))
+    assert [plan.conversion(x) for x in range(-LIMIT, LIMIT + 1)] == [min(-x, CAP) if x < 0 else -min(x, CAP)
+                                                                      for x in range(-LIMIT, LIMIT + 1)]
+
+
+def test_rising_exit_holds_longs(round5):
+    """A long exit forecast to rise by more than the storage is worth holding rather than converting now."""
+    plan = planner(round5)
+    plan.update(round5.History(8, [650.0 + 2 * i for i in range(8)]), round5.History(8, [670.0] * 8))
+    assert plan.conversion(CAP) == 0
+    assert plan.buy_units(0, 664.0, LIMIT) > 0
+
+
+def test_noise_is_forecast_flat(round5):
+    rng = random.Random(5)
+    noise = [650.0 + rng.gauss(0, 1) for _ in range(50)]
+    plan = round5.ConversionPlanner(75)
+    plan.update(round5.History(50, noise), round5.History(50, [x + 5 for x in noise]))
+    longs, shorts = plan.forecast
+    assert set(longs) == {noise[-1]} and set(shorts) == {noise[-1] + 5}
+
+
+def test_units_follow_margins(round5):
+    """Each unit bought or sold is worth its price; the next one is not."""
+    plan = planner(round5)
+    plan.update(*histories(round5, random.Random(9)))
+    margins = plan.margins
+    for position in range(-LIMIT, LIMIT + 1):
+        start = position + LIMIT
+        for price in (600.0, 650.0, 700.0):
+            bought = plan.buy_units(position, price, 2 * LIMIT)
+            assert all(-m > price for m in margins[start:start + bought])
+            assert start + bought == 2 * LIMIT or -margins[start + bought] <= price
+            sold = plan.sell_units(position, price, 2 * LIMIT)
+            assert all(-m < price for m in margins[start - sold:start])
+            assert sold == start or -margins[start - sold - 1] >= price
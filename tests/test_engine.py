@@ -0,0 +1,7 @@
+from backtester.engine import POSITION_LIMITS
+
+
+def test_round5_registry_uses_exchange_limits(round5):
+    """Round 5 sizes every symbol against its PRODUCTS limit, which must be the exchange's, as the engine models it."""
+    for symbol, spec in round5.PRODUCTS.items():
+        assert spec["limit"] == POSITION_LIMITS[symbol], "Round 5 PRODUCTS[%r] limit" % symbol
@@ -0,0 +1,23 @@
+import warnings
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+
+def test_round_trip(round5):
+    strikes = [9500, 9750, 10000, 10250, 10500]
+    T = [7 / 365] * len(strikes)
+    sigma = [0.25, 0.22, 0.2, 0.21, 0.24]
+    prices = round5.black_scholes_call_prices(10000.0, strikes, T, 0.0, sigma)
+    vols, _ = round5.implied_vols(prices, 10000.0, strikes, T, 0.0, [0.2] * len(strikes))
+    assert vols == pytest.approx(sigma, abs=1e-4)
+
+
+def test_zero_vega_strikes_do_not_warn(round5):
+    """Strikes that are unquoted or already solved may have zero vega; they must not be divided by."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        vols, _ = round5.implied_vols([600.0, float("nan"), 5.0], 10000.0, [9500, 20000, 10000],
+                                      [7 / 365, 1e-6, 7 / 365], 0.0, [0.2] * 3)
+    assert np.isnan(vols[1]) and not np.isnan(vols[0])
@@ -0,0 +1,49 @@
+from backtester.datamodel import Order
+from backtester.matching import OrderBook, match_with_queue
+
+
+def filled(book, owner=""):
+    return sum(abs(quantity) for _, who, _, quantity in book.fills if who == owner)
+
+
+def test_print_fills_one_side_only():
+    book = OrderBook()
+    book.rest(100, 5)
+    book.rest(100, -5)   # a locked book: bid and ask both at the print price
+    book.print_trade(100, 3)
+    assert filled(book) == 3
+
+
+def test_print_reaches_asks_when_no_bid_is_crossed():
+    book = OrderBook()
+    book.rest(99, 5)
+    ask = book.rest(101, -5)
+    book.print_trade(102, 4)
+    assert book.fills == [(ask, "", 101, -4)]
+
+
+def test_queue_ahead_fills_first():
+    book = OrderBook()
+    book.rest(100, 4, "market")
+    ours = book.rest(100, 3, "us")
+    assert book.queue_position(ours) == 4
+    book.print_trade(100, 5)
+    assert filled(book, "market") == 4 and filled(book, "us") == 1
+    assert book.queue_position(ours) == 0
+
+
+def test_cancel_and_compact_keep_queue_order():
+    book = OrderBook()
+    ids = [book.rest(100, 1, str(i)) for i in range(3000)]
+    for order_id in ids[:-1]:
+        book.cancel(order_id)
+    assert book.queue_position(ids[-1]) == 0
+    assert book.take(100, -1) == 0
+    assert book.fills[0][1] == "2999"
+
+
+def test_match_with_queue_rests_behind_the_book():
+    orders = [Order("KELP", 2000, 5)]
+    trades = match_with_queue("KELP", orders, bids=[(2000, 10)], asks=[(2002, -10)],
+                              tape=[(2000, 12)], timestamp=0, owner="SUBMISSION")
+    assert [(t.price, t.quantity) for t in trades] == [(2000, 2)]
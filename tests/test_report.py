@@ -0,0 +1,40 @@
+import os
+
+import pytest
+
+from backtester.report import ROLLING_SERIES, SNAPSHOT_SERIES, collect, render, rolling_zscore
+from backtester.synthetic import write_day
+
+from conftest import ROOT
+
+
+@pytest.fixture(scope="module")
+def replay(tmp_path_factory):
+    """A short synthetic Round 5 day replayed through the report recorder."""
+    prefix = str(tmp_path_factory.mktemp("report")) + "/"
+    write_day(prefix, 200, seed=5)
+    return collect(os.path.join(ROOT, "Round 5.py"), [prefix + "prices_round_5_day_0.csv"])
+
+
+def test_recorder_samples_every_tick(replay):
+    recorder, result = replay
+    assert len(recorder.timestamps) == 200
+    for name in ROLLING_SERIES + SNAPSHOT_SERIES:
+        assert len(recorder.series[name]) == 200
+    assert any(snapshot for snapshot in recorder.series["voucher_iv"])
+    assert len(result.pnl_history) == 200
+
+
+def test_rolling_zscore_skips_gaps():
+    scores = rolling_zscore([float("nan"), 1.0, 1.0, 3.0], window=3)
+    assert scores[0] != scores[0] and scores[1] != scores[1]
+    assert scores[2] == 0.0
+    assert scores[3] == pytest.approx(2 ** 0.5)
+
+
+def test_render_writes_figure(replay, tmp_path):
+    pytest.importorskip("matplotlib")
+    recorder, result = replay
+    out = str(tmp_path / "report.png")
+    render(recorder, result, out, strikes=list(recorder.trader.voucher_strikes))
+    assert os.path.getsize(out) > 0
@@ -0,0 +1,19 @@
+from backtester.data import MAX_LEVELS, load_day
+from backtester.synthetic import SyntheticDay, write_day
+
+
+def test_written_day_reads_back(tmp_path):
+    """Books deeper than the CSV format are cut to MAX_LEVELS, and what is written is what loads."""
+    write_day(str(tmp_path) + "/", 50, depth=5, seed=3)
+    with open(tmp_path / "prices_round_5_day_0.csv") as handle:
+        header = handle.readline().strip().split(";")
+    assert len(header) == 3 + 4 * MAX_LEVELS + 2
+    loaded = load_day(str(tmp_path / "prices_round_5_day_0.csv"))
+    generated = SyntheticDay(50, 0, depth=5, seed=3)
+    for (t1, rows1, _, _), (t2, rows2, _, _) in zip(loaded.ticks(), generated.ticks()):
+        assert t1 == t2
+        for (product, bids, asks, mid), (product2, bids2, asks2, mid2) in zip(rows1, rows2):
+            assert product == product2
+            assert list(bids) == list(bids2)[:MAX_LEVELS]
+            assert list(asks) == list(asks2)[:MAX_LEVELS]
+            assert float(mid) == float(mid2)
@@ -0,0 +1,87 @@
+"""
+The NumPy take batch against the per-symbol strategies it replaces: on the same
+books and positions, batch_take_orders must send exactly what take_orders and
+volcanic_voucher_orders send one symbol at a time.
+"""
+
+import random
+
+import pytest
+
+from backtester.datamodel import Observation, OrderDepth, TradingState
+from backtester.synthetic import MarketSimulator
+
+pytest.importorskip("numpy")
+
+
+def random_depth(rng, fair):
+    """Up to three levels a side around `fair`; either side may be missing, and quotes may cross it."""
+    depth = OrderDepth()
+    shape = rng.random()
+    for level in range(rng.randint(1, 3)):
+        if shape > 0.15:
+            depth.buy_orders[fair + rng.randint(-6, 4) - level] = rng.randint(1, 40)
+        if shape < 0.85 or shape > 0.95:
+            depth.sell_orders[fair + rng.randint(-4, 6) + level] = -rng.randint(1, 40)
+    if 0.9 < shape <= 0.95:
+        depth.buy_orders.clear()
+    return depth
+
+
+def orders_by_symbol(orders):
+    return {symbol: [(o.price, o.quantity) for o in symbol_orders] for symbol, symbol_orders in orders.items()
+            if symbol_orders}
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_batch_matches_per_symbol(round5, seed):
+    rng = random.Random(seed)
+    trader = round5.Trader()
+    symbols = list(trader.take_products)
+    trader.voucher_prices = {s: rng.uniform(10, 800) for s in symbols if s.startswith("VOLCANIC_ROCK_VOUCHER")}
+    books, positions = {}, {}
+    for symbol in symbols:
+        strategy, limit, fallback = trader.take_products[symbol]
+        fair = round(trader.voucher_prices[symbol]) if fallback is None else fallback
+        books[symbol] = round5.BookView(random_depth(rng, fair))
+        # Anywhere in the limit, sometimes right at it on either side.
+        positions[symbol] = rng.choice([-limit, limit, rng.randint(-limit, limit)])
+
+    expected = {}
+    for symbol in symbols:
+        strategy, limit, fallback = trader.take_products[symbol]
+        expected[symbol] = getattr(trader, strategy)(symbol, books[symbol], positions[symbol], limit, fallback)
+    assert orders_by_symbol(trader.batch_take_orders(symbols, books, positions)) == orders_by_symbol(expected)
+
+
+def test_empty_books_take_nothing(round5):
+    trader = round5.Trader()
+    symbols = list(trader.take_products)
+    trader.voucher_prices = {s: 100.0 for s in symbols if s.startswith("VOLCANIC_ROCK_VOUCHER")}
+    books = {symbol: round5.BookView(OrderDepth()) for symbol in symbols}
+    assert trader.batch_take_orders(symbols, books, {}) == {}
+
+
+def replay(module, states):
+    trader = module.Trader(budget_ms=0)
+    return [orders_by_symbol(trader.run(state)[0]) for state in states]
+
+
+def test_run_with_batch_matches_per_symbol_loop(round5, monkeypatch):
+    """
+    run() sends the same orders every tick whether it batches its take symbols or not, on
+    books around the simulator's fair values that cross, go one-sided or empty.
+    """
+    rng = random.Random(4)
+    limits = {symbol: spec["limit"] for symbol, spec in round5.PRODUCTS.items()}
+    symbols = [s for s in round5.Trader().take_products] + ["VOLCANIC_ROCK"]
+    states = []
+    for timestamp, rows, _, _ in MarketSimulator(seed=4).ticks(200):
+        depths = {product: random_depth(rng, round(mid)) for product, _, _, mid in rows if product in symbols}
+        positions = {symbol: rng.randint(-limits[symbol], limits[symbol]) for symbol in depths}
+        states.append(TradingState("", timestamp, {}, depths, {}, {}, positions, Observation({}, {})))
+
+    looped = replay(round5, states)
+    monkeypatch.setattr(round5, "TAKE_BATCH_MIN_SYMBOLS", 1)
+    assert replay(round5, states) == looped
+    assert sum(len(orders) for orders in looped) > len(states)
@@ -0,0 +1,134 @@
+"""
+The traderData codec and the state it carries between ticks: encode/decode must
+round-trip exactly, the size budget must drop the oldest samples first, anything
+that is not a current-version blob must decode to nothing, and a Trader rebuilt
+from traderData every tick must trade like one that lived all day.
+"""
+
+import base64
+import json
+import random
+import struct
+import zlib
+from array import array
+
+import pytest
+
+from backtester.engine import run_backtest
+from backtester.synthetic import SyntheticDay
+
+
+def random_series(rng):
+    return {
+        "kelp_prices": [rng.uniform(1900, 2100) for _ in range(rng.randint(0, 300))],
+        "kelp_volume": [float(rng.randint(1, 60)) for _ in range(rng.randint(0, 300))],
+        "squidink_prices": [rng.gauss(2000, 40) for _ in range(rng.randint(0, 300))],
+        "empty": [],
+    }
+
+
+@pytest.mark.parametrize("compress", [False, True])
+@pytest.mark.parametrize("seed", range(10))
+def test_round_trip(round5, seed, compress):
+    series = random_series(random.Random(seed))
+    decoded = round5.decode_trader_data(round5.encode_trader_data(series, compress=compress))
+    assert {name: list(values) for name, values in decoded.items()} == series
+
+
+def test_round_trip_from_histories(round5):
+    history = round5.History(5, [float(i) for i in range(12)])
+    decoded = round5.decode_trader_data(round5.encode_trader_data({"prices": history}))
+    assert list(decoded["prices"]) == history.tolist() == [7.0, 8.0, 9.0, 10.0, 11.0]
+
+
+def test_compression_only_when_smaller(round5):
+    flat = {"prices": [2000.0] * 500}
+    noisy = {"prices": [random.Random(1).random() for _ in range(50)]}
+    for series in (flat, noisy):
+        plain = round5.encode_trader_data(series)
+        assert len(round5.encode_trader_data(series, compress=True)) <= len(plain)
+    assert len(round5.encode_trader_data(flat, compress=True)) < len(round5.encode_trader_data(flat)) // 10
+
+
+@pytest.mark.parametrize("budget", [200, 1000, 4000])
+def test_budget_drops_oldest_samples(round5, budget):
+    series = {"long": [float(i) for i in range(1000)], "medium": [float(-i) for i in range(40)], "short": [0.5]}
+    text = round5.encode_trader_data(series, budget=budget)
+    assert len(text) <= budget
+    decoded = round5.decode_trader_data(text)
+    keep = len(decoded["long"])
+    assert 0 < keep < 1000
+    # Every series keeps its newest samples, cut to one common length; shorter ones survive whole.
+    for name, values in series.items():
+        assert list(decoded[name]) == values[-keep:]
+    # The common length is the largest that fits.
+    longer = {name: values[-(keep + 1):] for name, values in series.items()}
+    assert len(round5.encode_trader_data(longer, budget=10 ** 9)) > budget
+
+
+def test_under_budget_is_untouched(round5):
+    series = {"prices": [float(i) for i in range(100)]}
+    text = round5.encode_trader_data(series)
+    assert len(text) < round5.TRADER_DATA_BUDGET
+    assert list(round5.decode_trader_data(text)["prices"]) == series["prices"]
+
+
+def foreign_strings(round5):
+    payload = struct.pack("<BBH", round5.TRADER_DATA_VERSION, 0, 1) + b"\x01x" + struct.pack("<I", 2)
+    values = array("d", [1.0, 2.0]).tobytes()
+    return {
+        "legacy jsonpickle": json.dumps({"kelp_prices": [2000.5, 2001.0], "kelp_vwap": [{"vol": 3, "vwap": 2000}]}),
+        "plain text": "hello",
+        "not base64": "@@@@",
+        "older version": base64.b64encode(bytes([round5.TRADER_DATA_VERSION - 1]) + payload[1:] + values).decode(),
+        "newer version": base64.b64encode(bytes([round5.TRADER_DATA_VERSION + 1]) + payload[1:] + values).decode(),
+        "truncated header": base64.b64encode(payload[:2]).decode(),
+        "truncated samples": base64.b64encode(payload + values[:5]).decode(),
+        "bad zlib": base64.b64encode(struct.pack("<BBH", round5.TRADER_DATA_VERSION, round5.TRADER_DATA_ZLIB, 1)
+                                     + b"not zlib").decode(),
+        "cut zlib": base64.b64encode(struct.pack("<BBH", round5.TRADER_DATA_VERSION, round5.TRADER_DATA_ZLIB, 1)
+                                     + zlib.compress(payload[4:] + values)[:-4]).decode(),
+    }
+
+
+def test_foreign_strings_decode_to_nothing(round5):
+    assert round5.decode_trader_data("") == {}
+    for name, text in foreign_strings(round5).items():
+        assert round5.decode_trader_data(text) == {}, name
+
+
+def test_foreign_strings_restore_empty_state(round5):
+    for name, text in foreign_strings(round5).items():
+        trader = round5.Trader()
+        trader.restore_state(text)
+        assert len(trader.kelp_prices) == len(trader.squidink_prices) == 0, name
+        assert trader.squidink_stats.state()[2] == 0, name
+
+
+class Recorder:
+    """Replays through one Trader, or a new one from traderData every tick if `fresh`, recording its output."""
+
+    def __init__(self, make, fresh):
+        self.make = make
+        self.trader = make()
+        self.fresh = fresh
+        self.log = []
+
+    def run(self, state):
+        trader = self.make() if self.fresh else self.trader
+        orders, conversions, trader_data = trader.run(state)
+        self.log.append(({symbol: [(o.price, o.quantity) for o in symbol_orders]
+                          for symbol, symbol_orders in orders.items() if symbol_orders},
+                         conversions, trader_data))
+        return orders, conversions, trader_data
+
+
+def test_fresh_trader_per_tick_matches_long_lived(round5):
+    logs = {}
+    for fresh in (False, True):
+        recorder = Recorder(lambda: round5.Trader(budget_ms=0), fresh)
+        run_backtest(recorder, [SyntheticDay(500, seed=2)])
+        logs[fresh] = recorder.log
+    assert logs[True] == logs[False]
+    # The windows really are carried: the last blob holds a full KELP history.
+    assert len(round5.decode_trader_data(logs[True][-1][2])["kelp_prices"]) > 0
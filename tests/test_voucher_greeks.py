@@ -0,0 +1,143 @@
+"""
+VoucherGreeks' incremental totals against a full reprice, and the VOLCANIC_ROCK
+hedge it drives. Fills must move the totals exactly as repricing the new book
+would; a spot move is a first-order update, so its error must stay within the
+second-order term.
+"""
+
+import random
+
+import pytest
+
+from backtester.datamodel import OrderDepth
+
+STRIKES = [9500, 9750, 10000, 10250, 10500]
+PRODUCTS = ["VOLCANIC_ROCK_VOUCHER_%d" % k for k in STRIKES]
+T = [5 / 365] * len(STRIKES)
+SIGMA = [0.25, 0.21, 0.19, 0.2, 0.23]
+
+
+def unit_greeks(module, S):
+    return module.black_scholes_call_prices(S, STRIKES, T, [0.0] * len(STRIKES), SIGMA, greeks=True)[1]
+
+
+def full_reprice(module, S, positions):
+    greeks = module.VoucherGreeks(PRODUCTS)
+    greeks.fill(positions)
+    greeks.reprice(S, unit_greeks(module, S))
+    return greeks
+
+
+def random_positions(rng):
+    return {p: rng.randint(-200, 200) for p in PRODUCTS if rng.random() < 0.8}
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_fills_match_full_reprice(round5, seed):
+    rng = random.Random(seed)
+    S = rng.uniform(9800, 10200)
+    greeks = round5.VoucherGreeks(PRODUCTS)
+    greeks.fill(random_positions(rng))
+    greeks.reprice(S, unit_greeks(round5, S))
+    for _ in range(10):
+        positions = random_positions(rng)
+        greeks.fill(positions)
+        expected = full_reprice(round5, S, positions)
+        assert (greeks.delta, greeks.gamma, greeks.vega) == pytest.approx(
+            (expected.delta, expected.gamma, expected.vega), rel=1e-9, abs=1e-9)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_spot_moves_within_second_order(round5, seed):
+    """A move of dS leaves delta off a full reprice by about gamma' dS^2 / 2, bounded here by |dGamma| |dS|."""
+    rng = random.Random(seed)
+    S = rng.uniform(9800, 10200)
+    positions = random_positions(rng)
+    greeks = full_reprice(round5, S, positions)
+    for _ in range(10):
+        move = rng.uniform(-5, 5)
+        before = full_reprice(round5, S, positions)
+        S += move
+        greeks.move_spot(S)
+        after = full_reprice(round5, S, positions)
+        assert abs(greeks.delta - after.delta) <= abs(after.gamma - before.gamma) * abs(move) + 1e-9
+        # Fills after the move use the moved unit deltas.
+        positions = random_positions(rng)
+        greeks.fill(positions)
+        greeks.reprice(S, unit_greeks(round5, S))
+        assert greeks.delta == pytest.approx(full_reprice(round5, S, positions).delta)
+
+
+def test_move_then_fill_matches_reprice_to_first_order(round5):
+    S = 10000.0
+    greeks = full_reprice(round5, S, {PRODUCTS[2]: 100})
+    greeks.move_spot(S + 2)
+    greeks.fill({PRODUCTS[2]: 100, PRODUCTS[0]: -50})
+    expected = full_reprice(round5, S + 2, {PRODUCTS[2]: 100, PRODUCTS[0]: -50})
+    assert greeks.delta == pytest.approx(expected.delta, abs=abs(expected.gamma) * 2 + 1e-6)
+
+
+BAND = 25
+BIDS = ((10000, 30), (9999, 30), (9998, 30))
+ASKS = ((10001, 30), (10002, 30), (10003, 30))
+
+
+def hedge(module, delta, position, bids=BIDS, asks=ASKS):
+    """Hedge orders for a voucher book of `delta` and `position` VOLCANIC_ROCK, at spot 10000.5 and band BAND."""
+    trader = module.Trader()
+    trader.refresh_voucher_chain()
+    depth = OrderDepth()
+    depth.buy_orders.update(dict(bids))
+    depth.sell_orders.update({price: -volume for price, volume in asks})
+    book = module.BookView(depth)
+    # No voucher is quoted, so the chain is not repriced and only the set delta counts.
+    trader.books, trader.positions = {module.VOLCANIC_ROCK: book}, {module.VOLCANIC_ROCK: position}
+    greeks = trader.voucher_greeks
+    greeks.reprice(10000.5, unit_greeks(module, 10000.5))
+    greeks.delta = delta
+    trader.volcanic_rock_spot = 10000.5
+    limit = module.PRODUCTS[module.VOLCANIC_ROCK]["limit"]
+    return [(o.price, o.quantity) for o in trader.delta_hedge_orders(module.VOLCANIC_ROCK, book, position, limit,
+                                                                     module.VOLCANIC_ROCK_FALLBACK, BAND)]
+
+
+@pytest.mark.parametrize("delta, position", [(BAND, 0), (-BAND, 0), (BAND - 10, 10), (-BAND + 10, -10), (0.0, 0)])
+def test_no_hedge_inside_band(round5, delta, position):
+    assert hedge(round5, delta, position) == []
+
+
+def test_hedge_just_outside_band(round5):
+    # Long exposure sells into the bids, short exposure buys from the asks, back to zero.
+    assert hedge(round5, BAND + 0.6, 0) == [(10000, -26)]
+    assert hedge(round5, -BAND - 0.6, 0) == [(10001, 26)]
+    assert hedge(round5, 20.0, 10) == [(10000, -30)]
+    assert hedge(round5, -20.0, -10) == [(10001, 30)]
+
+
+def test_hedge_walks_the_book(round5):
+    """The order is priced at the deepest level it needs, and never exceeds the visible volume."""
+    assert hedge(round5, 45.0, 0) == [(9999, -45)]
+    assert hedge(round5, -75.0, 0) == [(10003, 75)]
+    assert hedge(round5, 200.0, 0) == [(9998, -90)]
+    assert hedge(round5, -200.0, 0, asks=((10001, 5),)) == [(10001, 5)]
+
+
+def test_hedge_respects_rock_limit(round5):
+    limit = round5.PRODUCTS[round5.VOLCANIC_ROCK]["limit"]
+    assert limit == 400
+    deep_bids = ((10000, 500),)
+    deep_asks = ((10001, 500),)
+    # Exposure is voucher delta plus the rock position: selling from near -limit stops at -limit,
+    # buying from near +limit stops at +limit, however far outside the band the exposure is.
+    assert hedge(round5, 500.0, -limit + 40, bids=deep_bids) == [(10000, -40)]
+    assert hedge(round5, -500.0, limit - 40, asks=deep_asks) == [(10001, 40)]
+    assert hedge(round5, 500.0, -limit, bids=deep_bids) == []
+    assert hedge(round5, -500.0, limit, asks=deep_asks) == []
+    # Toward flat from the limit is always allowed.
+    assert hedge(round5, 100.0 - limit, limit, bids=deep_bids) == [(10000, -100)]
+
+
+def test_hedge_one_sided_book(round5):
+    assert hedge(round5, 100.0, 0, bids=()) == []
+    assert hedge(round5, -100.0, 0, asks=()) == []
+    assert hedge(round5, 100.0, 0, asks=()) == [(9998, -90)]